@@ -313,6 +313,13 @@ df.drop_duplicates(subset=["country", "capital"],keep="last")
 # %%
 df.duplicated(subset=["country", "capital"]).sum()
 
+# %%
+# Same result through 64-bit row hashes, which scales to millions of rows
+from flight_tools import drop_duplicate_rows
+
+dedup = drop_duplicate_rows(df, subset=["country", "capital"], keep="last")
+dedup.count, dedup.frame
+
 # %%
 import pandas as pd
 
@@ -362,6 +369,18 @@ df["capital"] = df["capital"].apply(lambda x: x.lower())
 
 df
 
+# %%
+# On large columns with few distinct values (city names, airlines...), call the
+# function once per distinct value and broadcast the results back; the cache
+# keeps the results between calls
+from flight_tools import LRUCache, map_unique
+
+transform_cache = LRUCache(maxsize=10_000)
+df["country"] = map_unique(df["country"], str.upper, transform_cache)
+df["capital"] = map_unique(df["capital"], str.lower, transform_cache)
+
+transform_cache.stats()
+
 # %% [markdown]
 # ## TQDM with pandas
 
@@ -396,6 +415,37 @@ df["country"] = df["country"].progress_apply(placeholder_function)
 
 df
 
+# %%
+# Same progress bar, but the rows are split into chunks that run concurrently:
+# a thread pool for functions waiting on I/O (like the sleep above), a process
+# pool for CPU-bound Python functions
+from flight_tools import parallel_apply
+
+df["country"] = parallel_apply(df["country"], placeholder_function, io_bound=True)
+
+df
+
+# %%
+# For asynchronous lookups (an HTTP API, a database) `async_apply` awaits the
+# calls concurrently (at most `concurrency` at a time) and only calls the
+# service once per distinct value
+import asyncio
+
+from flight_tools import async_apply
+
+
+async def lookup_service(x):
+    await asyncio.sleep(0.5)
+    return x.upper()
+
+
+countries = pd.concat([df["country"]] * 100, ignore_index=True)
+
+start = time.perf_counter()
+result = async_apply(countries, lookup_service, concurrency=8)
+print(f"{len(countries)} rows in {time.perf_counter() - start:.2f} s")
+result.head()
+
 # %% [markdown]
 # ## Basic Information
 # 
@@ -446,6 +496,15 @@ df.columns
 # Info on DataFrame
 df.info()
 
+# %%
+# Compact dtypes picked automatically (category, smallest int/float, bool,
+# datetime) with the memory used before and after each column. The schema can
+# be passed to flight_tools.read_typed_csv to read a CSV with these dtypes
+from flight_tools import optimize_dtypes
+
+optimized = optimize_dtypes(df)
+optimized.report
+
 # %%
 # Number of non-NA values
 df.count()
@@ -499,6 +558,24 @@ profile = ProfileReport(df, title="Profiling Report",explorative=True)
 # profile.to_notebook_iframe()
 profile.to_file("your_report.html")
 
+# %%
+# ProfileReport needs the whole table in memory, which the 6.7M-row flights
+# table does not fit. The streaming profile reads the CSV chunk by chunk
+# once and keeps only mergeable sketches: HyperLogLog for distinct counts,
+# t-digests for quantiles and histograms, running moments for the
+# correlations
+from flight_tools import profile_dataset
+
+flights_profile = profile_dataset(
+    "flights", data_dir="../data/US 2023 Civil Flights  delays meteo and aircrafts"
+)
+flights_profile.summary()
+
+# %%
+flights_profile.to_file(
+    "profiling reports/profile_flights.html", title="US Civil Flights 2023"
+)
+
 # %% [markdown]
 # ## Pivot Table
 # 
@@ -7,165 +7,111 @@ import warnings
 warnings.filterwarnings("ignore")
 
 # %%
-flights_df = pd.read_csv(
-    "/kaggle/input/2023-us-civil-flights-delay-meteo-and-aircraft/US_flights_2023.csv"
-)
-weather_df = pd.read_csv(
-    "/kaggle/input/2023-us-civil-flights-delay-meteo-and-aircraft/weather_meteo_by_airport.csv"
+from flight_tools import draw, load_cached, run_report
+from flight_tools.figures import analysis_1 as figures
+
+data_dir = "/kaggle/input/2023-us-civil-flights-delay-meteo-and-aircraft"
+cache_dir = "/kaggle/working/.columnar_cache"
+
+# Typed columnar cache: the CSVs are parsed once, later runs memory-map the
+# cached files and read only the columns this analysis uses
+flights_df = load_cached(
+    "flights",
+    columns=[
+        "FlightDate",
+        "Day_Of_Week",
+        "Airline",
+        "Dep_Delay",
+        "Flight_Duration",
+        "Delay_Carrier",
+        "Delay_Weather",
+        "Delay_NAS",
+        "Delay_Security",
+        "Delay_LastAircraft",
+        "Manufacturer",
+        "Aicraft_age",
+    ],
+    data_dir=data_dir,
+    cache_dir=cache_dir,
 )
-cancelled_diverted_df = pd.read_csv(
-    "/kaggle/input/2023-us-civil-flights-delay-meteo-and-aircraft/Cancelled_Diverted_2023.csv"
+weather_df = load_cached(
+    "weather", columns=["tavg"], data_dir=data_dir, cache_dir=cache_dir
 )
-airports_df = pd.read_csv(
-    "/kaggle/input/2023-us-civil-flights-delay-meteo-and-aircraft/airports_geolocation.csv"
+cancelled_diverted_df = load_cached(
+    "cancelled_diverted", data_dir=data_dir, cache_dir=cache_dir
 )
+airports_df = load_cached("airports", data_dir=data_dir, cache_dir=cache_dir)
 
 # %%
-# Calculate average departure delay by airline
-avg_dep_delay_by_airline = (
-    flights_df.groupby("Airline")["Dep_Delay"].mean().sort_values(ascending=False)
-)
+# Every average used by the plots below, computed in a single scan of the flights
+# (Month and Year are derived from FlightDate) and cached for the figure cells
+summaries = figures.summaries(flights_df, figures.SUMMARIES)
 
-plt.figure(figsize=(12, 6))
-sns.barplot(
-    x=avg_dep_delay_by_airline.values,
-    y=avg_dep_delay_by_airline.index,
-    palette="viridis",
-)
-plt.title("Average Departure Delay by Airline (2023)")
-plt.xlabel("Average Departure Delay (minutes)")
-plt.ylabel("Airline")
+# %%
+# Calculate average departure delay by airline
+draw(figures.AIRLINE_DELAYS, flights_df)
 plt.show()
 
 # %%
 # Plot distribution of departure delays
-plt.figure(figsize=(10, 6))
-sns.histplot(flights_df["Dep_Delay"], bins=50, kde=True, color="skyblue")
-plt.title("Distribution of Departure Delays (2023)")
-plt.xlabel("Departure Delay (minutes)")
-plt.ylabel("Frequency")
+draw(figures.DEP_DELAY, flights_df)
 plt.show()
 
 # %%
-# Convert FlightDate to datetime
-flights_df["FlightDate"] = pd.to_datetime(flights_df["FlightDate"])
-
-# Extract month and year from FlightDate
-flights_df["Month"] = flights_df["FlightDate"].dt.month
-flights_df["Year"] = flights_df["FlightDate"].dt.year
-
 # Calculate average departure delay by month
-avg_delay_by_month = flights_df.groupby(["Year", "Month"])["Dep_Delay"].mean()
-
-# Plot
-plt.figure(figsize=(12, 6))
-avg_delay_by_month.plot(marker="o", color="orange")
-plt.title("Average Departure Delay Over Time (2023)")
-plt.xlabel("Month")
-plt.ylabel("Average Departure Delay (minutes)")
-plt.xticks(rotation=45)
-plt.grid(True)
+draw(figures.MONTHLY_DELAYS, flights_df)
 plt.show()
 
 # %%
 # Calculate average departure delay by day of the week
-avg_delay_by_dayofweek = flights_df.groupby("Day_Of_Week")["Dep_Delay"].mean()
-
-# Plot
-plt.figure(figsize=(8, 6))
-ax = sns.barplot(
-    x=avg_delay_by_dayofweek.index, y=avg_delay_by_dayofweek.values, palette="Set2"
-)
-plt.title("Average Departure Delay by Day of the Week (2023)")
-plt.xlabel("Day of the Week")
-plt.ylabel("Average Departure Delay (minutes)")
-for p in ax.patches:
-    ax.annotate(
-        f"{int(p.get_height())}",
-        (p.get_x() + p.get_width() / 2.0, p.get_height()),
-        ha="center",
-        va="center",
-        xytext=(0, 10),
-        textcoords="offset points",
-    )
-
+draw(figures.WEEKDAY_DELAYS, flights_df)
 plt.show()
 
 # %%
 # Calculate total delay counts by delay type
-delay_counts = flights_df[
-    [
-        "Delay_Carrier",
-        "Delay_Weather",
-        "Delay_NAS",
-        "Delay_Security",
-        "Delay_LastAircraft",
-    ]
-].sum()
-
-# Plot
-plt.figure(figsize=(10, 6))
-delay_counts.plot(kind="bar", color="lightblue")
-plt.title("Total Flight Delays by Delay Type (2023)")
-plt.xlabel("Delay Type")
-plt.ylabel("Total Delay Count")
-plt.xticks(rotation=45)
-for i, count in enumerate(delay_counts):
-    plt.text(i, count, str(int(count)), ha="center", va="bottom")
-
+draw(figures.DELAY_TYPE_TOTALS, flights_df)
 plt.show()
 
 # %%
 # Plot distribution of flight durations
-plt.figure(figsize=(10, 6))
-sns.histplot(flights_df["Flight_Duration"], bins=50, kde=True, color="green")
-plt.title("Distribution of Flight Durations (2023)")
-plt.xlabel("Flight Duration (minutes)")
-plt.ylabel("Frequency")
+draw(figures.FLIGHT_DURATION, flights_df)
 plt.show()
 
 # %%
 # Plot distribution of aircraft ages
-plt.figure(figsize=(10, 6))
-sns.histplot(flights_df["Aicraft_age"], bins=30, kde=True, color="purple")
-plt.title("Distribution of Aircraft Ages (2023)")
-plt.xlabel("Aircraft Age (years)")
-plt.ylabel("Frequency")
+draw(figures.AIRCRAFT_AGE, flights_df)
 plt.show()
 
 # %%
 # Plot boxplot of flight duration distribution by airline
-plt.figure(figsize=(12, 6))
-sns.boxplot(x="Airline", y="Flight_Duration", data=flights_df, palette="coolwarm")
-plt.title("Flight Duration Distribution by Airline (2023)")
-plt.xlabel("Airline")
-plt.ylabel("Flight Duration (minutes)")
-plt.xticks(rotation=45)
+draw(figures.DURATION_BY_AIRLINE, flights_df)
 plt.show()
 
 # %%
 # Calculate average departure delay by aircraft manufacturer
-avg_delay_by_manufacturer = (
-    flights_df.groupby("Manufacturer")["Dep_Delay"].mean().sort_values(ascending=False)
-)
-
-# Plot
-plt.figure(figsize=(12, 6))
-sns.barplot(
-    x=avg_delay_by_manufacturer.values,
-    y=avg_delay_by_manufacturer.index,
-    palette="spring",
-)
-plt.title("Average Departure Delay by Aircraft Manufacturer (2023)")
-plt.xlabel("Average Departure Delay (minutes)")
-plt.ylabel("Manufacturer")
+draw(figures.MANUFACTURER_DELAYS, flights_df)
 plt.show()
 
 # %%
 # Plot distribution of weather conditions (temperature)
-plt.figure(figsize=(10, 6))
-sns.histplot(weather_df["tavg"], bins=30, kde=True, color="orange")
-plt.title("Distribution of Temperature (2023)")
-plt.xlabel("Temperature (°C)")
-plt.ylabel("Frequency")
+draw(figures.TEMPERATURE, weather_df)
 plt.show()
+
+# %% [markdown]
+# # Batch report
+#
+# For the headless batch job, the same figure jobs are rendered in parallel worker
+# processes. The workers read the columns from shared memory and the runner
+# writes one PNG per figure plus a timing table. The jobs are defined in
+# `flight_tools.figures.analysis_1`, so the workers can import them whatever the
+# start method, and the run is guarded so that it only starts from the main
+# process.
+
+# %%
+if __name__ == "__main__":
+    timings = run_report(
+        figures.JOBS,
+        {"flights": flights_df, "weather": weather_df},
+        "/kaggle/working/figures",
+    )
+    print(timings)
@@ -21,16 +21,37 @@ pd.set_option("display.max_columns", None)
 # Ignorer les avertissements FutureWarning
 warnings.filterwarnings("ignore", category=FutureWarning)
 
+from flight_tools import (
+    box_stats,
+    draw,
+    load_cached,
+    partitioned_agg,
+    point_layer,
+    profile_cached,
+    run_report,
+    sample_dataset,
+)
+from flight_tools.figures import analysis_2 as figures
+
 # Path vers la base Kaggle
-link_path = (
-    "../data/US 2023 Civil Flights  delays meteo and aircrafts/US_flights_2023.csv"
+data_dir = "../data/US 2023 Civil Flights  delays meteo and aircrafts"
+
+# %%
+# Premier aperçu sur un échantillon : 200 vols par (compagnie, mois) tirés
+# pendant la lecture du CSV, sans charger les 6,7M de lignes. Chaque
+# estimation est donnée avec son intervalle de confiance à 95 %
+# (n=None donne les valeurs exactes sur toutes les lignes)
+sample = sample_dataset(
+    "flights", n=200, strata=("Airline", "Month"), data_dir=data_dir
 )
+sample.describe(["Dep_Delay", "Arr_Delay", "Flight_Duration", "Aicraft_age"])
 
-# Importation du dataset
-df_flight = pd.read_csv(link_path)
+# %%
+sample.isnull()
 
-# Typage de la colonne FlightDate au format datetime
-df_flight["FlightDate"] = pd.to_datetime(df_flight["FlightDate"])
+# %%
+# Importation du dataset (typé pendant la lecture, puis lu depuis le cache colonnaire)
+df_flight = load_cached("flights", data_dir=data_dir)
 
 # Ajout d'une clé primaire unique en dur
 df_flight = df_flight.reset_index(drop=False)
@@ -39,7 +60,10 @@ df_flight = df_flight.reset_index(drop=False)
 df_flight.head(10)
 
 # %%
-df_flight.info()
+# info(), isnull().sum() et describe() calculés en flux sur le cache
+# colonnaire, bloc par bloc, avec les mêmes sorties que pandas
+flight_profile = profile_cached("flights", data_dir=data_dir)
+flight_profile.info()
 
 # %% [markdown]
 # **The dataset contains 6,743,403 rows and 24 columns.**
@@ -48,13 +72,13 @@ df_flight.info()
 # - Dataset size: 1.3 GB
 
 # %%
-df_flight.isnull().sum()
+flight_profile.isnull()
 
 # %% [markdown]
 # **No presence of Null values**
 
 # %%
-df_flight.select_dtypes("object").describe(include="all").T
+flight_profile.describe(include=["object", "category"]).T
 
 # %% [markdown]
 # **Analysis of Categorical Columns:**
@@ -73,7 +97,7 @@ df_flight.select_dtypes("object").describe(include="all").T
 #
 
 # %%
-df_flight.describe().T
+flight_profile.describe().T
 
 # %% [markdown]
 # **Analysis of Numerical Columns:**
@@ -98,18 +122,9 @@ df_flight.describe().T
 # **Similarly, we can notice a preliminary dependency** to be confirmed between **departure delays** and **arrival delays**.
 
 # %%
-# Selection of Numerical Columns for Plotting (excluding 'index')
-numeric_columns = df_flight.select_dtypes(include=["int64", "float64"]).drop(
-    columns=["index"]
-)
-
-# Box plots of numerical data with outliers marked in red
-numeric_columns.boxplot(
-    figsize=(15, 8), flierprops=dict(marker="o", markerfacecolor="r", markersize=8)
-)
-
-plt.suptitle("Univariate Analysis of Extreme Values in Numerical Columns (Box Plots)")
-
+# Box plots of the numerical columns with the extreme values marked in red
+# (quartiles and whiskers come from one t-digest per column)
+draw(figures.NUMERIC_BOXES, df_flight)
 plt.tight_layout()
 plt.show()
 
@@ -119,6 +134,12 @@ plt.show()
 # %% [markdown]
 # **General Context:**
 
+# %%
+# Flight counts and average delays per airline, weekday, manufacturer and
+# airport, computed together in a single scan of the flights and cached for
+# the figure cells below
+summaries = figures.summaries(df_flight, figures.SUMMARIES)
+
 # %%
 # Number of Flights
 flight_count = len(df_flight)
@@ -149,28 +170,8 @@ print(
 #
 
 # %%
-# Calculation of Total Number of Flights
-total_flights = len(df_flight)
-
-# Calculation of Number of Flights per Airline
-flight_counts = df_flight["Airline"].value_counts()
-
-# Calculation of Flight Percentages per Airline
-flight_percentages = (flight_counts / total_flights) * 100
-
-# Creating the Bar Plot with Percentages Displayed
-plt.figure(figsize=(10, 6))
-sns.barplot(
-    x=flight_percentages.index, y=flight_percentages.values, palette="viridis"
-)  # Creating the plot
-plt.title("Percentage of Flights by Airline")
-plt.xlabel("Airline")
-plt.ylabel("Percentage of Flights")
-plt.xticks(rotation=45, ha="right")  # Rotating x-axis labels for better readability
-for i, value in enumerate(flight_percentages.values):
-    plt.text(
-        i, value, f"{value:.2f}%", ha="center", va="bottom"
-    )  # Displaying percentages above each bar
+# Percentage of flights per airline, displayed above each bar
+draw(figures.AIRLINE_SHARE, df_flight)
 plt.tight_layout()
 plt.show()
 
@@ -181,46 +182,8 @@ plt.show()
 # We observe a **uniform distribution across the days of the week** with a slight increase on Thursday/Friday (14.8%) and a slight decrease in departure volumes on Saturday (12.92%).
 
 # %%
-### Calculation of Total Number of Flights
-total_flights = len(df_flight)
-
-# Calculation of Number of Flights per Day of the Week
-flight_counts = df_flight.groupby("Day_Of_Week")["index"].count()
-
-# Calculation of Flight Percentages per Day of the Week
-flight_percentages = (flight_counts / total_flights) * 100
-
-# Creating the Bar Plot with Percentages Displayed at the bottom in white
-plt.figure(figsize=(10, 6))
-sns.barplot(
-    x=flight_percentages.index, y=flight_percentages.values, palette="viridis"
-)  # Creating the plot
-plt.title("Percentage of Flights by Day of the Week")
-plt.xlabel("Day of the Week")
-plt.ylabel("Percentage of Flights")
-
-# Renaming x-axis labels
-week_days = [
-    "Monday",
-    "Tuesday",
-    "Wednesday",
-    "Thursday",
-    "Friday",
-    "Saturday",
-    "Sunday",
-]
-plt.gca().set_xticklabels(week_days)
-
-plt.xticks(rotation=45, ha="right")  # Rotating x-axis labels for better readability
-for i, value in enumerate(flight_percentages.values):
-    plt.text(
-        i, 10, f"{value:.2f}%", ha="center", va="baseline", color="white"
-    )  # Displaying percentages at the bottom of each bar in white
-
-# Setting y-axis from 0 to 20
-plt.ylim(0, 20)
-
-# plt.tight_layout()  # Automatically adjust layout to avoid overlapping
+# Percentage of flights per day of the week, displayed at the bottom of each bar
+draw(figures.WEEKDAY_SHARE, df_flight)
 plt.show()
 
 # %% [markdown]
@@ -232,26 +195,9 @@ plt.show()
 #
 
 # %%
-# Calculation of Number of Flights by Manufacturer
-flight_counts = df_flight.groupby("Manufacturer")["index"].count()
-
-# Calculation of Manufacturer Flight Percentages
-flight_percentages = (flight_counts / total_flights) * 100
-
-# Horizontal Bar Plot with Percentages Displayed at the bottom in white
-plt.figure(figsize=(10, 6))
-sns.barplot(
-    x=flight_percentages.values, y=flight_percentages.index, palette="viridis"
-)  # Using barplot with values on x-axis and labels on y-axis
-
-plt.title("Percentage of Flights by Manufacturer")
-plt.xlabel("Percentage of Flights")
-
-# Displaying percentages at x-coordinate 5
-for i, value in enumerate(flight_percentages.values):
-    plt.text(5, i, f"{value:.2f}%", ha="left", va="center", color="white")
-
-plt.tight_layout()  # Automatically adjust layout to avoid overlapping
+# Percentage of flights per manufacturer, displayed at the bottom of each bar
+draw(figures.MANUFACTURER_SHARE, df_flight)
+plt.tight_layout()
 plt.show()
 
 # %% [markdown]
@@ -264,8 +210,11 @@ only_late_flight = df_flight[df_flight["Arr_Delay"] > 0].copy()
 # Counting the number of delayed flights
 count_late_flight = len(only_late_flight)
 
+# Quartiles and extremes of the delays from a t-digest (no full sort)
+late_box = box_stats(only_late_flight, None, "Arr_Delay").iloc[0]
+
 # Finding the most delayed flight
-Delay_max = round(only_late_flight["Arr_Delay"].max(), 2)
+Delay_max = round(late_box["max"], 2)
 
 # Displaying numerical information
 print(
@@ -273,7 +222,7 @@ print(
 )
 
 print(
-    f"\n- The average delay for these flights is {round(only_late_flight['Arr_Delay'].mean(),2)} minutes with a median value of {round(only_late_flight['Arr_Delay'].median(),2)} minutes."
+    f"\n- The average delay for these flights is {round(only_late_flight['Arr_Delay'].mean(),2)} minutes with a median value of about {round(late_box['med'],2)} minutes."
 )
 
 print(
@@ -285,15 +234,7 @@ print(
 
 # %%
 # Distribution of Arrival Delays
-
-sns.histplot(data=only_late_flight, x="Arr_Delay", bins=300, kde=True)
-
-# Adding titles and labels
-plt.title("Distribution of Arrival Delays")
-plt.xlabel("Arrival Delay (minutes)")
-plt.ylabel("Frequency")
-
-# Displaying the plot
+draw(figures.LATE_ARRIVALS, only_late_flight)
 plt.show()
 
 # %% [markdown]
@@ -304,56 +245,9 @@ plt.show()
 # Once again, we notice **a potential initial correlation between departure delays and arrival delays**.
 
 # %%
-# Grouping Data by Month and Calculating Average Delays for Each Month
-only_late_flight["Month"] = only_late_flight["FlightDate"].dt.month
-monthly_delay = only_late_flight.groupby("Month")["Arr_Delay"].mean()
-monthly_dep_delay = only_late_flight.groupby("Month")[
-    "Dep_Delay"
-].mean()  # Calculating average departure delays per month
-
-# Calculating the overall mean of arrival delays
-global_mean_arrival = only_late_flight["Arr_Delay"].mean()
-
-plt.figure(figsize=(12, 6))
-
-# Bar plot of average arrival delays per month
-plt.bar(monthly_delay.index, monthly_delay.values, width=0.4, label="Arrival Delay")
-
-# Bar plot of average departure delays per month
-plt.bar(
-    monthly_dep_delay.index + 0.4,
-    monthly_dep_delay.values,
-    width=0.4,
-    label="Departure Delay",
-)
-
-# Adding the overall mean of arrival delays as a horizontal line
-plt.axhline(y=global_mean_arrival, color="r", linestyle="--", label="Overall Mean")
-
-# Adding titles and labels
-plt.title("Average Delays by Month")
-plt.xlabel("Month")
-plt.ylabel("Average Delay (minutes)")
-
-# Modifying labels to display month names
-months = [
-    "January",
-    "February",
-    "March",
-    "April",
-    "May",
-    "June",
-    "July",
-    "August",
-    "September",
-    "October",
-    "November",
-    "December",
-]
-plt.xticks(monthly_delay.index + 0.2, [months[i - 1] for i in monthly_delay.index])
-
-plt.legend()
-
+# Average arrival and departure delays for each month, with the overall mean
+# of the arrival delays
+draw(figures.MONTHLY_LATE_DELAYS, only_late_flight)
 plt.tight_layout()
 plt.show()
 
@@ -365,14 +259,7 @@ plt.show()
 
 # %%
 # Horizontal Bar Plot of Average Arrival Delays by Manufacturer
-
-sns.barplot(data=only_late_flight, y="Manufacturer", x="Arr_Delay")
-
-# Adding titles and labels
-plt.title("Average Arrival Delays by Manufacturer")
-plt.xlabel("Average Arrival Delay (minutes)")
-plt.ylabel("Manufacturer")
-
+draw(figures.MANUFACTURER_LATE_DELAYS, only_late_flight)
 plt.show()
 
 # %% [markdown]
@@ -383,74 +270,14 @@ plt.show()
 #
 
 # %%
-# Calculation + ranking (20) of average departure delays per airport
-Airports_delays = (
-    df_flight.groupby(["Dep_Airport", "Dep_CityName"])
-    .agg({"Dep_Delay": "mean", "index": "count"})
-    .reset_index()
-)
-Airports_delays = Airports_delays.sort_values(by="index", ascending=False).head(20)
-Airports_delays["Dep_Delay"] = round(Airports_delays["Dep_Delay"], 2)
-
-# Average departure delays per airport in minutes
-Dep_delay_mean = Airports_delays["Dep_Delay"].mean()
-
-# Total sum of average delays per airport to calculate percentages
-total_delay_mean = Airports_delays["Dep_Delay"].sum()
-
-# Ranking airports in descending order by average departure delays
-Airports_delays_rank = (
-    Airports_delays.sort_values(by="Dep_Delay", ascending=False).head(20).reset_index()
-)
-
-# Calculation of percentage for each average delay compared to the total average delay
-Airports_delays_rank["Percentage"] = (
-    Airports_delays_rank["Dep_Delay"] / total_delay_mean
-) * 100
-
-# Concatenation of columns 'Dep_Airport' and 'Dep_CityName' to avoid duplicates like 'New York'
-Airports_delays_rank["Dep_Airport_City"] = Airports_delays_rank["Dep_Airport"].str.cat(
-    Airports_delays_rank["Dep_CityName"], sep=", "
-)
-
-# Horizontal bar plot with average departure delays per airport
-plt.figure(figsize=(12, 6))
-bars = sns.barplot(
-    x=Airports_delays_rank["Dep_Delay"],
-    y=Airports_delays_rank["Dep_Airport_City"],
-    palette="viridis",
-)
-
-plt.title("Average Departure Delays per Airport")
-plt.xlabel("Average Departure Delays (in minutes)")
-plt.ylabel("Departure Airport")
-
-# Displaying the global average line
-plt.axvline(x=Dep_delay_mean, color="r", linestyle="--", label="Global Mean")
-
-# Displaying values per airport
-for i, (value, percent, count) in enumerate(
-    zip(
-        Airports_delays_rank["Dep_Delay"],
-        Airports_delays_rank["Percentage"],
-        Airports_delays_rank["index"],
-    )
-):
-    plt.text(
-        3,
-        i,
-        f"{value} minutes ({percent:.2f}% - {count} flights)",
-        ha="left",
-        va="center",
-        color="white",
-    )
-
-plt.legend()  # Adding legend for the global mean line
+# The 20 busiest airports, ranked by average departure delay
+Airports_delays = figures.busiest_airports(df_flight)
 
+draw(figures.AIRPORT_DELAYS, df_flight)
 plt.tight_layout()
 plt.show()
 
-print(f"Global average delay: {round(Dep_delay_mean,2)} minutes")
+print(f"Global average delay: {round(Airports_delays['Dep_Delay'].mean(),2)} minutes")
 
 # %% [markdown]
 # **Let's use a map to visualize these average delays by airport:**
@@ -459,14 +286,11 @@ print(f"Global average delay: {round(Dep_delay_mean,2)} minutes")
 # A higher concentration can be observed on the northeast coast around New York.
 
 # %%
-# Path vers la base Kaggle
-link_path2 = (
-    "../data/US 2023 Civil Flights  delays meteo and aircrafts/airports_geolocation.csv"
+# Import airports dataset
+df_airport = load_cached(
+    "airports", columns=["IATA_CODE", "LATITUDE", "LONGITUDE"], data_dir=data_dir
 )
 
-# Import flights dataset
-df_airport = pd.read_csv(link_path2)
-
 Airports_delays = pd.merge(
     Airports_delays,
     df_airport[["IATA_CODE", "LATITUDE", "LONGITUDE"]],
@@ -483,18 +307,40 @@ m = folium.Map(location=[37, -95], zoom_start=5, width="80%", height="80%")
 title_html = '<h3 align="left" style="font-size:20px"><b>RANK 20 - Airports with the most departure delays</b></h3>'
 m.get_root().html.add_child(folium.Element(title_html))
 
-# Add a marker for each airport with a circle size proportional to the departure delay
-for index, row in Airports_delays.iterrows():
-    radius = row["Dep_Delay"] * 10000  # Multiply by a value to adjust circle size
-    folium.Circle(
-        location=[row["LATITUDE"], row["LONGITUDE"]],  # Airport location
-        radius=radius,
-        color="red",
-        fill=True,
-        fill_color="red",
-        fill_opacity=0.3,  # Increased transparency
-        popup=f"{row['Dep_Airport']} - {row['Dep_CityName']}\nDelay: {row['Dep_Delay']} minutes",
-    ).add_to(m)
+# One GeoJSON layer with a circle per airport, its radius proportional to the
+# departure delay (value * radius_scale metres)
+point_layer(
+    Airports_delays["LATITUDE"],
+    Airports_delays["LONGITUDE"],
+    Airports_delays["Dep_Delay"],
+    label=Airports_delays["Dep_Airport"].str.cat(
+        Airports_delays["Dep_CityName"], sep=" - "
+    ),
+    name="RANK 20 - Departure delays",
+    radius_scale=10000,
+    value_name="Delay (minutes)",
+).add_to(m)
+
+# Every departure airport in a second layer, coloured by its average delay
+all_airports = (
+    summaries[("Dep_Airport", "Dep_CityName")]
+    .reset_index()
+    .merge(df_airport, left_on="Dep_Airport", right_on="IATA_CODE", how="left")
+)
+point_layer(
+    all_airports["LATITUDE"],
+    all_airports["LONGITUDE"],
+    all_airports["Dep_Delay_mean"],
+    label=all_airports["Dep_Airport"].str.cat(
+        all_airports["Dep_CityName"], sep=" - "
+    ),
+    name="All departure airports",
+    radius_scale=2000,
+    cmap="Reds",
+    value_name="Delay (minutes)",
+    show=False,
+).add_to(m)
+folium.LayerControl().add_to(m)
 
 # Display the map
 m
@@ -511,38 +357,10 @@ m
 # Next, we need to understand the origin of these departure delays by analyzing their dependencies with other numerical data and categorical data such as departure time period and flight type.
 
 # %%
-# Declaration of columns to study
-x = df_flight["Dep_Delay"]
-y = df_flight["Arr_Delay"]
-
-# Finding the line of linear regression (polynomial of degree 1) in the data
-slope, intercept = np.polyfit(x, y, 1)
-
-# Calculation of the correlation coefficient
-correlation = np.corrcoef(x, y)[0, 1]
-
-# Plotting the scatter plot and the linear regression line
-plt.scatter(x, y, label="Data")
-plt.plot(x, slope * x + intercept, color="orange", label="Linear regression line")
-
-# Adding the correlation coefficient to the plot
-plt.text(
-    x.min(),
-    y.max(),
-    f"Correlation coefficient: {correlation:.2f}",
-    verticalalignment="top",
-)
-
-# Adding labels and a title
-plt.xlabel("Dep_Delay")
-plt.ylabel("Arr_Delay")
-plt.title("Correlation Analysis between Dep_Delay and Arr_Delay")
-
-# Moving the legend to the upper right corner
-plt.legend(loc="lower right")
-
-# Display the plot
-plt.grid(True)
+# Density image of the flights with the linear regression line and the
+# correlation coefficient, both from streaming means and co-moments
+# (identical to np.polyfit(x, y, 1) and np.corrcoef(x, y)[0, 1])
+draw(figures.DELAY_CORRELATION, df_flight)
 plt.show()
 
 # %% [markdown]
@@ -563,45 +381,12 @@ plt.show()
 # Therefore, we will no longer focus on analyzing these factors in relation to departure delays. This analysis helps us understand which factors are strongly associated with departure delays and which ones are not, guiding further investigation and decision-making.
 
 # %%
-# Create a copy of the flight dataframe for correlation analysis
-df_corr = df_flight.copy()
-
-# Create dummy variables for 'DepTime_label' column
-dummy_columns1 = pd.get_dummies(df_corr["DepTime_label"], prefix="DepTime", dtype=int)
-
-# Concatenate dummy variables with the original dataframe
-df_corr = pd.concat([df_corr, dummy_columns1], axis=1)
-
-# Create dummy variables for 'Distance_type' column
-dummy_columns2 = pd.get_dummies(df_corr["Distance_type"], prefix="Distance", dtype=int)
-
-# Concatenate dummy variables with the original dataframe
-df_corr = pd.concat([df_corr, dummy_columns2], axis=1)
-
-# Create dummy variables for 'Manufacturer' column
-dummy_columns3 = pd.get_dummies(df_corr["Manufacturer"], prefix="Manufac", dtype=int)
-
-# Concatenate dummy variables with the original dataframe
-df_corr = pd.concat([df_corr, dummy_columns3], axis=1)
-
-# Calculate the correlation matrix
-correlation_matrix = df_corr.select_dtypes("number").corr()
-
-# Extract the correlations related to 'Dep_Delay'
-Dep_Delay_corr = correlation_matrix["Dep_Delay"]
-
-# Display the correlation of 'Dep_Delay' using a heatmap
-plt.figure(figsize=(2, 15))  # Adjust the figure size
-heatmap = sns.heatmap(
-    Dep_Delay_corr.to_frame(), annot=True, cmap="coolwarm", center=0, fmt=".2f"
-)
-heatmap.set_xticklabels(heatmap.get_xticklabels())  # Set the x-axis labels
-plt.title('Correlation Heatmap of "Departure Delays"\n')  # Set the title of the heatmap
+# Correlation of 'Dep_Delay' with every numeric column and with the indicator of
+# each departure time period, distance type and manufacturer (same labels as
+# pd.get_dummies), computed from the category codes without copying df_flight
+draw(figures.DEP_DELAY_CORRELATIONS, df_flight)
 plt.show()
 
-# Delete the temporary df_corr dataframe
-del df_corr
-
 # %% [markdown]
 # # 4 - There's no point in running...
 
@@ -613,44 +398,9 @@ del df_corr
 # This is the case with **American Airlines**, which **stands out due to the multitude of extraordinary delays** exceeding 33 hours.
 
 # %%
-plt.figure(figsize=(12, 8))  # Width = 12 inches, Height = 8 inches
-
-# Using a predefined color palette in Seaborn
-palette = "muted"
-
-# Creating the stripplot with the specified color palette
-ax3 = sns.stripplot(
-    y="Airline",
-    x="Dep_Delay",
-    size=3,
-    palette=palette,
-    data=df_flight,
-    linewidth=0.25,
-    jitter=True,
-)
-
-# Adjusting the font size of axis labels
-plt.setp(ax3.get_xticklabels(), fontsize=10)
-plt.setp(ax3.get_yticklabels(), fontsize=10)
-
-# Formatting the x-axis labels to display hours and minutes
-ax3.set_xticklabels(
-    [
-        "{:2.0f}h{:2.0f}m".format(*[int(y) for y in divmod(x, 60)])
-        for x in ax3.get_xticks()
-    ]
-)
-
-# Setting the x-axis label
-plt.xlabel("\nDeparture Delays", fontsize=12)
-
-# Hiding the y-axis label
-ax3.yaxis.label.set_visible(False)
-
-# Adjusting the layout of the plot
+# Density strip per airline: every flight is binned, then drawn as a single image
+draw(figures.AIRLINE_DEP_DELAYS, df_flight)
 plt.tight_layout(w_pad=3)
-
-# Displaying the plot
 plt.show()
 
 # %% [markdown]
@@ -661,40 +411,29 @@ plt.show()
 # Thus, there is no congestion point at this level. The same applies to very long delays with 60 departure airports for only 118 flights.
 
 # %%
-print("Information about delays exceeding 16 hours and 40 minutes:")
-print(
-    "\nNumber of flights:",
-    df_flight[df_flight["Dep_Delay"] > 984].shape[0],
-    " which is",
-    round(
-        (((df_flight[df_flight["Dep_Delay"] > 984].shape[0]) / len(df_flight)) * 100), 4
-    ),
-    "%",
-)
-print(
-    "Number of airports involved:",
-    df_flight[df_flight["Dep_Delay"] > 984]["Dep_Airport"].nunique(),
-    " out of",
-    df_flight["Dep_Airport"].nunique(),
-)
-
-print("\nInformation about delays exceeding 33 hours and 20 minutes:")
-print(
-    "\nNumber of flights:",
-    df_flight[df_flight["Dep_Delay"] > 1992].shape[0],
-    " which is",
-    round(
-        (((df_flight[df_flight["Dep_Delay"] > 1992].shape[0]) / len(df_flight)) * 100),
-        4,
-    ),
-    "%",
-)
-print(
-    "Number of airports involved:",
-    df_flight[df_flight["Dep_Delay"] > 1992]["Dep_Airport"].nunique(),
-    " out of",
-    df_flight["Dep_Airport"].nunique(),
-)
+from flight_tools import ThresholdIndex
+
+# Departure delays sorted once (with the maximum delay of each departure
+# airport): every count below is a binary search, without filtered copies
+delay_index = ThresholdIndex(df_flight, ["Dep_Delay", "Arr_Delay"], group="Dep_Airport")
+
+long_delays = {"16 hours and 40 minutes": 984, "33 hours and 20 minutes": 1992}
+for label, threshold in long_delays.items():
+    n_flights = delay_index.count_above("Dep_Delay", threshold)
+    print(f"\nInformation about delays exceeding {label}:")
+    print(
+        "\nNumber of flights:",
+        n_flights,
+        " which is",
+        round((n_flights / len(df_flight)) * 100, 4),
+        "%",
+    )
+    print(
+        "Number of airports involved:",
+        delay_index.groups_above("Dep_Delay", threshold),
+        " out of",
+        delay_index.n_groups,
+    )
 
 # %% [markdown]
 # **Is there any missing data in the delays?**
@@ -742,54 +481,31 @@ df_flight[
 # - **Absorption_delay**: Airline's ability to absorb these delays
 
 # %%
-# Extracting the delay dataset called 'Delay_view'
-Delay_view = df_flight.loc[
-    :,
-    (
-        "FlightDate",
-        "Delay_Carrier",
-        "Delay_Weather",
-        "Delay_NAS",
-        "Delay_Security",
-        "Delay_LastAircraft",
-        "Dep_Delay",
-        "Arr_Delay",
-    ),
-]
+from flight_tools import delay_decomposition
 
-# Initializing the new column 'Delay_Missing'
-Delay_view["Delay_Missing"] = 0
-
-# Adding the column for sum of documented delays
-Delay_view["Sum_Delay"] = (
-    Delay_view["Delay_Carrier"]
-    + Delay_view["Delay_LastAircraft"]
-    + Delay_view["Delay_Weather"]
-    + Delay_view["Delay_NAS"]
-    + Delay_view["Delay_Security"]
-)
+# Computing 'Sum_Delay', 'Delay_Missing' and 'Absorption_Delay' in one vectorized pass
+delay_columns = delay_decomposition(df_flight)
 
-# Initializing the new column 'Absorption_Delay'
-Delay_view["Absorption_Delay"] = 0
-
-# Function to calculate missing delay data
-Delay_view["Delay_Missing"] = Delay_view.apply(
-    lambda x: x["Arr_Delay"] if (x["Sum_Delay"] == 0) & (x["Arr_Delay"] > 0) else 0,
-    axis=1,
-)
-Delay_view["Absorption_Delay"] = Delay_view.apply(
-    lambda x: (x["Dep_Delay"] - x["Arr_Delay"])
-    if (x["Sum_Delay"] > x["Arr_Delay"]) & (x["Dep_Delay"] > 0)
-    else 0,
+# Displaying the target data
+pd.concat(
+    [
+        df_flight[
+            [
+                "FlightDate",
+                "Delay_Carrier",
+                "Delay_Weather",
+                "Delay_NAS",
+                "Delay_Security",
+                "Delay_LastAircraft",
+                "Dep_Delay",
+                "Arr_Delay",
+            ]
+        ].head(20),
+        delay_columns.head(20),
+    ],
     axis=1,
 )
 
-# Updating 'Sum_Delay' to include 'Delay_Missing'
-Delay_view["Sum_Delay"] = Delay_view["Sum_Delay"] + Delay_view["Delay_Missing"]
-
-# Displaying the target data
-Delay_view.head(20)
-
 # %% [markdown]
 # Now we can observe these delays by airline, aggregating all raw delays (without considering potential advancements in flight).
 
@@ -798,34 +514,32 @@ import plotly.graph_objects as go
 import pandas as pd
 import plotly.express as px
 
-# Assuming df_flight and Delay_view are already defined
-
-# Concatenating the new columns with the original dataset (df_flight)
-df_flight = pd.concat(
-    [df_flight, Delay_view[["Sum_Delay", "Delay_Missing", "Absorption_Delay"]]], axis=1
-)
-
-# Grouping and aggregating the data
-Airline_delay = df_flight.groupby("Airline").agg(
-    {
-        "Dep_Delay": "mean",
-        "Arr_Delay": "mean",
-        "Sum_Delay": "mean",
-        "Delay_Carrier": "mean",
-        "Delay_LastAircraft": "mean",
-        "Delay_Weather": "mean",
-        "Delay_NAS": "mean",
-        "Delay_Security": "mean",
-        "Delay_Missing": "mean",
-        "Absorption_Delay": "mean",
-    }
+# Adding the new columns to the original dataset (df_flight)
+df_flight[delay_columns.columns] = delay_columns
+
+# Grouping and aggregating the data (mean delays and number of flights per airline)
+delay_means = [
+    "Dep_Delay",
+    "Arr_Delay",
+    "Sum_Delay",
+    "Delay_Carrier",
+    "Delay_LastAircraft",
+    "Delay_Weather",
+    "Delay_NAS",
+    "Delay_Security",
+    "Delay_Missing",
+    "Absorption_Delay",
+]
+# Partial sums and counts per row range on every core, merged per airline
+Airline_delay = partitioned_agg(
+    df_flight,
+    "Airline",
+    {column: "mean" for column in delay_means},
+    Number_of_flights=("Dep_Delay", "size"),
 )
 
 Sum_Delay_Mean = df_flight["Sum_Delay"].mean()
 
-# Adding the number of flights by counting occurrences in the 'Airline' column
-Airline_delay["Number_of_flights"] = df_flight["Airline"].value_counts()
-
 # Sorting data by the mean of cumulative delays ('Sum_Delay') and resetting the index
 Airline_delay = Airline_delay.sort_values(by="Sum_Delay", ascending=False).reset_index()
 
@@ -880,47 +594,10 @@ fig.show()
 # Now, let's observe their ability to absorb these delays in flight.
 
 # %%
-Airline_delay["Delay_Absorption"] = (
-    Airline_delay["Dep_Delay"] - Airline_delay["Arr_Delay"]
-)
-Airline_delay = Airline_delay.sort_values(by="Delay_Absorption", ascending=False)
-
-# Initialization of x and y axis values
-x = Airline_delay["Airline"]
-y1 = Airline_delay["Dep_Delay"]
-y2 = Airline_delay["Arr_Delay"]
-
-plt.figure(figsize=(14, 8))
-
-# Area plot
-plt.fill_between(x, y1, color="skyblue", alpha=0.4, label="Dep_Delay")
-plt.fill_between(x, y2, color="lightcoral", alpha=0.4, label="Arr_Delay")
-
-# Annotations
-plt.annotate(
-    "Inability to recover from delays",
-    xy=("Hawaiian Airlines Inc.", 10),
-    xytext=(-50, 50),  # Text position relative to annotated point
-    textcoords="offset points",  # Text offset from point
-    arrowprops=dict(arrowstyle="->", lw=1.5, color="black"),  # Arrow style
-)
-plt.annotate(
-    "Strong ability to recover from delays",
-    xy=("Delta Air Lines Inc", 3),
-    xytext=(-50, 50),  # Text position relative to annotated point
-    textcoords="offset points",  # Text offset from point
-    arrowprops=dict(arrowstyle="->", lw=1.5, color="black"),  # Arrow style
-)
-
-# Add labels, title, and legend
-plt.xlabel("Airline")
-plt.ylabel("Minutes of Delay")
-plt.title("Departure and Arrival Delays by Airline")
-plt.legend()
-
-# Display the graph
-plt.grid(True)
-plt.xticks(rotation=75)
+# Ranking of the airlines by delay absorption (Dep_Delay - Arr_Delay), drawn
+# from the per-airline means computed above
+Airline_delay = figures.delay_absorption(Airline_delay)
+draw(figures.DELAY_ABSORPTION, Airline_delay, prepared=True)
 plt.tight_layout()
 plt.show()
 
@@ -928,6 +605,44 @@ plt.show()
 print("RANKING OF AIRLINES BY DELAY ABSORPTION CAPACITY (min)")
 Airline_delay[["Airline", "Delay_Absorption"]]
 
+# %% [markdown]
+# **Keeping these summaries up to date**
+#
+# When a new month of BTS data arrives, the airline, airport and monthly delay summaries are updated from partial aggregates stored per (key, month) instead of re-running the whole year. Only the new rows are scanned; means, medians and flight shares are merged from the partials.
+
+# %%
+from flight_tools import IncrementalAggregates
+
+delay_stores = {
+    "airline": IncrementalAggregates(
+        "../data/delay_partials/airline", keys=["Airline"]
+    ),
+    "airport": IncrementalAggregates(
+        "../data/delay_partials/airport", keys=["Dep_Airport", "Dep_CityName"]
+    ),
+}
+
+# Folding a file that has already been folded is a no-op
+for store in delay_stores.values():
+    store.fold(df_flight, source="US_flights_2023.csv")
+
+# Monthly delays are merged from the airline partials
+delay_stores["airline"].summary(by=["YearMonth"])
+
+# %% [markdown]
+# **Batch report**
+#
+# The figures above are figure jobs from `flight_tools.figures.analysis_2`. For the headless batch job they are rendered in parallel worker processes reading the columns from shared memory, with one PNG per figure plus a timing table. The run is guarded so that it only starts from the main process.
+
+# %%
+if __name__ == "__main__":
+    timings = run_report(
+        figures.JOBS,
+        {"flights": df_flight, "late_flights": only_late_flight},
+        "figures/analysis_2",
+    )
+    print(timings)
+
 # %% [markdown]
 # # **CONCLUSIONS**
 
@@ -0,0 +1,65 @@
+"""Shared helpers for the US 2023 civil flights analyses."""
+
+from .aggregate import AggSpec, group_codes, multi_aggregate
+from .boxes import GroupedQuantiles, box_stats, boxplot
+from .cache import (
+    build_cache,
+    iter_cached,
+    iter_cached_chunks,
+    load_cached,
+    read_cached,
+)
+from .columns import (
+    DERIVED,
+    WEEKDAY_NAMES,
+    add_derived,
+    clear_derived,
+    derived,
+    frame_cache,
+    register_derived,
+)
+from .dedup import (
+    Deduplication,
+    drop_duplicate_rows,
+    duplicated_rows,
+    row_fingerprints,
+)
+from .delays import DELAY_CAUSE_COLUMNS, delay_decomposition
+from .distributions import Distribution, compute_distribution, distribution, histplot
+from .incremental import IncrementalAggregates, year_month
+from .dtypes import DtypeOptimization, optimize_dtypes
+from .join import (
+    AirportDayTable,
+    attach_airports,
+    attach_weather,
+)
+from .loader import (
+    DATA_DIR,
+    DATASETS,
+    DatasetSchema,
+    iter_typed_chunks,
+    load_airports,
+    load_cancelled_diverted,
+    load_dataset,
+    load_flights,
+    load_weather,
+    read_typed_csv,
+)
+from .maps import feature_collection, point_layer
+from .parallel import async_apply, async_apply_async, parallel_apply
+from .partitioned import partitioned_agg, partitioned_agg_cached
+from .profiling import (
+    StreamingProfile,
+    profile_cached,
+    profile_csv,
+    profile_dataset,
+    profile_frame,
+)
+from .render import DENSITY_THRESHOLD, category_density, density_raster, scatter
+from .report import FigureJob, draw, run_report
+from .sampling import Reservoir, Sample, sample_csv, sample_dataset, sample_frame
+from .sketches import HyperLogLog, TDigest, digests_by_group
+from .stats import BivariateMoments, PairwiseMoments, target_correlations
+from .thresholds import ThresholdIndex
+from .transform import LRUCache, map_unique
+from .violins import ViolinDensities, top_levels, violin_densities, violinplot
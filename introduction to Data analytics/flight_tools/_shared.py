@@ -0,0 +1,154 @@
+"""Hand frame columns to worker processes through shared memory.
+
+The parent copies each column into a ``multiprocessing.shared_memory``
+segment once; workers receive small picklable descriptors and rebuild the
+frame as zero-copy NumPy views. Categoricals travel as their integer codes
+(the categories themselves are small and pickled), datetimes as ``int64``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class SharedArray:
+    """Picklable handle of one array living in a shared memory segment."""
+
+    segment: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+    def attach(self) -> Tuple[np.ndarray, shared_memory.SharedMemory]:
+        """Map the segment and return ``(array view, segment)``.
+
+        The segment must be kept referenced for as long as the view is used.
+        """
+        segment = shared_memory.SharedMemory(name=self.segment)
+        array = np.ndarray(self.shape, dtype=np.dtype(self.dtype), buffer=segment.buf)
+        return array, segment
+
+
+@dataclass(frozen=True)
+class SharedColumn:
+    """One frame column: its values plus what is needed to restore the dtype."""
+
+    values: SharedArray
+    dtype: str
+    categories: Optional[pd.Index] = None
+    ordered: bool = False
+
+
+def share_array(
+    array: np.ndarray, segments: List[shared_memory.SharedMemory]
+) -> SharedArray:
+    """Copy ``array`` into a new segment, appended to ``segments``."""
+    array = np.ascontiguousarray(array)
+    segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    segments.append(segment)
+    np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+    return SharedArray(segment.name, array.shape, array.dtype.str)
+
+
+def _share_column(
+    values: pd.Series, segments: List[shared_memory.SharedMemory]
+) -> SharedColumn:
+    dtype = values.dtype
+    if dtype == object:
+        values = values.astype("category")
+        dtype = values.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return SharedColumn(
+            share_array(values.cat.codes.to_numpy(), segments),
+            "category",
+            dtype.categories,
+            dtype.ordered,
+        )
+    if pd.api.types.is_datetime64_dtype(dtype):
+        return SharedColumn(
+            share_array(values.to_numpy().view(np.int64), segments), str(dtype)
+        )
+    if isinstance(dtype, pd.api.extensions.ExtensionDtype):
+        # Nullable integers and floats become float64 with NaN for missing
+        values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    else:
+        values = values.to_numpy()
+    return SharedColumn(share_array(values, segments), str(values.dtype))
+
+
+class SharedFrame:
+    """Columns of a frame copied into shared memory, unlinked on ``close``.
+
+    >>> with SharedFrame(flights_df, ["Airline", "Dep_Delay"]) as shared:
+    ...     pool.submit(work, shared.columns)
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: Optional[Sequence[str]] = None):
+        self._segments: List[shared_memory.SharedMemory] = []
+        columns = list(df.columns if columns is None else columns)
+        try:
+            self.columns: Dict[str, SharedColumn] = {
+                column: _share_column(df[column], self._segments) for column in columns
+            }
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def nbytes(self) -> int:
+        return sum(segment.size for segment in self._segments)
+
+    def close(self):
+        for segment in self._segments:
+            segment.close()
+            segment.unlink()
+        self._segments = []
+
+    def __enter__(self) -> "SharedFrame":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach_frame(
+    columns: Dict[str, SharedColumn],
+) -> Tuple[pd.DataFrame, List[shared_memory.SharedMemory]]:
+    """Rebuild a frame from the descriptors of :class:`SharedFrame`.
+
+    Returns the frame and the mapped segments, which the caller keeps open
+    while the frame is in use.
+    """
+    data = {}
+    segments = []
+    for name, column in columns.items():
+        values, segment = column.values.attach()
+        segments.append(segment)
+        if column.dtype == "category":
+            data[name] = pd.Categorical.from_codes(
+                values,
+                dtype=pd.CategoricalDtype(column.categories, column.ordered),
+                validate=False,
+            )
+        elif column.dtype.startswith("datetime64"):
+            data[name] = values.view(column.dtype)
+        else:
+            data[name] = values
+    return pd.DataFrame(data, copy=False), segments
+
+
+# Frames already attached in this worker process, keyed by segment names
+_ATTACHED: Dict[Tuple[str, ...], Tuple[pd.DataFrame, list]] = {}
+
+
+def attached_frame(columns: Dict[str, SharedColumn]) -> pd.DataFrame:
+    """:func:`attach_frame`, done once per worker process for the same segments."""
+    key = tuple(column.values.segment for column in columns.values())
+    if key not in _ATTACHED:
+        _ATTACHED[key] = attach_frame(columns)
+    return _ATTACHED[key][0]
@@ -0,0 +1,195 @@
+"""Declarative multi-aggregation over integer-coded group keys.
+
+All specs sharing the same group keys reuse one set of integer codes, and each
+value column is read once for all of its statistics, instead of one pandas
+``groupby`` per summary.
+
+>>> summaries = multi_aggregate(
+...     flights_df,
+...     [
+...         AggSpec("Airline", "Dep_Delay", "mean"),
+...         AggSpec("Airline", None, "size"),
+...         AggSpec(("Year", "Month"), "Dep_Delay", "mean"),
+...     ],
+... )
+>>> summaries["Airline"]["Dep_Delay_mean"]
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+STATS = ("size", "count", "sum", "sumsq", "mean", "min", "max", "var", "std")
+
+# Above this many key combinations the observed groups are found by sorting
+# instead of through a dense lookup table
+DENSE_GROUP_LIMIT = 1 << 24
+
+Keys = Union[str, Tuple[str, ...]]
+
+
+@dataclass(frozen=True)
+class AggSpec:
+    """One summary: ``stat`` of ``column`` per ``keys`` group.
+
+    ``column`` may be ``None`` for ``"size"``. ``name`` defaults to
+    ``"<column>_<stat>"`` (or ``"size"``).
+    """
+
+    keys: Keys
+    column: Optional[str]
+    stat: str
+    name: Optional[str] = None
+
+    def __post_init__(self):
+        if self.stat not in STATS:
+            raise ValueError(
+                f"Unknown statistic {self.stat!r}, expected one of {STATS}"
+            )
+        if self.column is None and self.stat != "size":
+            raise ValueError(f"Statistic {self.stat!r} needs a column")
+
+    @property
+    def key_tuple(self) -> Tuple[str, ...]:
+        return (self.keys,) if isinstance(self.keys, str) else tuple(self.keys)
+
+    @property
+    def label(self) -> str:
+        if self.name:
+            return self.name
+        return "size" if self.stat == "size" else f"{self.column}_{self.stat}"
+
+
+def key_codes(values) -> Tuple[np.ndarray, pd.Index]:
+    """Integer codes (``-1`` for missing) and sorted uniques of one key column."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return np.asarray(values.cat.codes, dtype=np.int64), values.cat.categories
+    codes, uniques = pd.factorize(values, sort=True)
+    return codes.astype(np.int64, copy=False), pd.Index(uniques)
+
+
+def group_codes(
+    df: pd.DataFrame, keys: Sequence[str]
+) -> Tuple[np.ndarray, pd.Index, int]:
+    """Encode the ``keys`` columns of ``df`` as one dense group code per row.
+
+    Returns ``(codes, index, n_groups)`` where ``codes`` is ``-1`` for rows with
+    a missing key, and ``index`` labels the observed groups in sorted order
+    (a ``MultiIndex`` when there are several keys), as ``groupby`` would.
+    """
+    keys = list(keys)
+    per_key = [key_codes(df[key]) for key in keys]
+    sizes = [max(len(uniques), 1) for _, uniques in per_key]
+
+    combined = np.zeros(len(df), dtype=np.int64)
+    missing = np.zeros(len(df), dtype=bool)
+    for codes, size in zip((c for c, _ in per_key), sizes):
+        combined *= size
+        combined += codes
+        missing |= codes < 0
+
+    total = int(np.prod(sizes, dtype=np.int64))
+    present = combined[~missing]
+    if total <= DENSE_GROUP_LIMIT:
+        observed = np.flatnonzero(np.bincount(present, minlength=total))
+        lookup = np.full(total, -1, dtype=np.int64)
+        lookup[observed] = np.arange(len(observed))
+        dense = lookup[present]
+    else:
+        observed, dense = np.unique(present, return_inverse=True)
+
+    codes = np.full(len(df), -1, dtype=np.int64)
+    codes[~missing] = dense
+
+    levels = [uniques for _, uniques in per_key]
+    if len(keys) == 1:
+        index = levels[0].take(observed)
+        index.name = keys[0]
+    else:
+        level_codes = np.unravel_index(observed, sizes)
+        index = pd.MultiIndex(levels=levels, codes=list(level_codes), names=keys)
+    return codes, index, len(observed)
+
+
+def _column_stats(
+    values: np.ndarray, codes: np.ndarray, n_groups: int, stats: Iterable[str]
+) -> Dict[str, np.ndarray]:
+    stats = set(stats)
+    valid = (codes >= 0) & ~np.isnan(values)
+    codes = codes[valid]
+    values = values[valid]
+
+    out = {}
+    count = np.bincount(codes, minlength=n_groups).astype(np.float64)
+    total = np.bincount(codes, weights=values, minlength=n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+        if stats & {"var", "std"}:
+            deviation = values - mean[codes]
+            squared = np.bincount(
+                codes, weights=deviation * deviation, minlength=n_groups
+            )
+            var = squared / (count - 1)
+            var[count < 2] = np.nan
+            out["var"] = var
+            out["std"] = np.sqrt(var)
+    if "sumsq" in stats:
+        out["sumsq"] = np.bincount(codes, weights=values * values, minlength=n_groups)
+    if "min" in stats:
+        low = np.full(n_groups, np.inf)
+        np.minimum.at(low, codes, values)
+        out["min"] = np.where(count > 0, low, np.nan)
+    if "max" in stats:
+        high = np.full(n_groups, -np.inf)
+        np.maximum.at(high, codes, values)
+        out["max"] = np.where(count > 0, high, np.nan)
+    out["count"] = count
+    out["sum"] = total
+    out["mean"] = mean
+    return out
+
+
+def multi_aggregate(
+    df: pd.DataFrame, specs: Sequence[AggSpec]
+) -> Dict[Keys, pd.DataFrame]:
+    """Evaluate all ``specs`` over ``df`` and return one frame per key set.
+
+    The result is keyed like the specs (``"Airline"`` or ``("Year", "Month")``)
+    and each frame has one column per spec label, indexed by the observed
+    groups in sorted order.
+    """
+    by_keys: Dict[Tuple[str, ...], list] = {}
+    for spec in specs:
+        by_keys.setdefault(spec.key_tuple, []).append(spec)
+
+    results = {}
+    for keys, key_specs in by_keys.items():
+        codes, index, n_groups = group_codes(df, keys)
+
+        columns = {}
+        by_column: Dict[str, list] = {}
+        for spec in key_specs:
+            if spec.stat == "size":
+                columns[spec.label] = np.bincount(codes[codes >= 0], minlength=n_groups)
+            else:
+                by_column.setdefault(spec.column, []).append(spec)
+
+        for column, column_specs in by_column.items():
+            values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            stats = _column_stats(
+                values, codes, n_groups, [spec.stat for spec in column_specs]
+            )
+            for spec in column_specs:
+                result = stats[spec.stat]
+                if spec.stat == "count":
+                    result = result.astype(np.int64)
+                columns[spec.label] = result
+
+        ordered = [spec.label for spec in key_specs]
+        key = keys[0] if len(keys) == 1 else keys
+        results[key] = pd.DataFrame(columns, index=index)[ordered]
+    return results
@@ -0,0 +1,218 @@
+"""Box plots drawn from per-group t-digests instead of raw arrays.
+
+:class:`GroupedQuantiles` keeps one mergeable
+:class:`~flight_tools.sketches.TDigest` per group, built with a single sort
+of the column and updated chunk by chunk or merged across processes. Box
+statistics (quartiles, 1.5 IQR whiskers, extremes) are read off the digests
+and :func:`boxplot` hands them to ``Axes.bxp``: no per-group array is kept
+and no outlier point is drawn one by one.
+
+>>> boxplot(flights_df, x="Airline", y="Arr_Delay")
+>>> box_stats(flights_df, x="Airline", y="Arr_Delay")
+>>> quantiles = GroupedQuantiles("Airline", "Arr_Delay")
+>>> for chunk in iter_cached_chunks(path, schema):
+...     quantiles.update(chunk)
+>>> quantiles.quantile([0.25, 0.5, 0.75])
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence, Union
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from .aggregate import group_codes
+from .columns import frame_cache, with_derived
+from .sketches import DEFAULT_COMPRESSION, TDigest, digests_by_group
+
+BOX_COLUMNS = ("count", "min", "whislo", "q1", "med", "q3", "whishi", "max")
+
+Keys = Union[None, str, Sequence[str]]
+
+
+class GroupedQuantiles:
+    """Mergeable t-digests of ``column`` per ``by`` group.
+
+    ``by`` may name derived columns such as ``Month``; with ``by=None`` all
+    rows form one group labelled by ``column``. Groups keep the order in
+    which they were first seen (category order for categorical keys).
+    """
+
+    def __init__(self, by: Keys, column: str, compression: float = DEFAULT_COMPRESSION):
+        self.keys = [] if by is None else [by] if isinstance(by, str) else list(by)
+        self.column = column
+        self.compression = compression
+        self.digests: Dict[object, TDigest] = {}
+
+    def __repr__(self):
+        return (
+            f"GroupedQuantiles(by={self.keys}, column={self.column!r}, "
+            f"groups={len(self.digests)})"
+        )
+
+    def update(self, df: pd.DataFrame) -> "GroupedQuantiles":
+        values = df[self.column].to_numpy(dtype=np.float64, na_value=np.nan)
+        if self.keys:
+            codes, index, n_groups = group_codes(with_derived(df, self.keys), self.keys)
+        else:
+            codes = np.zeros(len(values), dtype=np.int64)
+            index, n_groups = pd.Index([self.column]), 1
+        digests = digests_by_group(codes, values, n_groups, self.compression)
+        for label, digest in zip(index, digests):
+            if digest is not None:
+                self._add(label, digest)
+        return self
+
+    def merge(self, other: "GroupedQuantiles") -> "GroupedQuantiles":
+        for label, digest in other.digests.items():
+            self._add(label, TDigest.from_dict(digest.to_dict()))
+        return self
+
+    def _add(self, label, digest: TDigest):
+        if label in self.digests:
+            self.digests[label].merge(digest)
+        else:
+            self.digests[label] = digest
+
+    def _index(self) -> pd.Index:
+        labels = list(self.digests)
+        if len(self.keys) > 1:
+            return pd.MultiIndex.from_tuples(labels, names=self.keys)
+        return pd.Index(labels, name=self.keys[0] if self.keys else None)
+
+    def count(self) -> pd.Series:
+        counts = [digest.count for digest in self.digests.values()]
+        return pd.Series(counts, index=self._index(), name="count").astype(np.int64)
+
+    def quantile(self, q=0.5):
+        """Series of approximate ``q`` quantiles, or a frame with one column per q."""
+        rows = [digest.quantile(q) for digest in self.digests.values()]
+        if np.ndim(q) == 0:
+            return pd.Series(rows, index=self._index(), name=q, dtype=np.float64)
+        return pd.DataFrame(
+            np.reshape(rows, (len(rows), len(q))), index=self._index(), columns=q
+        )
+
+    def median(self) -> pd.Series:
+        return self.quantile(0.5)
+
+    def boxes(self, whis: float = 1.5) -> pd.DataFrame:
+        """Box statistics per group, named as ``matplotlib.cbook.boxplot_stats``.
+
+        Whiskers end at the extreme value when it lies within ``whis`` IQR
+        of the box, otherwise at ``q1 - whis * iqr`` / ``q3 + whis * iqr``
+        (the furthest data point inside the fence is not kept by the digest).
+        """
+        quartiles = self.quantile([0.25, 0.5, 0.75]).to_numpy()
+        q1, med, q3 = quartiles.T if len(quartiles) else np.empty((3, 0))
+        low = np.array([digest.min for digest in self.digests.values()])
+        high = np.array([digest.max for digest in self.digests.values()])
+        iqr = q3 - q1
+        frame = pd.DataFrame(
+            {
+                "count": self.count().to_numpy(),
+                "min": low,
+                "whislo": np.maximum(low, q1 - whis * iqr),
+                "q1": q1,
+                "med": med,
+                "q3": q3,
+                "whishi": np.minimum(high, q3 + whis * iqr),
+                "max": high,
+            },
+            index=self._index(),
+        )
+        return frame[list(BOX_COLUMNS)]
+
+
+def box_stats(
+    data: pd.DataFrame,
+    x: Keys,
+    y: str,
+    whis: float = 1.5,
+    compression: float = DEFAULT_COMPRESSION,
+) -> pd.DataFrame:
+    """:meth:`GroupedQuantiles.boxes` of ``data``, digests cached per frame."""
+    keys = None if x is None else (x,) if isinstance(x, str) else tuple(x)
+    key = ("box_stats", keys, y, compression)
+    cache = frame_cache(data)
+    if key not in cache:
+        cache[key] = GroupedQuantiles(keys, y, compression).update(data)
+    return cache[key].boxes(whis)
+
+
+def _colors(n: int, color=None, palette=None) -> list:
+    if palette is None:
+        return [color if color is not None else "C0"] * n
+    if isinstance(palette, str):
+        cmap = plt.get_cmap(palette)
+        return [cmap(i / max(n - 1, 1)) for i in range(n)]
+    return [palette[i % len(palette)] for i in range(n)]
+
+
+def boxplot(
+    data: pd.DataFrame,
+    x: Optional[str] = None,
+    y: Union[str, Sequence[str]] = None,
+    order: Optional[Sequence] = None,
+    whis: float = 1.5,
+    ax=None,
+    color=None,
+    palette=None,
+    showfliers: bool = True,
+    **bxp_kws,
+):
+    """``sns.boxplot(data=data, x=x, y=y)`` drawn from t-digest box statistics.
+
+    With ``x=None`` and a list of columns for ``y`` there is one box per
+    column, as in ``DataFrame.boxplot``. ``palette`` is a colormap name or a
+    list of colours. With ``showfliers`` the group minimum and maximum are
+    marked when they lie beyond the whiskers, standing in for the outliers.
+    """
+    ax = ax or plt.gca()
+    if x is None and not isinstance(y, str):
+        boxes = pd.concat([box_stats(data, None, column, whis) for column in y])
+    else:
+        boxes = box_stats(data, x, y, whis)
+    if order is not None:
+        boxes = boxes.reindex(order).dropna(subset=["med"])
+
+    stats = []
+    for label, row in boxes.iterrows():
+        fliers = [
+            value
+            for value, whisker in (
+                (row["min"], row["whislo"]),
+                (row["max"], row["whishi"]),
+            )
+            if value != whisker
+        ]
+        stats.append(
+            {
+                "label": str(label),
+                "med": row["med"],
+                "q1": row["q1"],
+                "q3": row["q3"],
+                "whislo": row["whislo"],
+                "whishi": row["whishi"],
+                "fliers": np.array(fliers if showfliers else []),
+            }
+        )
+
+    bxp_kws = {
+        "widths": 0.8,
+        "patch_artist": True,
+        "medianprops": {"color": "0.2"},
+        "flierprops": {"marker": "d", "markerfacecolor": "0.2", "markersize": 5},
+        **bxp_kws,
+    }
+    artists = ax.bxp(stats, positions=np.arange(len(stats)), **bxp_kws)
+    for patch, face in zip(artists["boxes"], _colors(len(stats), color, palette)):
+        patch.set_facecolor(face)
+
+    if x is not None:
+        ax.set_xlabel(x)
+    if isinstance(y, str):
+        ax.set_ylabel(y)
+    return ax
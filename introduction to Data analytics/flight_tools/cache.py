@@ -0,0 +1,142 @@
+"""Columnar (Arrow IPC / feather) cache for the flights datasets.
+
+Each CSV is converted once into an uncompressed Arrow file. Later loads
+memory-map that file and read only the requested columns.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from .loader import (
+    DATASETS,
+    DEFAULT_CHUNKSIZE,
+    DatasetSchema,
+    dataset_path,
+    read_typed_csv,
+)
+
+# Bump when the on-disk layout changes; schema edits are picked up automatically
+CACHE_VERSION = 1
+
+CACHE_DIR_NAME = ".columnar_cache"
+
+
+def cache_key(path, schema: DatasetSchema) -> str:
+    """Hash of source path, mtime, size, schema and cache version."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    fingerprint = "|".join(
+        [
+            str(path),
+            str(stat.st_mtime_ns),
+            str(stat.st_size),
+            repr(schema),
+            str(CACHE_VERSION),
+        ]
+    )
+    return hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:16]
+
+
+def cache_path(path, schema: DatasetSchema, cache_dir=None) -> Path:
+    path = Path(path)
+    cache_dir = Path(cache_dir) if cache_dir else path.parent / CACHE_DIR_NAME
+    return cache_dir / f"{path.stem}-{cache_key(path, schema)}.arrow"
+
+
+def build_cache(
+    path, schema: DatasetSchema, cache_dir=None, chunksize: int = DEFAULT_CHUNKSIZE
+) -> Path:
+    """Parse ``path`` with its schema and write the typed frame as an Arrow file."""
+    target = cache_path(path, schema, cache_dir)
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    # Drop files cached from older versions of the same source
+    for stale in target.parent.glob(f"{Path(path).stem}-*.arrow"):
+        if stale != target:
+            stale.unlink()
+
+    df = read_typed_csv(path, schema, chunksize=chunksize)
+    tmp = target.with_suffix(".arrow.tmp")
+    # Uncompressed so the file can be memory-mapped without decoding
+    feather.write_feather(df, tmp, compression="uncompressed")
+    os.replace(tmp, target)
+    return target
+
+
+def _cached_table(path, schema, columns, cache_dir, chunksize) -> pa.Table:
+    target = cache_path(path, schema, cache_dir)
+    if not target.exists():
+        build_cache(path, schema, cache_dir, chunksize)
+    return feather.read_table(
+        target, columns=list(columns) if columns is not None else None, memory_map=True
+    )
+
+
+def read_cached(
+    path,
+    schema: DatasetSchema,
+    columns: Optional[Sequence[str]] = None,
+    cache_dir=None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> pd.DataFrame:
+    """Read ``path`` through the cache, building it on first use."""
+    table = _cached_table(path, schema, columns, cache_dir, chunksize)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def iter_cached_chunks(
+    path,
+    schema: DatasetSchema,
+    columns: Optional[Sequence[str]] = None,
+    cache_dir=None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[pd.DataFrame]:
+    """Yield the cached table in frames of ``chunksize`` rows.
+
+    The file stays memory-mapped; only the chunk being yielded is converted
+    to pandas, so memory use does not grow with the table.
+    """
+    table = _cached_table(path, schema, columns, cache_dir, chunksize)
+    for start in range(0, table.num_rows, chunksize):
+        yield table.slice(start, chunksize).to_pandas(split_blocks=True)
+
+
+def load_cached(
+    name: str,
+    columns: Optional[Sequence[str]] = None,
+    data_dir=None,
+    cache_dir=None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> pd.DataFrame:
+    """Cached counterpart of ``load_dataset``, with column projection.
+
+    >>> flights = load_cached("flights", columns=["Airline", "Dep_Delay"])
+    """
+    return read_cached(
+        dataset_path(name, data_dir), DATASETS[name], columns, cache_dir, chunksize
+    )
+
+
+def iter_cached(
+    name: str,
+    columns: Optional[Sequence[str]] = None,
+    data_dir=None,
+    cache_dir=None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[pd.DataFrame]:
+    """Cached counterpart of ``iter_typed_chunks`` for one of the ``DATASETS``.
+
+    >>> for chunk in iter_cached("flights", columns=["Dep_Delay"]):
+    ...     ...
+    """
+    return iter_cached_chunks(
+        dataset_path(name, data_dir), DATASETS[name], columns, cache_dir, chunksize
+    )
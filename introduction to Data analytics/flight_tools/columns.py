@@ -0,0 +1,151 @@
+"""Registry of derived columns, computed lazily and cached per frame.
+
+Each derived column is declared once with the column it comes from and a
+function of that column's *unique* values (365 dates or 7 weekday numbers
+rather than 6.7M rows); the result is gathered back onto the rows by code.
+Results are cached for the lifetime of the frame, so every cell or analysis
+asking for ``Month`` on the same frame shares one computation.
+
+>>> add_derived(flights_df, "Month", "Year")
+>>> flights_df["Day_Of_Week"] = derived(flights_df, "Weekday")
+"""
+
+from __future__ import annotations
+
+import weakref
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .aggregate import key_codes
+
+WEEKDAY_NAMES = (
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+)
+
+
+@dataclass(frozen=True)
+class DerivedColumn:
+    """``compute`` maps the unique values of ``source`` to the derived values."""
+
+    name: str
+    source: str
+    compute: Callable[[pd.Index], object]
+
+
+DERIVED: Dict[str, DerivedColumn] = {}
+
+# id(frame) -> {key: cached result}; entries are dropped when the frame is
+# collected. Derived columns are keyed by name, other modules use tuples.
+_CACHE: Dict[int, Dict[Hashable, object]] = {}
+
+
+def register_derived(name: str, source: str):
+    """Decorator declaring ``name`` as derived from the ``source`` column."""
+
+    def decorator(compute):
+        DERIVED[name] = DerivedColumn(name, source, compute)
+        return compute
+
+    return decorator
+
+
+@register_derived("Month", "FlightDate")
+def _month(dates: pd.Index):
+    return dates.month.to_numpy(dtype=np.int8)
+
+
+@register_derived("Year", "FlightDate")
+def _year(dates: pd.Index):
+    return dates.year.to_numpy(dtype=np.int16)
+
+
+@register_derived("YearMonth", "FlightDate")
+def _year_month(dates: pd.Index):
+    return (dates.year * 100 + dates.month).to_numpy(dtype=np.int32)
+
+
+@register_derived("Week", "FlightDate")
+def _week(dates: pd.Index):
+    return dates.isocalendar().week.to_numpy(dtype=np.int8)
+
+
+@register_derived("Weekday", "Day_Of_Week")
+def _weekday(days: pd.Index):
+    # Day_Of_Week runs from 1 (Monday) to 7 (Sunday)
+    return pd.Categorical.from_codes(
+        np.asarray(days, dtype=np.int64) - 1, categories=list(WEEKDAY_NAMES)
+    )
+
+
+def frame_cache(df: pd.DataFrame) -> Dict[Hashable, object]:
+    """Results cached for ``df``, kept for as long as the frame is alive."""
+    key = id(df)
+    if key not in _CACHE:
+        _CACHE[key] = {}
+        weakref.finalize(df, _CACHE.pop, key, None)
+    return _CACHE[key]
+
+
+def derived(df: pd.DataFrame, name: str) -> pd.Series:
+    """The derived column ``name`` of ``df``, computed on first use."""
+    if name not in DERIVED:
+        raise KeyError(
+            f"Unknown derived column {name!r}, expected one of {list(DERIVED)}"
+        )
+    cache = frame_cache(df)
+    if name not in cache:
+        column = DERIVED[name]
+        codes, uniques = key_codes(df[column.source])
+        values = column.compute(pd.Index(uniques))
+        cache[name] = pd.Series(
+            pd.api.extensions.take(values, codes, allow_fill=True),
+            index=df.index,
+            name=name,
+        )
+    return cache[name]
+
+
+def with_derived(df: pd.DataFrame, names: Sequence[str]) -> pd.DataFrame:
+    """``df`` plus the derived ``names`` it lacks, as a new frame (``df`` is unchanged).
+
+    Names that are already columns of ``df`` are left as they are.
+    """
+    missing = [name for name in names if name not in df]
+    if not missing:
+        return df
+    for name in missing:
+        if name not in DERIVED:
+            raise KeyError(f"{name!r} is neither a column nor a derived column")
+    extra = pd.DataFrame({name: derived(df, name) for name in missing}, index=df.index)
+    return pd.concat([df, extra], axis=1)
+
+
+def source_columns(names: Sequence[str]) -> list:
+    """Columns to read for ``names``: derived names become their source column."""
+    columns = []
+    for name in names:
+        column = DERIVED[name].source if name in DERIVED else name
+        if column not in columns:
+            columns.append(column)
+    return columns
+
+
+def add_derived(df: pd.DataFrame, *names: str) -> pd.DataFrame:
+    """Attach the derived columns ``names`` to ``df`` in place and return it."""
+    for name in names:
+        df[name] = derived(df, name)
+    return df
+
+
+def clear_derived(df: pd.DataFrame):
+    """Forget everything cached for ``df``, e.g. after changing a source column."""
+    _CACHE.pop(id(df), None)
@@ -0,0 +1,188 @@
+"""Pick compact dtypes for a frame from a sample of its rows.
+
+Cardinality and parseability are measured on a random sample (hashing
+millions of strings is the expensive part). The full columns are only read
+by vectorised checks that make a conversion safe: integer ranges,
+float32 round-trip and strict date parsing. The chosen dtypes come back
+as a :class:`~flight_tools.loader.DatasetSchema`, so the CSV can be read
+directly with them next time.
+
+>>> result = optimize_dtypes(flights_df)
+>>> flights_df = result.frame
+>>> result.report
+>>> result.schema
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from .loader import DatasetSchema
+from .transform import map_unique
+
+DEFAULT_SAMPLE = 100_000
+
+# A text column becomes categorical when its sample has at most this share
+# of distinct values
+CATEGORY_RATIO = 0.5
+
+INTEGER_TYPES = (np.int8, np.int16, np.int32, np.int64)
+UNSIGNED_TYPES = (np.uint8, np.uint16, np.uint32, np.uint64)
+BOOL_STRINGS = {"True": True, "False": False, "true": True, "false": False}
+
+
+@dataclass(frozen=True)
+class DtypeOptimization:
+    """Result of :func:`optimize_dtypes`."""
+
+    frame: pd.DataFrame
+    report: pd.DataFrame
+    schema: DatasetSchema
+
+
+def _smallest_integer(low, high, unsigned: bool = False):
+    for dtype in UNSIGNED_TYPES if unsigned else INTEGER_TYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype)
+    return None
+
+
+def _optimize_integer(values: pd.Series, unsigned: bool):
+    if values.empty:
+        return values
+    dtype = _smallest_integer(values.min(), values.max(), unsigned)
+    return values.astype(dtype) if dtype is not None else values
+
+
+def _optimize_float(values: pd.Series):
+    if values.dtype == np.float32:
+        return values
+    array = values.to_numpy()
+    narrow = array.astype(np.float32)
+    # Only when every value survives the float32 round trip exactly
+    exact = (narrow.astype(array.dtype) == array) | np.isnan(array)
+    return values.astype(np.float32) if exact.all() else values
+
+
+def _parse_dates(values: pd.Series, sample: pd.Series, date_format: str):
+    try:
+        pd.to_datetime(sample.dropna(), format=date_format)
+        return pd.to_datetime(values, format=date_format)
+    except (ValueError, TypeError):
+        return None
+
+
+def _is_flags(distinct) -> bool:
+    return len(distinct) > 0 and (
+        all(isinstance(value, (bool, np.bool_)) for value in distinct)
+        or all(isinstance(value, str) and value in BOOL_STRINGS for value in distinct)
+    )
+
+
+def _all_flags(values: pd.Series, distinct) -> bool:
+    if isinstance(distinct[0], str):
+        return bool(values.dropna().isin(list(BOOL_STRINGS)).all())
+    return pd.api.types.infer_dtype(values, skipna=True) == "boolean"
+
+
+def _optimize_object(
+    values: pd.Series, sample: pd.Series, date_format: str, category_ratio: float
+):
+    present = sample.dropna()
+    if present.empty:
+        return values
+    distinct = present.unique()
+
+    # A sample of flags is confirmed on the full column, as a value the sample
+    # missed would otherwise be cast to True
+    if _is_flags(distinct) and _all_flags(values, distinct):
+        flags = map_unique(values, lambda value: BOOL_STRINGS.get(value, value))
+        return flags.astype("boolean" if flags.isna().any() else bool)
+
+    if all(isinstance(value, str) for value in distinct):
+        dates = _parse_dates(values, present, date_format)
+        if dates is not None:
+            return dates
+
+    if len(distinct) <= category_ratio * len(present):
+        return values.astype("category")
+    return values
+
+
+def optimize_dtypes(
+    df: pd.DataFrame,
+    sample: int = DEFAULT_SAMPLE,
+    category_ratio: float = CATEGORY_RATIO,
+    date_format: str = "%Y-%m-%d",
+    file_name: str = "",
+    seed: int = 0,
+) -> DtypeOptimization:
+    """Convert each column of ``df`` to the most compact safe dtype.
+
+    Text columns become ``datetime64`` when the sample parses with
+    ``date_format``, ``bool`` for True/False values, and ``category`` when
+    the sample holds at most ``category_ratio`` distinct values per row.
+    Integers are narrowed to the smallest width holding their range, and
+    floats to ``float32`` when no value changes. ``df`` itself is left
+    untouched.
+    """
+    rows = df.sample(n=sample, random_state=seed) if len(df) > sample else df
+
+    columns: Dict[str, pd.Series] = {}
+    dtypes: Dict[str, str] = {}
+    dates = []
+    report = []
+    for name in df.columns:
+        values = df[name]
+        kind = values.dtype.kind
+        if isinstance(values.dtype, pd.CategoricalDtype) or kind in "bMm":
+            converted = values
+        elif kind in "iu":
+            converted = _optimize_integer(values, unsigned=kind == "u")
+        elif kind == "f":
+            converted = _optimize_float(values)
+        elif kind == "O":
+            converted = _optimize_object(
+                values, rows[name], date_format, category_ratio
+            )
+        else:
+            converted = values
+        columns[name] = converted
+
+        if converted.dtype.kind == "M":
+            dates.append(name)
+        else:
+            dtypes[name] = str(converted.dtype)
+        before = values.memory_usage(index=False, deep=True)
+        after = converted.memory_usage(index=False, deep=True)
+        report.append(
+            {
+                "column": name,
+                "old_dtype": str(values.dtype),
+                "new_dtype": str(converted.dtype),
+                "old_bytes": before,
+                "new_bytes": after,
+            }
+        )
+
+    report = pd.DataFrame(report).set_index("column")
+    total = report[["old_bytes", "new_bytes"]].sum()
+    report.loc["Total", ["old_bytes", "new_bytes"]] = total
+    report["saved_%"] = (1 - report["new_bytes"] / report["old_bytes"]) * 100
+    report[["old_bytes", "new_bytes"]] = report[["old_bytes", "new_bytes"]].astype(
+        np.int64
+    )
+
+    frame = pd.DataFrame(columns, index=df.index)
+    schema = DatasetSchema(
+        file_name=file_name,
+        dtypes=dtypes,
+        dates=tuple(dates),
+        date_format=date_format,
+    )
+    return DtypeOptimization(frame=frame, report=report, schema=schema)
@@ -0,0 +1,56 @@
+"""The figures of the analysis scripts, each declared once as a figure job.
+
+One module per script (:mod:`.analysis_1`, :mod:`.analysis_2`,
+:mod:`.untitled_1`) holds a :class:`~flight_tools.report.FigureJob` per
+figure and the ``JOBS`` list of all of them. A script cell draws one job with
+:func:`~flight_tools.report.draw`; the batch run hands ``JOBS`` to
+:func:`~flight_tools.report.run_report`. Since the ``prepare`` and ``plot``
+functions live in an importable module, the worker processes find them under
+any start method (``spawn`` included). These modules import seaborn, so the
+package is not imported by :mod:`flight_tools` itself.
+
+>>> from flight_tools import draw, run_report
+>>> from flight_tools.figures import analysis_1
+>>> draw(analysis_1.AIRLINE_DELAYS, flights_df)
+>>> if __name__ == "__main__":
+...     run_report(analysis_1.JOBS, {"flights": flights_df}, "figures")
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Sequence
+
+import pandas as pd
+
+from ..aggregate import AggSpec, Keys, multi_aggregate
+from ..columns import frame_cache, source_columns, with_derived
+
+
+def summaries(data: pd.DataFrame, specs: Sequence[AggSpec]) -> Dict[Keys, pd.DataFrame]:
+    """:func:`~flight_tools.aggregate.multi_aggregate` of the ``specs`` ``data`` can answer.
+
+    Specs whose columns (or the source columns of derived keys such as
+    ``Month``) are missing from ``data`` are skipped. The result is cached
+    per frame: cells drawing from the full frame share one scan, while a
+    report worker, which only holds the columns of its job, computes its own
+    summary.
+    """
+    key = ("figure_summaries", tuple(specs))
+    cache = frame_cache(data)
+    if key in cache:
+        return cache[key]
+
+    available = [
+        spec
+        for spec in specs
+        if all(
+            column in data
+            for column in source_columns(
+                spec.key_tuple + (() if spec.column is None else (spec.column,))
+            )
+        )
+    ]
+    keys = list(dict.fromkeys(key for spec in available for key in spec.key_tuple))
+    result = multi_aggregate(with_derived(data, keys), available)
+    cache[key] = result
+    return result
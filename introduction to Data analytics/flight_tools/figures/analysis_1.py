@@ -0,0 +1,205 @@
+"""Figures of ``analysis 1.py``: departure delays, durations and aircraft ages.
+
+Sources: ``flights`` and ``weather``. The delay averages come from
+:func:`~flight_tools.figures.summaries`, so the cells drawing from the full
+flights frame share a single scan.
+
+>>> draw(AIRLINE_DELAYS, flights_df)
+>>> run_report(JOBS, {"flights": flights_df, "weather": weather_df}, "figures")
+"""
+
+from __future__ import annotations
+
+import seaborn as sns
+
+from ..aggregate import AggSpec
+from ..boxes import boxplot
+from ..distributions import histplot
+from ..report import FigureJob
+from . import summaries
+
+DELAY_TYPES = [
+    "Delay_Carrier",
+    "Delay_Weather",
+    "Delay_NAS",
+    "Delay_Security",
+    "Delay_LastAircraft",
+]
+
+SUMMARIES = (
+    AggSpec("Airline", "Dep_Delay", "mean"),
+    AggSpec(("Year", "Month"), "Dep_Delay", "mean"),
+    AggSpec("Day_Of_Week", "Dep_Delay", "mean"),
+    AggSpec("Manufacturer", "Dep_Delay", "mean"),
+)
+
+
+def _mean_dep_delay(data, keys):
+    return summaries(data, SUMMARIES)[keys]["Dep_Delay_mean"]
+
+
+def airline_delays(data):
+    return _mean_dep_delay(data, "Airline").sort_values(ascending=False)
+
+
+def plot_airline_delays(delays, ax):
+    sns.barplot(x=delays.values, y=delays.index, palette="viridis", ax=ax)
+    ax.set_title("Average Departure Delay by Airline (2023)")
+    ax.set_xlabel("Average Departure Delay (minutes)")
+    ax.set_ylabel("Airline")
+
+
+def plot_dep_delay_distribution(data, ax):
+    histplot(data, "Dep_Delay", bins=50, color="skyblue", ax=ax)
+    ax.set_title("Distribution of Departure Delays (2023)")
+    ax.set_xlabel("Departure Delay (minutes)")
+    ax.set_ylabel("Frequency")
+
+
+def monthly_delays(data):
+    return _mean_dep_delay(data, ("Year", "Month"))
+
+
+def plot_monthly_delays(delays, ax):
+    delays.plot(marker="o", color="orange", ax=ax)
+    ax.set_title("Average Departure Delay Over Time (2023)")
+    ax.set_xlabel("Month")
+    ax.set_ylabel("Average Departure Delay (minutes)")
+    ax.tick_params(axis="x", rotation=45)
+    ax.grid(True)
+
+
+def weekday_delays(data):
+    return _mean_dep_delay(data, "Day_Of_Week")
+
+
+def plot_weekday_delays(delays, ax):
+    sns.barplot(x=delays.index, y=delays.values, palette="Set2", ax=ax)
+    ax.set_title("Average Departure Delay by Day of the Week (2023)")
+    ax.set_xlabel("Day of the Week")
+    ax.set_ylabel("Average Departure Delay (minutes)")
+    for p in ax.patches:
+        ax.annotate(
+            f"{int(p.get_height())}",
+            (p.get_x() + p.get_width() / 2.0, p.get_height()),
+            ha="center",
+            va="center",
+            xytext=(0, 10),
+            textcoords="offset points",
+        )
+
+
+def plot_delay_types(data, ax):
+    delay_counts = data[DELAY_TYPES].sum()
+    delay_counts.plot(kind="bar", color="lightblue", ax=ax)
+    ax.set_title("Total Flight Delays by Delay Type (2023)")
+    ax.set_xlabel("Delay Type")
+    ax.set_ylabel("Total Delay Count")
+    ax.tick_params(axis="x", rotation=45)
+    for i, count in enumerate(delay_counts):
+        ax.text(i, count, str(int(count)), ha="center", va="bottom")
+
+
+def plot_duration_distribution(data, ax):
+    histplot(data, "Flight_Duration", bins=50, color="green", ax=ax)
+    ax.set_title("Distribution of Flight Durations (2023)")
+    ax.set_xlabel("Flight Duration (minutes)")
+    ax.set_ylabel("Frequency")
+
+
+def plot_age_distribution(data, ax):
+    histplot(data, "Aicraft_age", bins=30, color="purple", ax=ax)
+    ax.set_title("Distribution of Aircraft Ages (2023)")
+    ax.set_xlabel("Aircraft Age (years)")
+    ax.set_ylabel("Frequency")
+
+
+def plot_duration_by_airline(data, ax):
+    boxplot(data, x="Airline", y="Flight_Duration", palette="coolwarm", ax=ax)
+    ax.set_title("Flight Duration Distribution by Airline (2023)")
+    ax.set_xlabel("Airline")
+    ax.set_ylabel("Flight Duration (minutes)")
+    ax.tick_params(axis="x", rotation=45)
+
+
+def manufacturer_delays(data):
+    return _mean_dep_delay(data, "Manufacturer").sort_values(ascending=False)
+
+
+def plot_manufacturer_delays(delays, ax):
+    sns.barplot(x=delays.values, y=delays.index, palette="spring", ax=ax)
+    ax.set_title("Average Departure Delay by Aircraft Manufacturer (2023)")
+    ax.set_xlabel("Average Departure Delay (minutes)")
+    ax.set_ylabel("Manufacturer")
+
+
+def plot_temperature_distribution(data, ax):
+    histplot(data, "tavg", bins=30, color="orange", ax=ax)
+    ax.set_title("Distribution of Temperature (2023)")
+    ax.set_xlabel("Temperature (°C)")
+    ax.set_ylabel("Frequency")
+
+
+AIRLINE_DELAYS = FigureJob(
+    "airline_delays",
+    plot_airline_delays,
+    columns=("Airline", "Dep_Delay"),
+    prepare=airline_delays,
+    figsize=(12, 6),
+)
+DEP_DELAY = FigureJob("dep_delay", plot_dep_delay_distribution, columns=("Dep_Delay",))
+MONTHLY_DELAYS = FigureJob(
+    "monthly_delays",
+    plot_monthly_delays,
+    columns=("FlightDate", "Dep_Delay"),
+    prepare=monthly_delays,
+    figsize=(12, 6),
+)
+WEEKDAY_DELAYS = FigureJob(
+    "weekday_delays",
+    plot_weekday_delays,
+    columns=("Day_Of_Week", "Dep_Delay"),
+    prepare=weekday_delays,
+    figsize=(8, 6),
+)
+DELAY_TYPE_TOTALS = FigureJob(
+    "delay_types", plot_delay_types, columns=tuple(DELAY_TYPES)
+)
+FLIGHT_DURATION = FigureJob(
+    "flight_duration", plot_duration_distribution, columns=("Flight_Duration",)
+)
+AIRCRAFT_AGE = FigureJob(
+    "aircraft_age", plot_age_distribution, columns=("Aicraft_age",)
+)
+DURATION_BY_AIRLINE = FigureJob(
+    "duration_by_airline",
+    plot_duration_by_airline,
+    columns=("Airline", "Flight_Duration"),
+    figsize=(12, 6),
+)
+MANUFACTURER_DELAYS = FigureJob(
+    "manufacturer_delays",
+    plot_manufacturer_delays,
+    columns=("Manufacturer", "Dep_Delay"),
+    prepare=manufacturer_delays,
+    figsize=(12, 6),
+)
+TEMPERATURE = FigureJob(
+    "temperature",
+    plot_temperature_distribution,
+    source="weather",
+    columns=("tavg",),
+)
+
+JOBS = [
+    AIRLINE_DELAYS,
+    DEP_DELAY,
+    MONTHLY_DELAYS,
+    WEEKDAY_DELAYS,
+    DELAY_TYPE_TOTALS,
+    FLIGHT_DURATION,
+    AIRCRAFT_AGE,
+    DURATION_BY_AIRLINE,
+    MANUFACTURER_DELAYS,
+    TEMPERATURE,
+]
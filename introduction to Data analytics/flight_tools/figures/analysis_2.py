@@ -0,0 +1,403 @@
+"""Figures of ``analysis 2.py``: flight shares, arrival delays and their causes.
+
+Sources: ``flights`` and ``late_flights`` (the flights with ``Arr_Delay > 0``).
+The plotly bar chart of the delay causes and the folium airport map are not
+matplotlib figures and stay in the script.
+
+>>> draw(AIRLINE_SHARE, df_flight)
+>>> run_report(JOBS, {"flights": df_flight, "late_flights": only_late_flight}, "figures")
+"""
+
+from __future__ import annotations
+
+import calendar
+
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+from ..aggregate import AggSpec
+from ..boxes import boxplot
+from ..columns import WEEKDAY_NAMES, derived
+from ..distributions import histplot
+from ..render import category_density, scatter
+from ..report import FigureJob
+from ..stats import BivariateMoments, target_correlations
+from . import summaries
+
+NUMERIC_COLUMNS = (
+    "Day_Of_Week",
+    "Dep_Delay",
+    "Dep_Delay_Tag",
+    "Arr_Delay",
+    "Flight_Duration",
+    "Delay_Carrier",
+    "Delay_Weather",
+    "Delay_NAS",
+    "Delay_Security",
+    "Delay_LastAircraft",
+    "Aicraft_age",
+)
+
+# Dummy prefixes of the categorical columns correlated with Dep_Delay
+CORRELATED_CATEGORIES = {
+    "DepTime_label": "DepTime",
+    "Distance_type": "Distance",
+    "Manufacturer": "Manufac",
+}
+
+AIRPORT_KEYS = ("Dep_Airport", "Dep_CityName")
+
+SUMMARIES = (
+    AggSpec("Airline", None, "size"),
+    AggSpec("Day_Of_Week", None, "size"),
+    AggSpec("Manufacturer", None, "size"),
+    AggSpec(AIRPORT_KEYS, "Dep_Delay", "mean"),
+    AggSpec(AIRPORT_KEYS, None, "size"),
+    AggSpec("Airline", "Dep_Delay", "mean"),
+    AggSpec("Airline", "Arr_Delay", "mean"),
+)
+
+
+def plot_numeric_boxes(data, ax):
+    # Extreme values marked in red; quartiles and whiskers come from one
+    # t-digest per column
+    boxplot(
+        data,
+        y=list(NUMERIC_COLUMNS),
+        ax=ax,
+        flierprops=dict(marker="o", markerfacecolor="r", markersize=8),
+    )
+    ax.tick_params(axis="x", rotation=90)
+    ax.figure.suptitle(
+        "Univariate Analysis of Extreme Values in Numerical Columns (Box Plots)"
+    )
+
+
+def _flight_shares(data, keys):
+    return summaries(data, SUMMARIES)[keys]["size"] / len(data) * 100
+
+
+def airline_shares(data):
+    return _flight_shares(data, "Airline").sort_values(ascending=False)
+
+
+def plot_airline_shares(shares, ax):
+    sns.barplot(x=shares.index, y=shares.values, palette="viridis", ax=ax)
+    ax.set_title("Percentage of Flights by Airline")
+    ax.set_xlabel("Airline")
+    ax.set_ylabel("Percentage of Flights")
+    plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
+    # Percentages above each bar
+    for i, value in enumerate(shares.values):
+        ax.text(i, value, f"{value:.2f}%", ha="center", va="bottom")
+
+
+def weekday_shares(data):
+    return _flight_shares(data, "Day_Of_Week")
+
+
+def plot_weekday_shares(shares, ax):
+    sns.barplot(x=shares.index, y=shares.values, palette="viridis", ax=ax)
+    ax.set_title("Percentage of Flights by Day of the Week")
+    ax.set_xlabel("Day of the Week")
+    ax.set_ylabel("Percentage of Flights")
+    ax.set_xticks(range(len(shares)))
+    ax.set_xticklabels([WEEKDAY_NAMES[day - 1] for day in shares.index])
+    plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
+    # Percentages at the bottom of each bar, in white
+    for i, value in enumerate(shares.values):
+        ax.text(i, 10, f"{value:.2f}%", ha="center", va="baseline", color="white")
+    ax.set_ylim(0, 20)
+
+
+def manufacturer_shares(data):
+    return _flight_shares(data, "Manufacturer")
+
+
+def plot_manufacturer_shares(shares, ax):
+    sns.barplot(x=shares.values, y=shares.index, palette="viridis", ax=ax)
+    ax.set_title("Percentage of Flights by Manufacturer")
+    ax.set_xlabel("Percentage of Flights")
+    for i, value in enumerate(shares.values):
+        ax.text(5, i, f"{value:.2f}%", ha="left", va="center", color="white")
+
+
+def plot_late_arrivals(data, ax):
+    histplot(data, "Arr_Delay", bins=300, ax=ax)
+    ax.set_title("Distribution of Arrival Delays")
+    ax.set_xlabel("Arrival Delay (minutes)")
+    ax.set_ylabel("Frequency")
+
+
+def monthly_late_delays(data):
+    """Mean arrival and departure delays per month, and the overall mean arrival delay."""
+    monthly = data.groupby(derived(data, "Month"))[["Arr_Delay", "Dep_Delay"]].mean()
+    return monthly, data["Arr_Delay"].mean()
+
+
+def plot_monthly_late_delays(prepared, ax):
+    monthly, global_mean_arrival = prepared
+    months = monthly.index.to_numpy()
+    ax.bar(months, monthly["Arr_Delay"], width=0.4, label="Arrival Delay")
+    ax.bar(months + 0.4, monthly["Dep_Delay"], width=0.4, label="Departure Delay")
+    ax.axhline(y=global_mean_arrival, color="r", linestyle="--", label="Overall Mean")
+    ax.set_title("Average Delays by Month")
+    ax.set_xlabel("Month")
+    ax.set_ylabel("Average Delay (minutes)")
+    ax.set_xticks(months + 0.2)
+    ax.set_xticklabels([calendar.month_name[month] for month in months])
+    ax.legend()
+
+
+def plot_manufacturer_late_delays(data, ax):
+    sns.barplot(data=data, y="Manufacturer", x="Arr_Delay", ax=ax)
+    ax.set_title("Average Arrival Delays by Manufacturer")
+    ax.set_xlabel("Average Arrival Delay (minutes)")
+    ax.set_ylabel("Manufacturer")
+
+
+def busiest_airports(data, top: int = 20):
+    """Mean departure delay (rounded) and flight count of the ``top`` busiest airports."""
+    airports = (
+        summaries(data, SUMMARIES)[AIRPORT_KEYS]
+        .rename(columns={"Dep_Delay_mean": "Dep_Delay", "size": "index"})
+        .reset_index()
+    )
+    airports = airports.sort_values(by="index", ascending=False).head(top)
+    airports["Dep_Delay"] = round(airports["Dep_Delay"], 2)
+    return airports
+
+
+def airport_delays(data):
+    """The busiest airports ranked by mean departure delay, with their share."""
+    ranking = (
+        busiest_airports(data)
+        .sort_values(by="Dep_Delay", ascending=False)
+        .reset_index(drop=True)
+    )
+    # Share of each average delay in the total of the average delays
+    ranking["Percentage"] = ranking["Dep_Delay"] / ranking["Dep_Delay"].sum() * 100
+    # Airport code and city together, to tell apart the airports of 'New York'
+    ranking["Dep_Airport_City"] = (
+        ranking["Dep_Airport"].astype(str) + ", " + ranking["Dep_CityName"].astype(str)
+    )
+    return ranking
+
+
+def plot_airport_delays(ranking, ax):
+    sns.barplot(
+        x=ranking["Dep_Delay"], y=ranking["Dep_Airport_City"], palette="viridis", ax=ax
+    )
+    ax.set_title("Average Departure Delays per Airport")
+    ax.set_xlabel("Average Departure Delays (in minutes)")
+    ax.set_ylabel("Departure Airport")
+    ax.axvline(
+        x=ranking["Dep_Delay"].mean(), color="r", linestyle="--", label="Global Mean"
+    )
+    for i, (value, percent, count) in enumerate(
+        zip(ranking["Dep_Delay"], ranking["Percentage"], ranking["index"])
+    ):
+        ax.text(
+            3,
+            i,
+            f"{value} minutes ({percent:.2f}% - {count} flights)",
+            ha="left",
+            va="center",
+            color="white",
+        )
+    ax.legend()
+
+
+def delay_moments(data):
+    """Streaming means and co-moments of Dep_Delay and Arr_Delay, with the frame."""
+    return data, BivariateMoments.from_frame(data, "Dep_Delay", "Arr_Delay")
+
+
+def plot_delay_correlation(prepared, ax):
+    data, moments = prepared
+    # Density image of the flights and the regression line between its end points
+    scatter(data, x="Dep_Delay", y="Arr_Delay", ax=ax)
+    line_x, line_y = moments.line_endpoints()
+    ax.plot(line_x, line_y, color="orange", label="Linear regression line")
+    ax.text(
+        moments.min_x,
+        data["Arr_Delay"].max(),
+        f"Correlation coefficient: {moments.r:.2f}",
+        verticalalignment="top",
+    )
+    ax.set_xlabel("Dep_Delay")
+    ax.set_ylabel("Arr_Delay")
+    ax.set_title("Correlation Analysis between Dep_Delay and Arr_Delay")
+    ax.legend(loc="lower right")
+    ax.grid(True)
+
+
+def dep_delay_correlations(data):
+    return target_correlations(
+        data,
+        "Dep_Delay",
+        numeric=NUMERIC_COLUMNS,
+        categorical=CORRELATED_CATEGORIES,
+    )
+
+
+def plot_dep_delay_correlations(correlations, ax):
+    sns.heatmap(
+        correlations.to_frame(),
+        annot=True,
+        cmap="coolwarm",
+        center=0,
+        fmt=".2f",
+        ax=ax,
+    )
+    ax.set_title('Correlation Heatmap of "Departure Delays"\n')
+
+
+def plot_airline_dep_delays(data, ax):
+    # Density strip per airline: every flight is binned, then drawn as one image
+    category_density(data, x="Dep_Delay", y="Airline", ax=ax)
+    plt.setp(ax.get_xticklabels(), fontsize=10)
+    plt.setp(ax.get_yticklabels(), fontsize=10)
+    # Delays as hours and minutes
+    ticks = ax.get_xticks()
+    ax.set_xticks(ticks)
+    ax.set_xticklabels(
+        ["{:2.0f}h{:2.0f}m".format(*[int(y) for y in divmod(x, 60)]) for x in ticks]
+    )
+    ax.set_xlabel("\nDeparture Delays", fontsize=12)
+    ax.yaxis.label.set_visible(False)
+
+
+def delay_absorption(airline_delays):
+    """Per-airline mean delays sorted by ``Delay_Absorption`` (Dep_Delay - Arr_Delay).
+
+    ``airline_delays`` has an ``Airline`` column and the mean ``Dep_Delay``
+    and ``Arr_Delay`` of each airline.
+    """
+    airline_delays = airline_delays.assign(
+        Delay_Absorption=airline_delays["Dep_Delay"] - airline_delays["Arr_Delay"]
+    )
+    return airline_delays.sort_values(by="Delay_Absorption", ascending=False)
+
+
+def airline_absorption(data):
+    means = summaries(data, SUMMARIES)["Airline"]
+    return delay_absorption(
+        means[["Dep_Delay_mean", "Arr_Delay_mean"]]
+        .rename(columns={"Dep_Delay_mean": "Dep_Delay", "Arr_Delay_mean": "Arr_Delay"})
+        .reset_index()
+    )
+
+
+def plot_delay_absorption(airline_delays, ax):
+    x = airline_delays["Airline"].astype(str)
+    ax.fill_between(
+        x, airline_delays["Dep_Delay"], color="skyblue", alpha=0.4, label="Dep_Delay"
+    )
+    ax.fill_between(
+        x, airline_delays["Arr_Delay"], color="lightcoral", alpha=0.4, label="Arr_Delay"
+    )
+    arrow = dict(arrowstyle="->", lw=1.5, color="black")
+    for text, airline, delay in (
+        ("Inability to recover from delays", "Hawaiian Airlines Inc.", 10),
+        ("Strong ability to recover from delays", "Delta Air Lines Inc", 3),
+    ):
+        if airline in set(x):
+            ax.annotate(
+                text,
+                xy=(airline, delay),
+                xytext=(-50, 50),
+                textcoords="offset points",
+                arrowprops=arrow,
+            )
+    ax.set_xlabel("Airline")
+    ax.set_ylabel("Minutes of Delay")
+    ax.set_title("Departure and Arrival Delays by Airline")
+    ax.legend()
+    ax.grid(True)
+    ax.tick_params(axis="x", rotation=75)
+
+
+NUMERIC_BOXES = FigureJob(
+    "numeric_boxes", plot_numeric_boxes, columns=NUMERIC_COLUMNS, figsize=(15, 8)
+)
+AIRLINE_SHARE = FigureJob(
+    "airline_share", plot_airline_shares, columns=("Airline",), prepare=airline_shares
+)
+WEEKDAY_SHARE = FigureJob(
+    "weekday_share",
+    plot_weekday_shares,
+    columns=("Day_Of_Week",),
+    prepare=weekday_shares,
+)
+MANUFACTURER_SHARE = FigureJob(
+    "manufacturer_share",
+    plot_manufacturer_shares,
+    columns=("Manufacturer",),
+    prepare=manufacturer_shares,
+)
+LATE_ARRIVALS = FigureJob(
+    "late_arrivals", plot_late_arrivals, source="late_flights", columns=("Arr_Delay",)
+)
+MONTHLY_LATE_DELAYS = FigureJob(
+    "monthly_late_delays",
+    plot_monthly_late_delays,
+    source="late_flights",
+    columns=("FlightDate", "Arr_Delay", "Dep_Delay"),
+    prepare=monthly_late_delays,
+    figsize=(12, 6),
+)
+MANUFACTURER_LATE_DELAYS = FigureJob(
+    "manufacturer_late_delays",
+    plot_manufacturer_late_delays,
+    source="late_flights",
+    columns=("Manufacturer", "Arr_Delay"),
+)
+AIRPORT_DELAYS = FigureJob(
+    "airport_delays",
+    plot_airport_delays,
+    columns=AIRPORT_KEYS + ("Dep_Delay",),
+    prepare=airport_delays,
+    figsize=(12, 6),
+)
+DELAY_CORRELATION = FigureJob(
+    "delay_correlation",
+    plot_delay_correlation,
+    columns=("Dep_Delay", "Arr_Delay"),
+    prepare=delay_moments,
+)
+DEP_DELAY_CORRELATIONS = FigureJob(
+    "dep_delay_correlations",
+    plot_dep_delay_correlations,
+    columns=NUMERIC_COLUMNS + tuple(CORRELATED_CATEGORIES),
+    prepare=dep_delay_correlations,
+    figsize=(2, 15),
+)
+AIRLINE_DEP_DELAYS = FigureJob(
+    "airline_dep_delays",
+    plot_airline_dep_delays,
+    columns=("Airline", "Dep_Delay"),
+    figsize=(12, 8),
+)
+DELAY_ABSORPTION = FigureJob(
+    "delay_absorption",
+    plot_delay_absorption,
+    columns=("Airline", "Dep_Delay", "Arr_Delay"),
+    prepare=airline_absorption,
+    figsize=(14, 8),
+)
+
+JOBS = [
+    NUMERIC_BOXES,
+    AIRLINE_SHARE,
+    WEEKDAY_SHARE,
+    MANUFACTURER_SHARE,
+    LATE_ARRIVALS,
+    MONTHLY_LATE_DELAYS,
+    MANUFACTURER_LATE_DELAYS,
+    AIRPORT_DELAYS,
+    DELAY_CORRELATION,
+    DEP_DELAY_CORRELATIONS,
+    AIRLINE_DEP_DELAYS,
+    DELAY_ABSORPTION,
+]
@@ -0,0 +1,489 @@
+"""Figures of ``Untitled-1.py``: univariate, bivariate and multivariate views.
+
+Sources: ``flights`` (deduplicated, with weekday names in ``Day_Of_Week`` and
+the departure weather and airport coordinates attached), ``weather`` and
+``cancelled_diverted``. Every job is drawn in the seaborn ``darkgrid`` style,
+applied per figure so that importing the module leaves the global style alone.
+
+>>> draw(AIRLINE_COUNTS, flights_df)
+>>> run_report(
+...     JOBS,
+...     {
+...         "flights": flights_df,
+...         "weather": weather_df,
+...         "cancelled_diverted": cancelled_diverted_df,
+...     },
+...     "figures",
+... )
+"""
+
+from __future__ import annotations
+
+from functools import partial
+
+import seaborn as sns
+
+from ..boxes import boxplot
+from ..delays import DELAY_CAUSE_COLUMNS
+from ..distributions import histplot
+from ..render import scatter
+from ..report import FigureJob
+from ..violins import violinplot
+
+TOP_CITIES = 20
+
+_job = partial(FigureJob, style=sns.axes_style("darkgrid"))
+
+
+def _labels(ax, title, xlabel, ylabel):
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+
+
+# Univariate analysis
+
+
+def plot_dep_delay_distribution(data, ax):
+    histplot(data, "Dep_Delay", ax=ax)
+    _labels(
+        ax, "Distribution of Departure Delays", "Departure Delay (minutes)", "Frequency"
+    )
+
+
+def plot_airline_counts(data, ax):
+    sns.countplot(
+        y="Airline", data=data, order=data["Airline"].value_counts().index, ax=ax
+    )
+    _labels(ax, "Frequency of Different Airlines", "Count", "Airline")
+
+
+def plot_duration_distribution(data, ax):
+    histplot(data, "Flight_Duration", ax=ax)
+    _labels(
+        ax, "Distribution of Flight Durations", "Flight Duration (minutes)", "Frequency"
+    )
+
+
+def plot_age_distribution(data, ax):
+    histplot(data, "Aicraft_age", ax=ax)
+    _labels(ax, "Age Distribution of Aircraft", "Aircraft Age (years)", "Frequency")
+
+
+def plot_dep_delay_types(data, ax):
+    sns.countplot(x="Dep_Delay_Type", data=data, ax=ax)
+    _labels(
+        ax, "Distribution of Departure Delay Types", "Departure Delay Type", "Count"
+    )
+
+
+def top_departure_cities(data):
+    """Flights leaving from the ``TOP_CITIES`` busiest departure cities."""
+    top = data["Dep_CityName"].value_counts().nlargest(TOP_CITIES).index
+    return data[data["Dep_CityName"].isin(top)]
+
+
+def plot_top_departure_cities(data, ax):
+    order = data["Dep_CityName"].value_counts().nlargest(TOP_CITIES).index
+    sns.countplot(y="Dep_CityName", data=data, order=order, ax=ax)
+    _labels(ax, "Top 20 Departure Cities", "Count", "Departure City")
+
+
+def plot_temperature_distribution(data, ax):
+    histplot(data, "tavg", ax=ax)
+    _labels(
+        ax,
+        "Distribution of Average Temperature",
+        "Average Temperature (°C)",
+        "Frequency",
+    )
+
+
+def plot_snow_distribution(data, ax):
+    histplot(data, "snow", ax=ax)
+    _labels(ax, "Distribution of Snow Depth", "Snow Depth (mm)", "Frequency")
+
+
+def plot_wind_directions(data, ax):
+    histplot(data, "wdir", bins=36, ax=ax)
+    _labels(
+        ax, "Distribution of Wind Directions", "Wind Direction (Degrees)", "Frequency"
+    )
+
+
+def _plot_share(data, column, ax):
+    data[column].value_counts(normalize=True).plot(
+        kind="bar", color=["skyblue", "salmon"], rot=0, ax=ax
+    )
+
+
+def plot_cancelled_share(data, ax):
+    _plot_share(data, "Cancelled", ax)
+    _labels(ax, "Percentage of Canceled Flights", "Cancelled", "Percentage")
+
+
+def plot_diverted_share(data, ax):
+    _plot_share(data, "Diverted", ax)
+    _labels(ax, "Percentage of Diverted Flights", "Diverted", "Percentage")
+
+
+def plot_dep_delay_tags(data, ax):
+    sns.countplot(x="Dep_Delay_Tag", data=data, ax=ax)
+    _labels(ax, "Common Departure Delay Tags", "Departure Delay Tag", "Count")
+
+
+# Bivariate analysis
+
+
+def plot_dep_delay_by_weekday(data, ax):
+    boxplot(data, x="Day_Of_Week", y="Dep_Delay", ax=ax)
+    _labels(
+        ax,
+        "Departure Delay by Day of the Week",
+        "Day of the Week",
+        "Departure Delay (minutes)",
+    )
+
+
+def plot_arr_delay_by_airline(data, ax):
+    boxplot(data, x="Airline", y="Arr_Delay", ax=ax)
+    _labels(ax, "Arrival Delay by Airline", "Airline", "Arrival Delay (minutes)")
+    ax.tick_params(axis="x", rotation=90)
+
+
+def plot_dep_delay_vs_duration(data, ax):
+    scatter(data, x="Flight_Duration", y="Dep_Delay", ax=ax)
+    _labels(
+        ax,
+        "Departure Delay vs. Flight Duration",
+        "Flight Duration (minutes)",
+        "Departure Delay (minutes)",
+    )
+
+
+def plot_age_vs_last_aircraft_delay(data, ax):
+    scatter(data, x="Aicraft_age", y="Delay_LastAircraft", ax=ax)
+    _labels(
+        ax,
+        "Aircraft Age vs. Delay Due to Last Aircraft",
+        "Aircraft Age (years)",
+        "Delay Due to Last Aircraft (minutes)",
+    )
+
+
+def plot_carrier_delay_by_manufacturer(data, ax):
+    boxplot(data, x="Manufacturer", y="Delay_Carrier", ax=ax)
+    _labels(
+        ax,
+        "Delay Due to Carrier by Manufacturer",
+        "Manufacturer",
+        "Delay Due to Carrier (minutes)",
+    )
+
+
+def plot_temperature_vs_wind(data, ax):
+    sns.scatterplot(x="wspd", y="tavg", data=data, ax=ax)
+    _labels(
+        ax,
+        "Average Temperature vs. Wind Speed",
+        "Wind Speed (km/h)",
+        "Average Temperature (°C)",
+    )
+
+
+def plot_precipitation_vs_weather_delay(data, ax):
+    scatter(data, x="prcp", y="Delay_Weather", ax=ax)
+    _labels(
+        ax,
+        "Precipitation vs. Weather-Related Delays",
+        "Precipitation (mm)",
+        "Weather-Related Delays (minutes)",
+    )
+
+
+def plot_dep_delay_by_cancelled(data, ax):
+    boxplot(data, x="Cancelled", y="Dep_Delay", ax=ax)
+    _labels(
+        ax, "Cancellation vs. Departure Delay", "Cancelled", "Departure Delay (minutes)"
+    )
+
+
+def plot_arr_delay_by_diverted(data, ax):
+    boxplot(data, x="Diverted", y="Arr_Delay", ax=ax)
+    _labels(ax, "Diverted vs. Arrival Delay", "Diverted", "Arrival Delay (minutes)")
+
+
+def cancelled_by_weekday(data):
+    """Share of each day of the week among the cancelled flights."""
+    return data[data["Cancelled"] == 1]["Day_Of_Week"].value_counts(normalize=True)
+
+
+def plot_cancelled_by_weekday(shares, ax):
+    shares.plot(kind="bar", color="skyblue", ax=ax)
+    _labels(
+        ax,
+        "Percentage of Canceled Flights by Day of the Week",
+        "Day of the Week",
+        "Percentage of Canceled Flights",
+    )
+
+
+# Multivariate analysis
+
+
+def plot_arr_delay_violins(data, ax):
+    # One binned KDE per (day, airline) cell, all smoothed in a single FFT pass
+    violinplot(
+        data,
+        x="Day_Of_Week",
+        y="Arr_Delay",
+        hue="Airline",
+        split=True,
+        top=None,
+        ax=ax,
+    )
+    _labels(
+        ax,
+        "Arrival Delay by Day of the Week and Airline",
+        "Day of the Week",
+        "Arrival Delay (minutes)",
+    )
+    ax.legend(title="Airline", bbox_to_anchor=(1.05, 1), loc="upper left")
+
+
+def total_delay(data):
+    """The plotted columns plus ``Total_Delay``, the sum of the delay causes."""
+    return data[["Aicraft_age", "Delay_Weather", "Flight_Duration"]].assign(
+        Total_Delay=data[DELAY_CAUSE_COLUMNS].sum(axis=1)
+    )
+
+
+def plot_total_delay(data, ax):
+    scatter(
+        data,
+        x="Aicraft_age",
+        y="Delay_Weather",
+        size="Flight_Duration",
+        hue="Total_Delay",
+        palette="coolwarm",
+        ax=ax,
+    )
+    _labels(
+        ax,
+        "Aircraft Age, Flight Duration, and Weather Delay on Total Delay",
+        "Aircraft Age (years)",
+        "Weather Delay (minutes)",
+    )
+
+
+def plot_airport_violins(data, ax):
+    # The 10 busiest departure airports, the others are gathered as "Other"
+    violinplot(
+        data,
+        x="Dep_Delay_Type",
+        y="Arr_Delay",
+        hue="Dep_Airport",
+        split=True,
+        top=10,
+        ax=ax,
+    )
+    _labels(
+        ax,
+        "Arrival Delay by Departure Delay Type and Departure Airport",
+        "Departure Delay Type",
+        "Arrival Delay (minutes)",
+    )
+    ax.legend(title="Departure Airport", bbox_to_anchor=(1.05, 1), loc="upper left")
+
+
+def plot_weather_delays(data, ax):
+    scatter(
+        data,
+        x="tavg",
+        y="Delay_Weather",
+        hue="prcp",
+        size="wspd",
+        palette="viridis",
+        ax=ax,
+    )
+    _labels(
+        ax,
+        "Temperature, Wind Speed, Precipitation, and Weather Delays at Different Airports",
+        "Average Temperature (°C)",
+        "Weather-Related Delay (minutes)",
+    )
+
+
+def plot_nas_delays(data, ax):
+    scatter(
+        data,
+        x="Flight_Duration",
+        y="Arr_Delay",
+        hue="Delay_NAS",
+        size="Day_Of_Week",
+        palette="plasma",
+        ax=ax,
+    )
+    _labels(
+        ax,
+        "Flight Duration, Day of the Week, and NAS Delay on Overall Flight Delay",
+        "Flight Duration (minutes)",
+        "Arrival Delay (minutes)",
+    )
+
+
+DEP_DELAY = _job("dep_delay", plot_dep_delay_distribution, columns=("Dep_Delay",))
+AIRLINE_COUNTS = _job("airline_counts", plot_airline_counts, columns=("Airline",))
+FLIGHT_DURATION = _job(
+    "flight_duration", plot_duration_distribution, columns=("Flight_Duration",)
+)
+AIRCRAFT_AGE = _job("aircraft_age", plot_age_distribution, columns=("Aicraft_age",))
+DEP_DELAY_TYPES = _job(
+    "dep_delay_types", plot_dep_delay_types, columns=("Dep_Delay_Type",)
+)
+TOP_DEPARTURE_CITIES = _job(
+    "top_departure_cities",
+    plot_top_departure_cities,
+    columns=("Dep_CityName",),
+    prepare=top_departure_cities,
+)
+TEMPERATURE = _job(
+    "temperature", plot_temperature_distribution, source="weather", columns=("tavg",)
+)
+SNOW = _job("snow", plot_snow_distribution, source="weather", columns=("snow",))
+WIND_DIRECTIONS = _job(
+    "wind_directions", plot_wind_directions, source="weather", columns=("wdir",)
+)
+CANCELLED_SHARE = _job(
+    "cancelled_share",
+    plot_cancelled_share,
+    source="cancelled_diverted",
+    columns=("Cancelled",),
+)
+DIVERTED_SHARE = _job(
+    "diverted_share",
+    plot_diverted_share,
+    source="cancelled_diverted",
+    columns=("Diverted",),
+)
+DEP_DELAY_TAGS = _job(
+    "dep_delay_tags",
+    plot_dep_delay_tags,
+    source="cancelled_diverted",
+    columns=("Dep_Delay_Tag",),
+)
+DEP_DELAY_BY_WEEKDAY = _job(
+    "dep_delay_by_weekday",
+    plot_dep_delay_by_weekday,
+    columns=("Day_Of_Week", "Dep_Delay"),
+)
+ARR_DELAY_BY_AIRLINE = _job(
+    "arr_delay_by_airline", plot_arr_delay_by_airline, columns=("Airline", "Arr_Delay")
+)
+DEP_DELAY_VS_DURATION = _job(
+    "dep_delay_vs_duration",
+    plot_dep_delay_vs_duration,
+    columns=("Flight_Duration", "Dep_Delay"),
+)
+AGE_VS_LAST_AIRCRAFT_DELAY = _job(
+    "age_vs_last_aircraft_delay",
+    plot_age_vs_last_aircraft_delay,
+    columns=("Aicraft_age", "Delay_LastAircraft"),
+)
+CARRIER_DELAY_BY_MANUFACTURER = _job(
+    "carrier_delay_by_manufacturer",
+    plot_carrier_delay_by_manufacturer,
+    columns=("Manufacturer", "Delay_Carrier"),
+)
+TEMPERATURE_VS_WIND = _job(
+    "temperature_vs_wind",
+    plot_temperature_vs_wind,
+    source="weather",
+    columns=("wspd", "tavg"),
+)
+PRECIPITATION_VS_WEATHER_DELAY = _job(
+    "precipitation_vs_weather_delay",
+    plot_precipitation_vs_weather_delay,
+    columns=("prcp", "Delay_Weather"),
+)
+DEP_DELAY_BY_CANCELLED = _job(
+    "dep_delay_by_cancelled",
+    plot_dep_delay_by_cancelled,
+    source="cancelled_diverted",
+    columns=("Cancelled", "Dep_Delay"),
+)
+ARR_DELAY_BY_DIVERTED = _job(
+    "arr_delay_by_diverted",
+    plot_arr_delay_by_diverted,
+    source="cancelled_diverted",
+    columns=("Diverted", "Arr_Delay"),
+)
+CANCELLED_BY_WEEKDAY = _job(
+    "cancelled_by_weekday",
+    plot_cancelled_by_weekday,
+    source="cancelled_diverted",
+    columns=("Cancelled", "Day_Of_Week"),
+    prepare=cancelled_by_weekday,
+)
+ARR_DELAY_VIOLINS = _job(
+    "arr_delay_violins",
+    plot_arr_delay_violins,
+    columns=("Day_Of_Week", "Arr_Delay", "Airline"),
+    figsize=(12, 8),
+)
+TOTAL_DELAY = _job(
+    "total_delay",
+    plot_total_delay,
+    # Delay_Weather is one of the delay causes
+    columns=("Aicraft_age", "Flight_Duration") + tuple(DELAY_CAUSE_COLUMNS),
+    prepare=total_delay,
+    figsize=(12, 8),
+)
+AIRPORT_VIOLINS = _job(
+    "airport_violins",
+    plot_airport_violins,
+    columns=("Dep_Delay_Type", "Arr_Delay", "Dep_Airport"),
+    figsize=(12, 8),
+)
+WEATHER_DELAYS = _job(
+    "weather_delays",
+    plot_weather_delays,
+    columns=("tavg", "Delay_Weather", "prcp", "wspd"),
+    figsize=(12, 8),
+)
+NAS_DELAYS = _job(
+    "nas_delays",
+    plot_nas_delays,
+    columns=("Flight_Duration", "Arr_Delay", "Delay_NAS", "Day_Of_Week"),
+    figsize=(12, 8),
+)
+
+JOBS = [
+    DEP_DELAY,
+    AIRLINE_COUNTS,
+    FLIGHT_DURATION,
+    AIRCRAFT_AGE,
+    DEP_DELAY_TYPES,
+    TOP_DEPARTURE_CITIES,
+    TEMPERATURE,
+    SNOW,
+    WIND_DIRECTIONS,
+    CANCELLED_SHARE,
+    DIVERTED_SHARE,
+    DEP_DELAY_TAGS,
+    DEP_DELAY_BY_WEEKDAY,
+    ARR_DELAY_BY_AIRLINE,
+    DEP_DELAY_VS_DURATION,
+    AGE_VS_LAST_AIRCRAFT_DELAY,
+    CARRIER_DELAY_BY_MANUFACTURER,
+    TEMPERATURE_VS_WIND,
+    PRECIPITATION_VS_WEATHER_DELAY,
+    DEP_DELAY_BY_CANCELLED,
+    ARR_DELAY_BY_DIVERTED,
+    CANCELLED_BY_WEEKDAY,
+    ARR_DELAY_VIOLINS,
+    TOTAL_DELAY,
+    AIRPORT_VIOLINS,
+    WEATHER_DELAYS,
+    NAS_DELAYS,
+]
@@ -0,0 +1,226 @@
+"""Append-only partial aggregates per (key, month).
+
+Folding a new month of flights only touches the new rows: count, sum, sum of
+squares, min and max are added to the stored partials and the per-group
+t-digests are merged. Means, standard deviations, medians and flight shares
+are derived from the merged partials on demand.
+
+>>> store = IncrementalAggregates("reports/airline_partials", keys=("Airline",))
+>>> store.fold(load_cached("flights"), source="US_flights_2023.csv")
+>>> store.fold(new_month_df, source="US_flights_2024_01.csv")
+>>> store.summary()
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .aggregate import AggSpec, group_codes, multi_aggregate
+from .sketches import DEFAULT_COMPRESSION, TDigest, digests_by_group
+
+MONTH_COLUMN = "YearMonth"
+PARTIAL_STATS = ("count", "sum", "sumsq", "min", "max")
+
+
+def year_month(dates: pd.Series) -> pd.Series:
+    """``YYYYMM`` integer month key of a datetime column."""
+    return (dates.dt.year * 100 + dates.dt.month).astype(np.int32)
+
+
+class IncrementalAggregates:
+    """Persisted partial aggregates of ``columns`` per ``keys`` and month."""
+
+    def __init__(
+        self,
+        store_dir,
+        keys: Sequence[str] = ("Airline",),
+        columns: Sequence[str] = ("Dep_Delay", "Arr_Delay"),
+        date_column: str = "FlightDate",
+        compression: float = DEFAULT_COMPRESSION,
+    ):
+        self.store_dir = Path(store_dir)
+        self.keys = list(keys)
+        self.columns = list(columns)
+        self.date_column = date_column
+        self.compression = compression
+
+        self.partials = pd.DataFrame(
+            columns=self.keys + [MONTH_COLUMN, "column", *PARTIAL_STATS]
+        )
+        self.digests: Dict[Tuple, TDigest] = {}
+        self.sources: list = []
+        if (self.store_dir / "partials.feather").exists():
+            self.load()
+
+    # -- persistence -------------------------------------------------------
+
+    def load(self):
+        self.partials = pd.read_feather(self.store_dir / "partials.feather")
+        centroids = pd.read_feather(self.store_dir / "centroids.feather")
+        group_columns = self.keys + [MONTH_COLUMN, "column"]
+        bounds = self.partials.set_index(group_columns)[["min", "max"]]
+        self.digests = {}
+        for group, part in centroids.groupby(group_columns, sort=False):
+            low, high = bounds.loc[group]
+            self.digests[group] = TDigest.from_centroids(
+                part["mean"], part["weight"], low, high, self.compression
+            )
+        self.sources = json.loads((self.store_dir / "sources.json").read_text())
+
+    def save(self):
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.partials.reset_index(drop=True).to_feather(
+            self.store_dir / "partials.feather"
+        )
+        rows = []
+        for group, digest in self.digests.items():
+            rows.append(
+                pd.DataFrame(
+                    {
+                        **dict(zip(self.keys + [MONTH_COLUMN, "column"], group)),
+                        "mean": digest.means,
+                        "weight": digest.weights,
+                    }
+                )
+            )
+        centroids = pd.concat(rows, ignore_index=True) if rows else pd.DataFrame()
+        centroids.to_feather(self.store_dir / "centroids.feather")
+        (self.store_dir / "sources.json").write_text(json.dumps(self.sources))
+
+    # -- folding -----------------------------------------------------------
+
+    def fold(self, df: pd.DataFrame, source: Optional[str] = None) -> bool:
+        """Add the rows of ``df`` to the partials and persist them.
+
+        Returns ``False`` without touching the store when ``source`` has
+        already been folded in.
+        """
+        if source is not None and source in self.sources:
+            return False
+
+        frame = df[self.keys + self.columns].copy()
+        frame[MONTH_COLUMN] = year_month(df[self.date_column])
+        group_keys = tuple(self.keys + [MONTH_COLUMN])
+
+        specs = [
+            AggSpec(group_keys, column, stat, name=stat)
+            for column in self.columns
+            for stat in PARTIAL_STATS
+        ]
+        codes, index, n_groups = group_codes(frame, group_keys)
+        new_parts = []
+        for column in self.columns:
+            column_specs = [spec for spec in specs if spec.column == column]
+            part = multi_aggregate(frame, column_specs)[group_keys].reset_index()
+            part.insert(len(group_keys), "column", column)
+            new_parts.append(part[part["count"] > 0])
+
+            digests = digests_by_group(
+                codes,
+                frame[column].to_numpy(dtype=np.float64),
+                n_groups,
+                self.compression,
+            )
+            for group, digest in zip(index, digests):
+                if digest is None:
+                    continue
+                group = (group if isinstance(group, tuple) else (group,)) + (column,)
+                if group in self.digests:
+                    self.digests[group].merge(digest)
+                else:
+                    self.digests[group] = digest
+
+        self.partials = self._merge_partials(pd.concat(new_parts, ignore_index=True))
+        if source is not None:
+            self.sources.append(source)
+        self.save()
+        return True
+
+    def _merge_partials(self, new: pd.DataFrame) -> pd.DataFrame:
+        if len(self.partials):
+            combined = pd.concat([self.partials, new], ignore_index=True)
+        else:
+            combined = new.copy()
+        combined[list(PARTIAL_STATS)] = combined[list(PARTIAL_STATS)].astype(np.float64)
+        return (
+            combined.groupby(self.keys + [MONTH_COLUMN, "column"], sort=True)
+            .agg(
+                count=("count", "sum"),
+                sum=("sum", "sum"),
+                sumsq=("sumsq", "sum"),
+                min=("min", "min"),
+                max=("max", "max"),
+            )
+            .reset_index()
+        )
+
+    # -- results -----------------------------------------------------------
+
+    def summary(
+        self,
+        by: Optional[Sequence[str]] = None,
+        months: Optional[Sequence[int]] = None,
+        quantiles: Sequence[float] = (0.5,),
+    ) -> pd.DataFrame:
+        """Merge the partials into final statistics.
+
+        ``by`` defaults to the store keys; pass ``[MONTH_COLUMN]`` for monthly
+        figures or ``[]`` for a grand total. ``months`` restricts the merge to
+        some ``YYYYMM`` months. Each column gets ``count``, ``mean``, ``std``,
+        ``min``, ``max`` and the requested quantiles, plus ``share`` (percent of
+        all counted rows).
+        """
+        by = self.keys if by is None else list(by)
+        partials = self.partials
+        if months is not None:
+            partials = partials[partials[MONTH_COLUMN].isin(list(months))]
+
+        frames = {}
+        for column, part in partials.groupby("column", sort=False):
+            if by:
+                grouped = part.groupby(by)
+            else:
+                grouped = part.assign(total="all").groupby("total")
+            merged = grouped.agg(
+                count=("count", "sum"),
+                sum=("sum", "sum"),
+                sumsq=("sumsq", "sum"),
+                min=("min", "min"),
+                max=("max", "max"),
+            )
+            n = merged["count"]
+            result = pd.DataFrame(index=merged.index)
+            result["count"] = n.astype(np.int64)
+            result["mean"] = merged["sum"] / n
+            result["std"] = np.sqrt(
+                (merged["sumsq"] - merged["sum"] ** 2 / n).clip(lower=0) / (n - 1)
+            )
+            result["min"] = merged["min"]
+            result["max"] = merged["max"]
+            result["share"] = n / n.sum() * 100
+
+            if quantiles:
+                merged_digests = {}
+                for row in part.itertuples(index=False):
+                    values = [getattr(row, name) for name in by]
+                    if not by:
+                        label = "all"
+                    else:
+                        label = values[0] if len(by) == 1 else tuple(values)
+                    digest_key = tuple(
+                        getattr(row, name) for name in self.keys + [MONTH_COLUMN]
+                    ) + (column,)
+                    merged_digests.setdefault(label, TDigest(self.compression)).merge(
+                        self.digests[digest_key]
+                    )
+                for q in quantiles:
+                    result[f"q{q:g}"] = [
+                        merged_digests[group].quantile(q) for group in result.index
+                    ]
+            frames[column] = result
+        return pd.concat(frames, axis=1)
@@ -0,0 +1,148 @@
+"""Attach weather and airport columns to flights by array gather.
+
+Airport codes are encoded as integer positions and dates as day numbers.
+The weather is laid out as a dense ``(airport x day)`` table per column, so
+the weather of each flight is one fancy-indexing gather at
+``airport * n_days + day``, without the hash join and intermediate copies of
+``pd.merge``. Airport coordinates are gathered the same way through the
+airport position. Only the new columns are allocated.
+
+>>> attach_weather(flights_df, weather_df, columns=["tavg", "prcp", "wspd"])
+>>> attach_airports(flights_df, airports_df)
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .aggregate import key_codes
+
+WEATHER_COLUMNS = ("tavg", "tmin", "tmax", "prcp", "snow", "wdir", "wspd", "pres")
+AIRPORT_COLUMNS = ("LATITUDE", "LONGITUDE")
+
+
+def encode_keys(values: pd.Series, keys: pd.Index) -> np.ndarray:
+    """Position of each value in ``keys``, ``-1`` when missing or unknown.
+
+    The lookup runs on the distinct values only and is gathered back by code.
+    """
+    codes, uniques = key_codes(values)
+    positions = keys.get_indexer(uniques)
+    return np.where(codes >= 0, positions[codes], -1)
+
+
+def day_numbers(dates: pd.Series) -> np.ndarray:
+    """Days since the epoch as ``int64``; ``NaT`` becomes ``-1 << 62``."""
+    days = dates.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    numbers = days.astype(np.int64)
+    numbers[np.isnat(days)] = -1 << 62
+    return numbers
+
+
+class AirportDayTable:
+    """Dense ``(airport x day)`` lookup of per-airport daily values.
+
+    ``airports`` holds the airport codes in table order and ``first_day`` the
+    day number of the first column. Missing (airport, day) cells are NaN;
+    when a pair appears twice the last row wins.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        columns: Sequence[str] = WEATHER_COLUMNS,
+        airport: str = "airport_id",
+        date: str = "time",
+        dtype=np.float32,
+    ):
+        codes, self.airports = key_codes(df[airport])
+        days = day_numbers(df[date])
+        valid = (codes >= 0) & (days > -1 << 62)
+        self.first_day = int(days[valid].min()) if valid.any() else 0
+        self.n_days = int(days[valid].max()) - self.first_day + 1 if valid.any() else 0
+
+        cells = codes[valid] * self.n_days + (days[valid] - self.first_day)
+        self.columns: Dict[str, np.ndarray] = {}
+        for column in columns:
+            table = np.full(len(self.airports) * self.n_days, np.nan, dtype=dtype)
+            table[cells] = df[column].to_numpy(dtype=dtype, na_value=np.nan)[valid]
+            self.columns[column] = table
+
+    def __repr__(self):
+        return (
+            f"AirportDayTable(airports={len(self.airports)}, days={self.n_days}, "
+            f"columns={list(self.columns)})"
+        )
+
+    def cells(self, airports: pd.Series, dates: pd.Series) -> np.ndarray:
+        """Flat table position of each (airport, date) pair, ``-1`` if absent."""
+        airport = encode_keys(airports, self.airports)
+        day = day_numbers(dates) - self.first_day
+        inside = (airport >= 0) & (day >= 0) & (day < self.n_days)
+        return np.where(inside, airport * self.n_days + day, -1)
+
+    def gather(
+        self, airports: pd.Series, dates: pd.Series, columns=None
+    ) -> Dict[str, np.ndarray]:
+        """Values of ``columns`` (default: all) for each (airport, date) pair."""
+        cells = self.cells(airports, dates)
+        missing = cells < 0
+        result = {}
+        for column in columns or self.columns:
+            values = self.columns[column][cells]
+            values[missing] = np.nan
+            result[column] = values
+        return result
+
+
+def attach_weather(
+    flights: pd.DataFrame,
+    weather: pd.DataFrame,
+    columns: Sequence[str] = WEATHER_COLUMNS,
+    airport: str = "Dep_Airport",
+    date: str = "FlightDate",
+    prefix: str = "",
+    table: Optional[AirportDayTable] = None,
+) -> pd.DataFrame:
+    """Add the weather at ``airport`` on ``date`` to ``flights`` in place.
+
+    Equivalent to a left merge on ``(airport, date)`` with
+    ``(airport_id, time)``. Pass a prebuilt ``table`` to attach the same
+    weather to several frames or airport columns (e.g. ``Arr_Airport`` with
+    ``prefix="Arr_"``). Returns ``flights``.
+    """
+    table = table or AirportDayTable(weather, columns)
+    gathered = table.gather(flights[airport], flights[date], columns)
+    for column, values in gathered.items():
+        flights[prefix + column] = values
+    return flights
+
+
+def attach_airports(
+    flights: pd.DataFrame,
+    airports: pd.DataFrame,
+    columns: Sequence[str] = AIRPORT_COLUMNS,
+    airport: str = "Dep_Airport",
+    key: str = "IATA_CODE",
+    prefix: str = "",
+    dtype=np.float32,
+) -> pd.DataFrame:
+    """Add the ``airports`` columns (coordinates by default) of each flight's airport.
+
+    Equivalent to a left merge on ``airport`` with ``key``. Returns ``flights``.
+    """
+    codes, keys = key_codes(airports[key])
+    position = encode_keys(flights[airport], keys)
+    # Row of the airports table holding each key
+    rows = np.empty(len(keys), dtype=np.int64)
+    rows[codes[codes >= 0]] = np.flatnonzero(codes >= 0)
+    missing = position < 0
+    for column in columns:
+        values = airports[column].to_numpy(dtype=dtype, na_value=np.nan)
+        gathered = values[rows[position]]
+        gathered[missing] = np.nan
+        flights[prefix + column] = gathered
+    return flights
@@ -0,0 +1,242 @@
+"""Typed, chunked loaders for the US 2023 civil flights datasets.
+
+The raw CSVs are parsed chunk by chunk with their dtype schema applied while
+parsing, so the text columns never exist as a full-size ``object`` frame.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Same folder the scripts reach with "../data/US 2023 Civil Flights  delays meteo and aircrafts"
+DATA_DIR = (
+    Path(__file__).resolve().parent.parent
+    / "data"
+    / "US 2023 Civil Flights  delays meteo and aircrafts"
+)
+
+DEFAULT_CHUNKSIZE = 500_000
+
+
+@dataclass(frozen=True)
+class DatasetSchema:
+    """dtypes applied while parsing one of the CSV files.
+
+    ``dtypes`` is handed to ``pd.read_csv``; ``categorical`` columns that are
+    not parsed as ``"category"`` directly (numeric flags such as ``Cancelled``)
+    are converted chunk by chunk; ``dates`` are parsed with ``date_format``.
+    """
+
+    file_name: str
+    dtypes: dict = field(default_factory=dict)
+    categorical: tuple = ()
+    dates: tuple = ()
+    date_format: str = "%Y-%m-%d"
+
+
+# Hand-maintained categorical_columns lists from the analysis scripts,
+# plus the integer delay columns downcast to the smallest width that fits
+FLIGHTS_SCHEMA = DatasetSchema(
+    file_name="US_flights_2023.csv",
+    dtypes={
+        "Day_Of_Week": "int8",
+        "Airline": "category",
+        "Tail_Number": "category",
+        "Dep_Airport": "category",
+        "Dep_CityName": "category",
+        "DepTime_label": "category",
+        "Dep_Delay": "int16",
+        "Dep_Delay_Tag": "int8",
+        "Dep_Delay_Type": "category",
+        "Arr_Airport": "category",
+        "Arr_CityName": "category",
+        "Arr_Delay": "int16",
+        "Arr_Delay_Type": "category",
+        "Flight_Duration": "int16",
+        "Distance_type": "category",
+        "Delay_Carrier": "int16",
+        "Delay_Weather": "int16",
+        "Delay_NAS": "int16",
+        "Delay_Security": "int16",
+        "Delay_LastAircraft": "int16",
+        "Manufacturer": "category",
+        "Model": "category",
+        "Aicraft_age": "int8",
+    },
+    dates=("FlightDate",),
+)
+
+CANCELLED_DIVERTED_SCHEMA = DatasetSchema(
+    file_name="Cancelled_Diverted_2023.csv",
+    dtypes={
+        "Day_Of_Week": "int8",
+        "Airline": "category",
+        "Tail_Number": "category",
+        "Cancelled": "float32",
+        "Diverted": "float32",
+        "Dep_Airport": "category",
+        "Dep_CityName": "category",
+        "DepTime_label": "category",
+        "Dep_Delay": "float32",
+        "Dep_Delay_Tag": "int8",
+        "Dep_Delay_Type": "category",
+        "Arr_Airport": "category",
+        "Arr_CityName": "category",
+        "Arr_Delay": "float32",
+        "Arr_Delay_Type": "category",
+        "Flight_Duration": "float32",
+        "Distance_type": "category",
+        "Delay_Carrier": "float32",
+        "Delay_Weather": "float32",
+        "Delay_NAS": "float32",
+        "Delay_Security": "float32",
+        "Delay_LastAircraft": "float32",
+    },
+    categorical=("Cancelled", "Diverted", "Dep_Delay_Tag"),
+    dates=("FlightDate",),
+)
+
+WEATHER_SCHEMA = DatasetSchema(
+    file_name="weather_meteo_by_airport.csv",
+    dtypes={
+        "tavg": "float32",
+        "tmin": "float32",
+        "tmax": "float32",
+        "prcp": "float32",
+        "snow": "float32",
+        "wdir": "float32",
+        "wspd": "float32",
+        "pres": "float32",
+        "airport_id": "category",
+    },
+    dates=("time",),
+)
+
+AIRPORTS_SCHEMA = DatasetSchema(
+    file_name="airports_geolocation.csv",
+    dtypes={
+        "AIRPORT": "category",
+        "CITY": "category",
+        "STATE": "category",
+        "COUNTRY": "category",
+        "LATITUDE": "float64",
+        "LONGITUDE": "float64",
+    },
+)
+
+DATASETS = {
+    "flights": FLIGHTS_SCHEMA,
+    "cancelled_diverted": CANCELLED_DIVERTED_SCHEMA,
+    "weather": WEATHER_SCHEMA,
+    "airports": AIRPORTS_SCHEMA,
+}
+
+
+def iter_typed_chunks(
+    path,
+    schema: DatasetSchema,
+    columns: Optional[Sequence[str]] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[pd.DataFrame]:
+    """Yield the CSV in typed chunks, optionally reading only ``columns``."""
+    usecols = list(columns) if columns is not None else None
+    wanted = set(usecols) if usecols is not None else None
+
+    def keep(column):
+        return wanted is None or column in wanted
+
+    dtypes = {c: t for c, t in schema.dtypes.items() if keep(c)}
+    dates = [c for c in schema.dates if keep(c)]
+
+    reader = pd.read_csv(
+        path,
+        usecols=usecols,
+        dtype=dtypes,
+        parse_dates=dates or False,
+        date_format=schema.date_format if dates else None,
+        chunksize=chunksize,
+    )
+    with reader:
+        for chunk in reader:
+            for column in schema.categorical:
+                if column in chunk and not isinstance(
+                    chunk[column].dtype, pd.CategoricalDtype
+                ):
+                    chunk[column] = chunk[column].astype("category")
+            yield chunk
+
+
+def concat_chunks(chunks: list) -> pd.DataFrame:
+    """Concatenate typed chunks column by column, releasing chunk memory as we go.
+
+    Categorical columns are merged with ``union_categoricals`` so they stay
+    categorical even when chunks saw different category sets.
+    """
+    if not chunks:
+        return pd.DataFrame()
+    if len(chunks) == 1:
+        return chunks[0].reset_index(drop=True)
+
+    column_names = list(chunks[0].columns)
+    combined = {}
+    for column in column_names:
+        parts = [chunk.pop(column) for chunk in chunks]
+        if isinstance(parts[0].dtype, pd.CategoricalDtype):
+            combined[column] = pd.Series(
+                union_categoricals(parts, sort_categories=True), name=column
+            )
+        else:
+            combined[column] = pd.Series(
+                np.concatenate([part.to_numpy() for part in parts]), name=column
+            )
+        del parts
+    return pd.DataFrame(combined, columns=column_names)
+
+
+def read_typed_csv(
+    path,
+    schema: DatasetSchema,
+    columns: Optional[Sequence[str]] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> pd.DataFrame:
+    """Read a whole CSV with its schema applied while parsing."""
+    return concat_chunks(list(iter_typed_chunks(path, schema, columns, chunksize)))
+
+
+def dataset_path(name: str, data_dir=None) -> Path:
+    """Location of one of the ``DATASETS`` CSV files."""
+    return Path(data_dir or DATA_DIR) / DATASETS[name].file_name
+
+
+def load_dataset(
+    name: str,
+    data_dir=None,
+    columns: Optional[Sequence[str]] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> pd.DataFrame:
+    """Load one of ``"flights"``, ``"cancelled_diverted"``, ``"weather"`` or ``"airports"``."""
+    return read_typed_csv(
+        dataset_path(name, data_dir), DATASETS[name], columns, chunksize
+    )
+
+
+def load_flights(data_dir=None, columns=None, chunksize=DEFAULT_CHUNKSIZE):
+    return load_dataset("flights", data_dir, columns, chunksize)
+
+
+def load_cancelled_diverted(data_dir=None, columns=None, chunksize=DEFAULT_CHUNKSIZE):
+    return load_dataset("cancelled_diverted", data_dir, columns, chunksize)
+
+
+def load_weather(data_dir=None, columns=None, chunksize=DEFAULT_CHUNKSIZE):
+    return load_dataset("weather", data_dir, columns, chunksize)
+
+
+def load_airports(data_dir=None, columns=None, chunksize=DEFAULT_CHUNKSIZE):
+    return load_dataset("airports", data_dir, columns, chunksize)
@@ -0,0 +1,123 @@
+"""Folium layers built from column arrays.
+
+Instead of one ``folium.Circle`` per row, all points of a layer go into a
+single GeoJSON ``FeatureCollection``: one ``GeoJson`` object, one JSON
+serialisation, and a style computed from each feature's properties
+(radius from the value, optional colour from a colormap).
+
+>>> m = folium.Map(location=[37, -95], zoom_start=5)
+>>> point_layer(
+...     Airports_delays["LATITUDE"],
+...     Airports_delays["LONGITUDE"],
+...     Airports_delays["Dep_Delay"],
+...     label=Airports_delays["Dep_Airport"],
+...     name="Departure delays",
+... ).add_to(m)
+"""
+
+from __future__ import annotations
+
+from typing import Mapping, Optional
+
+import folium
+import numpy as np
+from matplotlib import colormaps
+from matplotlib import colors as mcolors
+
+
+def _as_list(values, n: int, keep: np.ndarray) -> list:
+    if np.ndim(values) == 0:
+        return [values] * n
+    return np.asarray(values)[keep].tolist()
+
+
+def feature_collection(
+    lat, lon, properties: Optional[Mapping[str, object]] = None
+) -> dict:
+    """GeoJSON ``FeatureCollection`` of points; rows without coordinates are dropped.
+
+    Each entry of ``properties`` is an array aligned with ``lat``/``lon`` or a
+    scalar shared by all features.
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    keep = np.isfinite(lat) & np.isfinite(lon)
+    n = int(keep.sum())
+
+    columns = {
+        name: _as_list(values, n, keep) for name, values in (properties or {}).items()
+    }
+    names = list(columns)
+    rows = zip(*columns.values()) if names else ((),) * n
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "id": str(i),
+                "geometry": {"type": "Point", "coordinates": [x, y]},
+                "properties": dict(zip(names, row)),
+            }
+            for i, (x, y, row) in enumerate(
+                zip(lon[keep].tolist(), lat[keep].tolist(), rows)
+            )
+        ],
+    }
+
+
+def _point_style(feature: dict) -> dict:
+    properties = feature["properties"]
+    return {
+        "radius": properties["radius"],
+        "color": properties["color"],
+        "fillColor": properties["color"],
+    }
+
+
+def point_layer(
+    lat,
+    lon,
+    value,
+    label=None,
+    name: Optional[str] = None,
+    radius_scale: float = 10000.0,
+    color: str = "red",
+    cmap: Optional[str] = None,
+    fill_opacity: float = 0.3,
+    value_name: str = "value",
+    show: bool = True,
+) -> folium.GeoJson:
+    """One GeoJSON layer of circles sized by ``value`` (radius in metres).
+
+    ``radius_scale`` converts values into metres, like the former
+    ``row["Dep_Delay"] * 10000``. With ``cmap`` the fill colour follows the
+    value as well. ``label`` and ``value`` are shown in the popup.
+    """
+    values = np.asarray(value, dtype=np.float64)
+    if cmap is not None:
+        norm = mcolors.Normalize(np.nanmin(values), np.nanmax(values))
+        colors = [mcolors.to_hex(c) for c in colormaps[cmap](norm(values))]
+    else:
+        colors = color
+
+    shown = np.round(values, 2).astype(object)
+    shown[np.isnan(values)] = None
+    properties = {
+        value_name: shown,
+        "radius": np.nan_to_num(values * radius_scale),
+        "color": colors,
+    }
+    fields = [value_name]
+    if label is not None:
+        properties["label"] = np.asarray(label, dtype=object)
+        fields.insert(0, "label")
+
+    return folium.GeoJson(
+        feature_collection(lat, lon, properties),
+        name=name,
+        marker=folium.Circle(fill=True, fill_opacity=fill_opacity, weight=1),
+        style_function=_point_style,
+        popup=folium.GeoJsonPopup(fields=fields, labels=False),
+        tooltip=folium.GeoJsonTooltip(fields=fields, labels=False),
+        show=show,
+    )
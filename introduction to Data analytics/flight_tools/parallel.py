@@ -0,0 +1,150 @@
+"""Chunked ``apply`` over a process or thread pool, and an asyncio ``apply``.
+
+The Series or DataFrame is split into contiguous row chunks; each chunk is
+applied in a worker and the results are concatenated back in the original
+order. CPU-bound Python functions go to a process pool (one interpreter per
+core); functions that wait on I/O or release the GIL (NumPy, regex on long
+strings, network calls) go to a thread pool, which avoids pickling the
+chunks.
+
+For coroutine functions (lookup services, HTTP APIs), ``async_apply`` calls
+the function once per distinct value with a bounded number of requests in
+flight and broadcasts the answers back onto the rows.
+
+>>> df["country"] = parallel_apply(df["country"], placeholder_function, io_bound=True)
+>>> flights_df["Route"] = parallel_apply(flights_df, make_route, axis=1)
+>>> flights_df["Owner"] = async_apply(flights_df["Tail_Number"], fetch_owner)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Awaitable, Callable, Optional, Union
+
+import pandas as pd
+from tqdm.auto import tqdm
+
+from .transform import broadcast
+
+Frame = Union[pd.Series, pd.DataFrame]
+
+
+def _apply_chunk(func: Callable, chunk: Frame, axis: int, kwargs: dict) -> Frame:
+    if isinstance(chunk, pd.Series):
+        return chunk.apply(func, **kwargs)
+    return chunk.apply(func, axis=axis, **kwargs)
+
+
+def default_workers(threads: bool) -> int:
+    """Pool size: one process per core, or ``ThreadPoolExecutor``'s default."""
+    cores = os.cpu_count() or 1
+    return min(32, cores + 4) if threads else cores
+
+
+def parallel_apply(
+    data: Frame,
+    func: Callable,
+    axis: int = 0,
+    chunksize: Optional[int] = None,
+    workers: Optional[int] = None,
+    executor: Optional[str] = None,
+    io_bound: bool = False,
+    releases_gil: bool = False,
+    progress: bool = True,
+    desc: Optional[str] = None,
+    **kwargs,
+) -> Frame:
+    """``data.apply(func, **kwargs)`` run in chunks across a worker pool.
+
+    ``executor`` is ``"process"`` or ``"thread"``; by default threads are used
+    when ``io_bound`` or ``releases_gil`` is set, processes otherwise (``func``
+    must then be picklable, i.e. defined at module level). ``chunksize``
+    defaults to about four chunks per worker. The progress bar counts rows,
+    like ``progress_apply``.
+    """
+    if executor is None:
+        executor = "thread" if io_bound or releases_gil else "process"
+    if executor not in ("process", "thread"):
+        raise ValueError(f"executor must be 'process' or 'thread', not {executor!r}")
+    if isinstance(data, pd.DataFrame) and axis not in (0, 1, "index", "columns"):
+        raise ValueError(f"Invalid axis {axis!r}")
+
+    # Column-wise DataFrame.apply has nothing to split by rows
+    if len(data) == 0 or (isinstance(data, pd.DataFrame) and axis in (0, "index")):
+        return _apply_chunk(func, data, axis, kwargs)
+
+    threads = executor == "thread"
+    workers = workers or default_workers(threads)
+    chunksize = chunksize or max(1, -(-len(data) // (workers * 4)))
+    starts = range(0, len(data), chunksize)
+
+    pool_class = ThreadPoolExecutor if threads else ProcessPoolExecutor
+    results = [None] * len(starts)
+    with pool_class(max_workers=workers) as pool, tqdm(
+        total=len(data), desc=desc, disable=not progress
+    ) as bar:
+        futures = {
+            pool.submit(
+                _apply_chunk, func, data.iloc[start : start + chunksize], axis, kwargs
+            ): position
+            for position, start in enumerate(starts)
+        }
+        for future in as_completed(futures):
+            position = futures[future]
+            results[position] = future.result()
+            bar.update(min(chunksize, len(data) - starts[position]))
+    return pd.concat(results)
+
+
+DEFAULT_CONCURRENCY = 16
+
+
+async def async_apply_async(
+    values: pd.Series,
+    func: Callable[..., Awaitable],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    progress: bool = True,
+    desc: Optional[str] = None,
+    **kwargs,
+) -> pd.Series:
+    """Coroutine version of :func:`async_apply`, for use inside a running loop."""
+    codes, uniques = pd.factorize(values)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    with tqdm(total=len(uniques), desc=desc, disable=not progress) as bar:
+
+        async def call(value):
+            async with semaphore:
+                result = await func(value, **kwargs)
+            bar.update(1)
+            return result
+
+        results = await asyncio.gather(*(call(value) for value in uniques))
+
+    return broadcast(results, codes, values)
+
+
+def async_apply(
+    values: pd.Series,
+    func: Callable[..., Awaitable],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    progress: bool = True,
+    desc: Optional[str] = None,
+    **kwargs,
+) -> pd.Series:
+    """``values.apply`` for an ``async def`` function, one call per distinct value.
+
+    At most ``concurrency`` calls are awaited at the same time; missing values
+    are not passed to ``func`` and stay missing. The progress bar counts
+    distinct values. Works from plain scripts and from notebooks, where an
+    event loop is already running (the calls then run in a helper thread).
+    """
+    coroutine = async_apply_async(values, func, concurrency, progress, desc, **kwargs)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coroutine).result()
@@ -0,0 +1,331 @@
+"""``groupby(...).agg(...)`` split over row ranges and worker processes.
+
+The frame is copied once into shared memory (or, with
+:func:`partitioned_agg_cached`, every worker memory-maps the columnar cache)
+and cut into row ranges. Each worker reduces its ranges to mergeable partial
+states per group: count, sum, sum of squared deviations, min, max, and a
+t-digest when a median is asked for. The parent merges the partials by group label with
+the pairwise (Chan et al.) update and finishes the statistics.
+
+>>> partitioned_agg(
+...     df_flight,
+...     "Airline",
+...     {"Dep_Delay": "mean", "Arr_Delay": ["mean", "median"]},
+...     Number_of_flights=("Dep_Delay", "size"),
+... )
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+
+from ._shared import SharedColumn, SharedFrame, attached_frame
+from .aggregate import group_codes
+from .cache import build_cache, cache_path
+from .columns import source_columns, with_derived
+from .loader import DATASETS, DEFAULT_CHUNKSIZE, dataset_path
+from .sketches import DEFAULT_COMPRESSION, digests_by_group
+
+FUNCS = ("size", "count", "sum", "mean", "min", "max", "var", "std", "median")
+
+# Row ranges per worker, so that a slow range does not hold up the others
+PARTITIONS_PER_PROCESS = 4
+
+Keys = Union[str, Sequence[str]]
+Spec = Mapping[str, Union[str, Sequence[str]]]
+
+
+@dataclass(frozen=True)
+class _Output:
+    label: object
+    column: str
+    func: str
+
+
+def _outputs(spec: Optional[Spec], named: Dict[str, Tuple[str, str]]) -> List[_Output]:
+    """Output columns named as ``DataFrameGroupBy.agg`` would name them."""
+    spec = dict(spec or {})
+    # One list anywhere gives every spec output a (column, func) label
+    nested = any(not isinstance(funcs, str) for funcs in spec.values())
+    outputs = []
+    for column, funcs in spec.items():
+        if not nested:
+            outputs.append(_Output(column, column, funcs))
+        else:
+            funcs = [funcs] if isinstance(funcs, str) else funcs
+            outputs.extend(_Output((column, func), column, func) for func in funcs)
+    for label, (column, func) in named.items():
+        outputs.append(_Output(label, column, func))
+    if not outputs:
+        raise ValueError("No aggregation given")
+    for output in outputs:
+        if output.func not in FUNCS:
+            raise ValueError(
+                f"Unknown aggregation {output.func!r}, expected one of {FUNCS}"
+            )
+    return outputs
+
+
+def _partial(frame: pd.DataFrame, keys: List[str], plan: Dict[str, set]) -> dict:
+    """Mergeable per-group state of one row range."""
+    frame = with_derived(frame, keys)
+    codes, index, n_groups = group_codes(frame, keys)
+    partial = {
+        "index": index,
+        "size": np.bincount(codes[codes >= 0], minlength=n_groups),
+    }
+    for column, funcs in plan.items():
+        values = frame[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = (codes >= 0) & ~np.isnan(values)
+        group = codes[valid]
+        kept = values[valid]
+
+        count = np.bincount(group, minlength=n_groups).astype(np.float64)
+        total = np.bincount(group, weights=kept, minlength=n_groups)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, total / count, 0.0)
+        state = {"count": count, "sum": total, "mean": mean}
+        if funcs & {"var", "std"}:
+            deviation = kept - mean[group]
+            state["m2"] = np.bincount(
+                group, weights=deviation * deviation, minlength=n_groups
+            )
+        if "min" in funcs:
+            state["min"] = np.full(n_groups, np.inf)
+            np.minimum.at(state["min"], group, kept)
+        if "max" in funcs:
+            state["max"] = np.full(n_groups, -np.inf)
+            np.maximum.at(state["max"], group, kept)
+        if "median" in funcs:
+            state["digests"] = digests_by_group(
+                codes, values, n_groups, DEFAULT_COMPRESSION
+            )
+        partial[column] = state
+    return partial
+
+
+def _shared_partial(
+    columns: Dict[str, SharedColumn],
+    start: int,
+    stop: int,
+    *,
+    keys: List[str],
+    plan: Dict[str, set],
+) -> dict:
+    frame = attached_frame(columns).iloc[start:stop]
+    return _partial(frame, keys, plan)
+
+
+def _cached_partial(
+    target: str,
+    columns: List[str],
+    start: int,
+    stop: int,
+    *,
+    keys: List[str],
+    plan: Dict[str, set],
+) -> dict:
+    table = feather.read_table(target, columns=columns, memory_map=True)
+    frame = table.slice(start, stop - start).to_pandas(split_blocks=True)
+    return _partial(frame, keys, plan)
+
+
+def _merge(partials: List[dict], plan: Dict[str, set]) -> Tuple[pd.Index, dict]:
+    """Combine the partial states of disjoint row ranges, aligned by group label."""
+    indexes = [partial["index"] for partial in partials]
+    index = indexes[0].append(indexes[1:]).unique().sort_values()
+    n_groups = len(index)
+    merged = {"size": np.zeros(n_groups, dtype=np.int64)}
+    for column, funcs in plan.items():
+        merged[column] = {
+            "count": np.zeros(n_groups),
+            "sum": np.zeros(n_groups),
+            "mean": np.zeros(n_groups),
+            "m2": np.zeros(n_groups),
+            "min": np.full(n_groups, np.inf),
+            "max": np.full(n_groups, -np.inf),
+            "digests": [None] * n_groups,
+        }
+
+    for partial in partials:
+        # Each range saw every one of its groups once, so positions are unique
+        position = index.get_indexer(partial["index"])
+        merged["size"][position] += partial["size"]
+        for column, funcs in plan.items():
+            state = merged[column]
+            other = partial[column]
+            count = state["count"][position]
+            other_count = other["count"]
+            total = count + other_count
+            delta = other["mean"] - state["mean"][position]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                share = np.where(total > 0, other_count / total, 0.0)
+            if "m2" in other:
+                state["m2"][position] += other["m2"] + delta * delta * count * share
+            state["mean"][position] += delta * share
+            state["count"][position] = total
+            state["sum"][position] += other["sum"]
+            if "min" in other:
+                state["min"][position] = np.minimum(
+                    state["min"][position], other["min"]
+                )
+            if "max" in other:
+                state["max"][position] = np.maximum(
+                    state["max"][position], other["max"]
+                )
+            for group, digest in zip(position, other.get("digests", ())):
+                if digest is None:
+                    continue
+                if state["digests"][group] is None:
+                    state["digests"][group] = digest
+                else:
+                    state["digests"][group].merge(digest)
+    return index, merged
+
+
+def _finish(index: pd.Index, merged: dict, outputs: List[_Output]) -> pd.DataFrame:
+    columns = {}
+    for output in outputs:
+        if output.func == "size":
+            columns[output.label] = merged["size"]
+            continue
+        state = merged[output.column]
+        count = state["count"]
+        empty = count == 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if output.func == "count":
+                result = count.astype(np.int64)
+            elif output.func == "sum":
+                result = state["sum"]
+            elif output.func == "mean":
+                result = np.where(empty, np.nan, state["mean"])
+            elif output.func in ("var", "std"):
+                result = np.where(count > 1, state["m2"] / (count - 1), np.nan)
+                if output.func == "std":
+                    result = np.sqrt(result)
+            elif output.func == "min":
+                result = np.where(empty, np.nan, state["min"])
+            elif output.func == "max":
+                result = np.where(empty, np.nan, state["max"])
+            else:
+                result = np.array(
+                    [
+                        digest.quantile(0.5) if digest is not None else np.nan
+                        for digest in state["digests"]
+                    ]
+                )
+        columns[output.label] = result
+
+    labels = [output.label for output in outputs]
+    result = pd.DataFrame(columns, index=index)[labels]
+    if any(isinstance(label, tuple) for label in labels):
+        result.columns = pd.MultiIndex.from_tuples(
+            [label if isinstance(label, tuple) else (label, "") for label in labels]
+        )
+    return result
+
+
+def _plan(outputs: List[_Output]) -> Dict[str, set]:
+    plan: Dict[str, set] = {}
+    for output in outputs:
+        if output.func != "size":
+            plan.setdefault(output.column, set()).add(output.func)
+    return plan
+
+
+def _ranges(n_rows: int, partitions: int) -> List[Tuple[int, int]]:
+    """``partitions`` contiguous ``(start, stop)`` row ranges (at least one)."""
+    count = max(1, min(partitions, n_rows))
+    bounds = np.linspace(0, n_rows, count + 1).astype(np.int64)
+    return [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+def _run(task: Callable, ranges, processes: int) -> List[dict]:
+    """``task(start, stop)`` for every range, in a pool unless ``processes`` is 1."""
+    if processes == 1:
+        return [task(start, stop) for start, stop in ranges]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(task, start, stop) for start, stop in ranges]
+        return [future.result() for future in futures]
+
+
+def partitioned_agg(
+    df: pd.DataFrame,
+    by: Keys,
+    spec: Optional[Spec] = None,
+    processes: Optional[int] = None,
+    partitions: Optional[int] = None,
+    **named: Tuple[str, str],
+) -> pd.DataFrame:
+    """``df.groupby(by).agg(spec, **named)`` computed over row ranges in parallel.
+
+    ``spec`` maps columns to an aggregation name or a list of names, and
+    ``named`` takes ``name=(column, func)`` pairs, as in pandas. Supported:
+    ``size``, ``count``, ``sum``, ``mean``, ``min``, ``max``, ``var``,
+    ``std`` (exact) and ``median`` (t-digest estimate). Group keys may be
+    derived columns such as ``Month``. Results are ``float64`` (counts and
+    sizes ``int64``), indexed by the sorted observed groups. ``processes=1``
+    runs in the calling process.
+    """
+    keys = [by] if isinstance(by, str) else list(by)
+    outputs = _outputs(spec, named)
+    plan = _plan(outputs)
+    processes = processes or os.cpu_count() or 1
+    ranges = _ranges(len(df), partitions or processes * PARTITIONS_PER_PROCESS)
+
+    # Derived keys are computed in the workers from their source column
+    needed = [key if key in df else source_columns([key])[0] for key in keys]
+    needed = list(dict.fromkeys([*needed, *plan]))
+
+    if processes == 1:
+        frame = df[needed]
+        partials = [
+            _partial(frame.iloc[start:stop], keys, plan) for start, stop in ranges
+        ]
+    else:
+        with SharedFrame(df, needed) as shared:
+            task = partial(_shared_partial, shared.columns, keys=keys, plan=plan)
+            partials = _run(task, ranges, processes)
+    return _finish(*_merge(partials, plan), outputs)
+
+
+def partitioned_agg_cached(
+    name: str,
+    by: Keys,
+    spec: Optional[Spec] = None,
+    data_dir=None,
+    cache_dir=None,
+    processes: Optional[int] = None,
+    partitions: Optional[int] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    **named: Tuple[str, str],
+) -> pd.DataFrame:
+    """:func:`partitioned_agg` over the columnar cache of one of the ``DATASETS``.
+
+    Nothing is loaded in the parent: each worker memory-maps the cache file
+    and converts only its row range of the needed columns.
+    """
+    keys = [by] if isinstance(by, str) else list(by)
+    outputs = _outputs(spec, named)
+    plan = _plan(outputs)
+    processes = processes or os.cpu_count() or 1
+
+    path, schema = dataset_path(name, data_dir), DATASETS[name]
+    target = cache_path(path, schema, cache_dir)
+    if not target.exists():
+        build_cache(path, schema, cache_dir, chunksize)
+    columns = source_columns([*keys, *plan])
+    n_rows = feather.read_table(target, columns=columns[:1], memory_map=True).num_rows
+    ranges = _ranges(n_rows, partitions or processes * PARTITIONS_PER_PROCESS)
+
+    task = partial(_cached_partial, str(target), columns, keys=keys, plan=plan)
+    partials = _run(task, ranges, processes)
+    return _finish(*_merge(partials, plan), outputs)
@@ -0,0 +1,660 @@
+"""One-pass profiling of large tables with mergeable sketches.
+
+A streaming counterpart of ``ProfileReport(df, explorative=True)`` for tables
+that do not fit in memory. Every chunk updates, per column, the missing
+count, a :class:`~flight_tools.sketches.HyperLogLog` of distinct values and,
+depending on the type, a :class:`~flight_tools.sketches.TDigest` (quantiles
+and histogram), exact min/max/zero counts, or the frequencies of the values.
+Means, standard deviations and the Pearson matrix of the numeric columns
+come from one :class:`~flight_tools.stats.PairwiseMoments`. Profiles of
+different chunks or files combine with :meth:`StreamingProfile.merge`.
+
+>>> profile = profile_dataset("flights", data_dir=data_dir)
+>>> profile.summary()
+>>> profile.to_file("profiling reports/profile_flights.html", title="US flights 2023")
+"""
+
+from __future__ import annotations
+
+import base64
+import html
+import io
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+
+from .cache import iter_cached
+from .loader import (
+    DATASETS,
+    DEFAULT_CHUNKSIZE,
+    DatasetSchema,
+    dataset_path,
+    iter_typed_chunks,
+)
+from .sketches import DEFAULT_COMPRESSION, DEFAULT_PRECISION, HyperLogLog, TDigest
+from .stats import PairwiseMoments
+
+DEFAULT_BINS = 50
+DEFAULT_TOP = 10
+# Distinct values whose frequencies are tracked. Beyond that a text column
+# keeps only the most frequent (approximate counts), and a numeric column
+# falls back to its t-digest for quantiles
+MAX_TRACKED = 10_000
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+SUMMARY_COLUMNS = (
+    "type",
+    "dtype",
+    "count",
+    "missing",
+    "missing_%",
+    "distinct",
+    "distinct_%",
+    "mean",
+    "std",
+    "min",
+    *(f"{q:.0%}" for q in QUANTILES),
+    "max",
+    "zeros",
+    "negative",
+    "top",
+    "freq",
+)
+
+NUMERIC = "Numeric"
+CATEGORICAL = "Categorical"
+DATETIME = "DateTime"
+TEXT = "Text"
+BOOLEAN = "Boolean"
+
+
+def column_kind(values: pd.Series) -> str:
+    """Profile type of a column, as shown in the report."""
+    dtype = values.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return CATEGORICAL
+    if dtype.kind == "b" or str(dtype) == "boolean":
+        return BOOLEAN
+    if dtype.kind in "iuf":
+        return NUMERIC
+    if dtype.kind == "M":
+        return DATETIME
+    return TEXT
+
+
+class StreamingProfile:
+    """Per-column summaries and correlations accumulated chunk by chunk."""
+
+    def __init__(
+        self,
+        compression: float = DEFAULT_COMPRESSION,
+        precision: int = DEFAULT_PRECISION,
+        bins: int = DEFAULT_BINS,
+        top: int = DEFAULT_TOP,
+    ):
+        self.compression = compression
+        self.precision = precision
+        self.bins = bins
+        self.top = top
+        self.rows = 0
+        self.kinds: Dict[str, str] = {}
+        self.dtypes: Dict[str, str] = {}
+        self.missing: Dict[str, int] = {}
+        self.distinct: Dict[str, HyperLogLog] = {}
+        self.digests: Dict[str, TDigest] = {}
+        self.minimum: Dict[str, object] = {}
+        self.maximum: Dict[str, object] = {}
+        self.zeros: Dict[str, int] = {}
+        self.negatives: Dict[str, int] = {}
+        self.frequencies: Dict[str, pd.Series] = {}
+        self.values: Dict[str, Optional[pd.Series]] = {}
+        self.totals: Dict[str, float] = {}
+        self.nbytes: Dict[str, int] = {}
+        self.moments: Optional[PairwiseMoments] = None
+        # Zero-row frame with the column dtypes, for ``select_dtypes``
+        self.empty: Optional[pd.DataFrame] = None
+
+    def __repr__(self):
+        return f"StreamingProfile(rows={self.rows}, columns={len(self.kinds)})"
+
+    @property
+    def numeric_columns(self) -> list:
+        return [name for name, kind in self.kinds.items() if kind == NUMERIC]
+
+    def _start(self, chunk: pd.DataFrame):
+        self.empty = chunk.iloc[:0]
+        for name in chunk.columns:
+            kind = column_kind(chunk[name])
+            self.kinds[name] = kind
+            self.dtypes[name] = str(chunk[name].dtype)
+            self.missing[name] = 0
+            self.nbytes[name] = 0
+            self.distinct[name] = HyperLogLog(self.precision)
+            if kind == NUMERIC:
+                self.zeros[name] = 0
+                self.negatives[name] = 0
+            if kind in (NUMERIC, DATETIME):
+                self.digests[name] = TDigest(self.compression)
+                self.values[name] = pd.Series(dtype=np.int64)
+                self.minimum[name] = None
+                self.maximum[name] = None
+            if kind == DATETIME:
+                # Sum of the nanosecond timestamps, for the mean
+                self.totals[name] = 0.0
+            if kind in (CATEGORICAL, TEXT, BOOLEAN):
+                self.frequencies[name] = pd.Series(dtype=np.int64)
+        self.moments = PairwiseMoments(self.numeric_columns)
+
+    def _extremes(self, name: str, low, high):
+        if self.minimum[name] is None or low < self.minimum[name]:
+            self.minimum[name] = low
+        if self.maximum[name] is None or high > self.maximum[name]:
+            self.maximum[name] = high
+
+    def _add_frequencies(self, name: str, counts: pd.Series):
+        merged = self.frequencies[name].add(counts, fill_value=0).astype(np.int64)
+        if len(merged) > MAX_TRACKED:
+            merged = merged.nlargest(MAX_TRACKED)
+        self.frequencies[name] = merged
+
+    def _add_values(self, name: str, counts: Optional[pd.Series]):
+        if self.values[name] is None or counts is None:
+            self.values[name] = None
+            return
+        merged = self.values[name].add(counts, fill_value=0).astype(np.int64)
+        self.values[name] = merged if len(merged) <= MAX_TRACKED else None
+
+    def update(self, chunk: pd.DataFrame) -> "StreamingProfile":
+        """Add the rows of ``chunk`` (same columns as the previous chunks)."""
+        if not self.kinds:
+            self._start(chunk)
+        self.rows += len(chunk)
+        for name, kind in self.kinds.items():
+            values = chunk[name]
+            missing = values.isna()
+            self.missing[name] += int(missing.sum())
+            self.nbytes[name] += int(values.memory_usage(index=False))
+            self.distinct[name].update(values)
+
+            if kind == NUMERIC:
+                array = values.to_numpy(dtype=np.float64, na_value=np.nan)
+                present = array[~np.isnan(array)]
+                if len(present):
+                    self.digests[name].update(present)
+                    self._extremes(name, present.min(), present.max())
+                    self.zeros[name] += int(np.count_nonzero(present == 0))
+                    self.negatives[name] += int(np.count_nonzero(present < 0))
+                    if self.values[name] is not None:
+                        self._add_values(name, pd.Series(present).value_counts())
+            elif kind == DATETIME:
+                present = values[~missing]
+                if len(present):
+                    self._extremes(name, present.min(), present.max())
+                    stamps = present.to_numpy(dtype="datetime64[ns]").view(np.int64)
+                    self.digests[name].update(stamps.astype(np.float64))
+                    self.totals[name] += float(stamps.astype(np.float64).sum())
+                    if self.values[name] is not None:
+                        self._add_values(name, pd.Series(stamps).value_counts())
+            else:
+                counts = values.value_counts(sort=False, dropna=True)
+                # Unused categories come back with a zero count
+                counts = counts[counts > 0]
+                counts.index = pd.Index(np.asarray(counts.index, dtype=object))
+                self._add_frequencies(name, counts)
+
+        if self.numeric_columns:
+            self.moments.update(chunk)
+        return self
+
+    def merge(self, other: "StreamingProfile") -> "StreamingProfile":
+        """Fold the profile of other rows with the same columns into this one."""
+        if not other.kinds:
+            return self
+        if not self.kinds:
+            self.__dict__.update(other.__dict__)
+            return self
+        self.rows += other.rows
+        for name in self.kinds:
+            self.missing[name] += other.missing[name]
+            self.nbytes[name] += other.nbytes[name]
+            self.distinct[name].merge(other.distinct[name])
+            if name in self.digests:
+                self.digests[name].merge(other.digests[name])
+                self._add_values(name, other.values[name])
+            if name in self.zeros:
+                self.zeros[name] += other.zeros[name]
+                self.negatives[name] += other.negatives[name]
+            if name in self.totals:
+                self.totals[name] += other.totals[name]
+            if name in self.minimum and other.minimum[name] is not None:
+                self._extremes(name, other.minimum[name], other.maximum[name])
+            if name in self.frequencies:
+                self._add_frequencies(name, other.frequencies[name])
+        self.moments.merge(other.moments)
+        return self
+
+    def distinct_count(self, name: str) -> int:
+        """Distinct values of ``name``, exact when all its values are tracked."""
+        frequencies = self.frequencies.get(name, self.values.get(name))
+        if frequencies is not None and len(frequencies) < MAX_TRACKED:
+            return len(frequencies)
+        return int(round(self.distinct[name].count()))
+
+    def summary(self) -> pd.DataFrame:
+        """One row of statistics per column, like ``describe(include="all").T``."""
+        means = self.moments.means()
+        stds = self.moments.stds()
+        rows = {}
+        for name, kind in self.kinds.items():
+            present = self.rows - self.missing[name]
+            distinct = self.distinct_count(name)
+            row = {
+                "type": kind,
+                "dtype": self.dtypes[name],
+                "count": present,
+                "missing": self.missing[name],
+                "missing_%": 100 * self.missing[name] / self.rows if self.rows else 0,
+                "distinct": distinct,
+                "distinct_%": 100 * distinct / present if present else 0,
+            }
+            if kind == NUMERIC:
+                quantiles = self.quantile(name, list(QUANTILES))
+                row.update(
+                    {
+                        "mean": means[name],
+                        "std": stds[name],
+                        "min": self.minimum[name],
+                        **{f"{q:.0%}": value for q, value in zip(QUANTILES, quantiles)},
+                        "max": self.maximum[name],
+                        "zeros": self.zeros[name],
+                        "negative": self.negatives[name],
+                    }
+                )
+            elif kind == DATETIME:
+                row.update({"min": self.minimum[name], "max": self.maximum[name]})
+            else:
+                frequencies = self.frequencies[name]
+                if len(frequencies):
+                    row.update({"top": frequencies.idxmax(), "freq": frequencies.max()})
+            rows[name] = row
+        summary = pd.DataFrame.from_dict(rows, orient="index")
+        return summary.reindex(
+            columns=[column for column in SUMMARY_COLUMNS if column in summary]
+        )
+
+    def quantile(self, name: str, q):
+        """Quantile(s) of a numeric or datetime column, like ``Series.quantile``.
+
+        Exact while the column has at most ``MAX_TRACKED`` distinct values
+        (linear interpolation, as in pandas), read from the t-digest beyond.
+        """
+        table = self.values[name]
+        if table is None:
+            return self.digests[name].quantile(q)
+        if len(table) == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        table = table.sort_index()
+        values = table.index.to_numpy(dtype=np.float64)
+        cumulative = np.cumsum(table.to_numpy())
+        last = cumulative[-1] - 1
+        positions = np.asarray(q, dtype=np.float64) * last
+        below = np.floor(positions)
+        # Value at 0-based rank r: the first whose cumulative count exceeds r
+        lower = values[np.searchsorted(cumulative, below, side="right")]
+        upper = values[
+            np.searchsorted(cumulative, np.minimum(below + 1, last), side="right")
+        ]
+        result = lower + (positions - below) * (upper - lower)
+        return result if np.ndim(q) else float(result)
+
+    def isnull(self) -> pd.Series:
+        """Missing values per column, like ``df.isnull().sum()``."""
+        return pd.Series(self.missing, dtype=np.int64)
+
+    def _describe_column(self, name: str, percentiles) -> pd.Series:
+        kind = self.kinds[name]
+        count = self.rows - self.missing[name]
+        labels = [f"{100 * q:g}%" for q in percentiles]
+        if kind == NUMERIC:
+            values = (
+                [count, self.moments.means()[name], self.moments.stds()[name]]
+                + [self.minimum[name] if count else np.nan]
+                + list(self.quantile(name, list(percentiles)))
+                + [self.maximum[name] if count else np.nan]
+            )
+            index = ["count", "mean", "std", "min", *labels, "max"]
+            return pd.Series(values, index=index, name=name, dtype=np.float64)
+        if kind == DATETIME:
+            stamps = [
+                pd.Timestamp(int(round(value))) if count else pd.NaT
+                for value in [
+                    self.totals[name] / count if count else np.nan,
+                    *self.quantile(name, list(percentiles)),
+                ]
+            ]
+            values = [count, stamps[0], self.minimum[name], *stamps[1:]]
+            values.append(self.maximum[name])
+            index = ["count", "mean", "min", *labels, "max"]
+            return pd.Series(values, index=index, name=name)
+
+        frequencies = self.frequencies[name]
+        index = ["count", "unique", "top", "freq"]
+        if len(frequencies):
+            top = frequencies.idxmax()
+            values = [count, self.distinct_count(name), top, frequencies[top]]
+            return pd.Series(values, index=index, name=name)
+        return pd.Series(
+            [count, 0, np.nan, np.nan], index=index, name=name, dtype=object
+        )
+
+    def describe(self, percentiles=None, include=None, exclude=None) -> pd.DataFrame:
+        """``DataFrame.describe`` of the streamed table, with the same layout.
+
+        ``include`` and ``exclude`` select columns as in pandas (numeric and
+        datetime columns by default). Percentiles are exact as long as
+        :meth:`quantile` is; unique counts of text columns with more than
+        ``MAX_TRACKED`` values come from HyperLogLog.
+        """
+        percentiles = [0.25, 0.5, 0.75] if percentiles is None else list(percentiles)
+        if 0.5 not in percentiles:
+            percentiles.append(0.5)
+        percentiles = sorted(set(percentiles))
+
+        if include is None and exclude is None:
+            selected = self.empty.select_dtypes(include=[np.number, "datetime"])
+            if len(selected.columns) == 0:
+                selected = self.empty
+        elif include == "all":
+            if exclude is not None:
+                raise ValueError("exclude must be None when include is 'all'")
+            selected = self.empty
+        else:
+            selected = self.empty.select_dtypes(include=include, exclude=exclude)
+
+        described = [self._describe_column(name, percentiles) for name in selected]
+        # Row order of pandas: shortest description first, then new labels
+        rows = []
+        for index in sorted((column.index for column in described), key=len):
+            rows.extend(label for label in index if label not in rows)
+        return pd.concat([column.reindex(rows) for column in described], axis=1)
+
+    def info(self, buf=None):
+        """Print a summary like ``DataFrame.info(show_counts=True)``."""
+        names = list(self.kinds)
+        width = max([len("Column"), *(len(str(name)) for name in names)])
+        count_width = max(len("Non-Null Count"), len(f"{self.rows} non-null"))
+        entries = (
+            f"RangeIndex: {self.rows} entries, 0 to {self.rows - 1}"
+            if self.rows
+            else "RangeIndex: 0 entries"
+        )
+        lines = [
+            "<class 'pandas.core.frame.DataFrame'>",
+            entries,
+            f"Data columns (total {len(names)} columns):",
+            f" #   {'Column':<{width}}  {'Non-Null Count':<{count_width}}  Dtype",
+            f"---  {'------':<{width}}  {'--------------':<{count_width}}  -----",
+        ]
+        for position, name in enumerate(names):
+            present = f"{self.rows - self.missing[name]} non-null"
+            lines.append(
+                f" {position:<3} {name:<{width}}  {present:<{count_width}}  "
+                f"{self.dtypes[name]}"
+            )
+        dtypes = pd.Series(self.dtypes).value_counts().sort_index()
+        lines.append(
+            "dtypes: " + ", ".join(f"{dtype}({n})" for dtype, n in dtypes.items())
+        )
+        has_objects = "object" in dtypes.index
+        lines.append(f"memory usage: {_size(sum(self.nbytes.values()), has_objects)}")
+        text = "\n".join(lines) + "\n"
+        if buf is None:
+            print(text, end="")
+        else:
+            buf.write(text)
+
+    def histogram(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """``(edges, counts)`` of ``bins`` equal-width bins, read from the digest."""
+        digest = self.digests[name]
+        if digest.count == 0:
+            return np.zeros(0), np.zeros(0)
+        low, high = digest.min, digest.max
+        if high <= low:
+            return np.array([low, low + 1.0]), np.array([digest.count])
+        edges = np.linspace(low, high, self.bins + 1)
+        cumulative = digest.cdf(edges) * digest.count
+        cumulative[0] = 0.0
+        cumulative[-1] = digest.count
+        return edges, np.diff(cumulative)
+
+    def top_values(self, name: str, top: Optional[int] = None) -> pd.Series:
+        """Most frequent values of a categorical, text or boolean column."""
+        return self.frequencies[name].nlargest(top or self.top)
+
+    def correlations(self) -> pd.DataFrame:
+        """Pearson matrix of the numeric columns, like ``df.corr()``."""
+        return self.moments.corr()
+
+    def to_html(self, title: str = "Profiling Report") -> str:
+        """The report as one self-contained HTML page."""
+        return _render_html(self, title)
+
+    def to_file(self, path, title: str = "Profiling Report"):
+        """Write :meth:`to_html` to ``path``."""
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(self.to_html(title))
+
+
+def _size(nbytes: float, plus: bool) -> str:
+    # Same units as DataFrame.info
+    suffix = "+" if plus else ""
+    for unit in ("bytes", "KB", "MB", "GB", "TB"):
+        if nbytes < 1024.0:
+            return f"{nbytes:3.1f}{suffix} {unit}"
+        nbytes /= 1024.0
+    return f"{nbytes:3.1f}{suffix} PB"
+
+
+def profile_chunks(chunks, **options) -> StreamingProfile:
+    """Profile an iterable of frames, e.g. ``iter_typed_chunks``."""
+    profile = StreamingProfile(**options)
+    for chunk in chunks:
+        profile.update(chunk)
+    return profile
+
+
+def profile_frame(
+    df: pd.DataFrame, chunksize: int = DEFAULT_CHUNKSIZE, **options
+) -> StreamingProfile:
+    """Profile an in-memory frame in row slices of ``chunksize``."""
+    return profile_chunks(
+        (df.iloc[start : start + chunksize] for start in range(0, len(df), chunksize)),
+        **options,
+    )
+
+
+def profile_csv(
+    path,
+    schema: DatasetSchema,
+    columns: Optional[Sequence[str]] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    **options,
+) -> StreamingProfile:
+    """Profile a CSV in one streaming pass, with its schema applied while parsing."""
+    return profile_chunks(
+        iter_typed_chunks(path, schema, columns, chunksize), **options
+    )
+
+
+def profile_cached(
+    name: str,
+    columns: Optional[Sequence[str]] = None,
+    data_dir=None,
+    cache_dir=None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    **options,
+) -> StreamingProfile:
+    """Profile one of the ``DATASETS`` from its columnar cache, chunk by chunk."""
+    return profile_chunks(
+        iter_cached(name, columns, data_dir, cache_dir, chunksize), **options
+    )
+
+
+def profile_dataset(
+    name: str,
+    data_dir=None,
+    columns: Optional[Sequence[str]] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    **options,
+) -> StreamingProfile:
+    """:func:`profile_csv` of one of the ``DATASETS`` by name."""
+    return profile_csv(
+        dataset_path(name, data_dir), DATASETS[name], columns, chunksize, **options
+    )
+
+
+_STYLE = """
+body { font-family: Helvetica, Arial, sans-serif; margin: 2em auto; max-width: 1100px;
+       color: #222; }
+h1 { border-bottom: 2px solid #337ab7; padding-bottom: .3em; }
+h2 { color: #337ab7; margin-top: 2em; }
+nav a { margin-right: 1.5em; color: #337ab7; text-decoration: none; }
+table { border-collapse: collapse; font-size: 13px; margin: .5em 0; }
+th, td { padding: 3px 10px; border-bottom: 1px solid #ddd; text-align: right; }
+th { background: #f5f5f5; }
+.variable { display: flex; gap: 2em; align-items: flex-start;
+            border: 1px solid #ddd; padding: 1em; margin: 1em 0; }
+.variable h3 { margin: 0 0 .5em 0; }
+.tag { color: #fff; background: #337ab7; border-radius: 3px; padding: 1px 6px;
+       font-size: 12px; }
+.warning { color: #a94442; }
+"""
+
+
+def _image(figure: Figure) -> str:
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png", bbox_inches="tight")
+    encoded = base64.b64encode(buffer.getvalue()).decode("ascii")
+    return f'<img src="data:image/png;base64,{encoded}">'
+
+
+def _histogram_image(edges: np.ndarray, counts: np.ndarray) -> str:
+    figure = Figure(figsize=(4.5, 2.4), dpi=90)
+    ax = figure.subplots()
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align="edge", color="#337ab7")
+    ax.set_ylabel("Frequency")
+    return _image(figure)
+
+
+def _correlation_image(matrix: pd.DataFrame) -> str:
+    size = max(4.0, 0.45 * len(matrix))
+    figure = Figure(figsize=(size + 1, size), dpi=90)
+    ax = figure.subplots()
+    image = ax.imshow(matrix.to_numpy(), cmap="RdBu_r", vmin=-1, vmax=1)
+    ax.set_xticks(range(len(matrix)), matrix.columns, rotation=90)
+    ax.set_yticks(range(len(matrix)), matrix.index)
+    figure.colorbar(image, ax=ax, shrink=0.8)
+    return _image(figure)
+
+
+def _table(rows: dict) -> str:
+    cells = "".join(
+        f"<tr><th>{html.escape(str(key))}</th>"
+        f"<td>{html.escape(_format(value))}</td></tr>"
+        for key, value in rows.items()
+    )
+    return f"<table>{cells}</table>"
+
+
+def _format(value) -> str:
+    if isinstance(value, (float, np.floating)):
+        return "" if np.isnan(value) else f"{value:,.4g}"
+    if isinstance(value, (int, np.integer)):
+        return f"{value:,}"
+    return str(value)
+
+
+def _variable_html(profile: StreamingProfile, name: str, row: pd.Series) -> str:
+    kind = profile.kinds[name]
+    stats = {
+        key: row[key]
+        for key in row.index
+        if key not in ("type", "top", "freq") and pd.notna(row[key])
+    }
+    warnings = []
+    if row["missing"]:
+        warnings.append(f"{row['missing_%']:.1f}% missing")
+    if row["distinct"] == 1:
+        warnings.append("constant")
+    if kind == NUMERIC and row["count"] and row["zeros"] / row["count"] > 0.5:
+        warnings.append(f"{100 * row['zeros'] / row['count']:.0f}% zeros")
+
+    if kind == NUMERIC:
+        detail = _histogram_image(*profile.histogram(name))
+    elif kind == DATETIME:
+        detail = ""
+    else:
+        top = profile.top_values(name)
+        detail = _table(
+            {
+                value: f"{count:,} ({100 * count / profile.rows:.1f}%)"
+                for value, count in top.items()
+            }
+        )
+    notes = "".join(f'<p class="warning">{html.escape(w)}</p>' for w in warnings)
+    return (
+        f'<div class="variable"><div><h3 id="{html.escape(name)}">'
+        f'{html.escape(name)} <span class="tag">{kind}</span></h3>{notes}'
+        f"{_table(stats)}</div><div>{detail}</div></div>"
+    )
+
+
+def _render_html(profile: StreamingProfile, title: str) -> str:
+    summary = profile.summary()
+    missing_cells = int(summary["missing"].sum()) if len(summary) else 0
+    cells = profile.rows * len(summary)
+    overview = _table(
+        {
+            "Number of variables": len(summary),
+            "Number of observations": profile.rows,
+            "Missing cells": missing_cells,
+            "Missing cells (%)": 100 * missing_cells / cells if cells else 0.0,
+            **{
+                f"{kind} variables": int((summary["type"] == kind).sum())
+                for kind in summary["type"].unique()
+            },
+        }
+    )
+    variables = "".join(
+        _variable_html(profile, name, row) for name, row in summary.iterrows()
+    )
+
+    correlations = "<p>No numeric columns.</p>"
+    if len(profile.numeric_columns) > 1:
+        matrix = profile.correlations()
+        correlations = _correlation_image(matrix) + matrix.to_html(
+            float_format=lambda value: f"{value:.3f}", na_rep=""
+        )
+    missing = summary[["count", "missing", "missing_%"]].to_html(
+        float_format=lambda value: f"{value:.2f}"
+    )
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>{html.escape(title)}</title>
+<style>{_STYLE}</style></head>
+<body>
+<h1>{html.escape(title)}</h1>
+<nav><a href="#overview">Overview</a><a href="#variables">Variables</a>
+<a href="#correlations">Correlations</a><a href="#missing">Missing values</a></nav>
+<h2 id="overview">Overview</h2>{overview}
+<h2 id="variables">Variables</h2>{variables}
+<h2 id="correlations">Correlations</h2>{correlations}
+<h2 id="missing">Missing values</h2>{missing}
+<p><small>Quantiles and histograms come from t-digests, distinct counts of
+high-cardinality columns from HyperLogLog sketches.</small></p>
+</body>
+</html>
+"""
@@ -0,0 +1,322 @@
+"""Aggregate-then-render plots for millions of points.
+
+Above ``DENSITY_THRESHOLD`` rows the points are binned into a 2D raster with
+NumPy and drawn as one image, instead of one matplotlib artist per point.
+Below it the functions fall back to an ordinary scatter.
+
+>>> scatter(df_flight, x="Dep_Delay", y="Arr_Delay")
+>>> scatter(flights_df, x="Aicraft_age", y="Delay_Weather", hue="Airline")
+>>> category_density(df_flight, x="Dep_Delay", y="Airline")
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from matplotlib import colors as mcolors
+from matplotlib.patches import Patch
+
+DENSITY_THRESHOLD = 200_000
+DEFAULT_BINS = (500, 350)
+
+
+def _bin_index(values: np.ndarray, low: float, high: float, bins: int) -> np.ndarray:
+    width = (high - low) / bins if high > low else 1.0
+    index = np.floor((values - low) / width).astype(np.int64)
+    return np.clip(index, 0, bins - 1)
+
+
+def _finite_range(values: np.ndarray, limits=None) -> Tuple[float, float]:
+    if limits is not None:
+        return float(limits[0]), float(limits[1])
+    finite = values[np.isfinite(values)]
+    if not len(finite):
+        return 0.0, 1.0
+    return float(finite.min()), float(finite.max())
+
+
+def density_raster(
+    x,
+    y,
+    bins: Tuple[int, int] = DEFAULT_BINS,
+    xlim=None,
+    ylim=None,
+    codes: Optional[np.ndarray] = None,
+    n_codes: int = 0,
+    weights: Optional[np.ndarray] = None,
+):
+    """Bin points into a ``(ny, nx)`` count raster.
+
+    With ``codes`` (integer categories ``0..n_codes-1``) the result has shape
+    ``(n_codes, ny, nx)``; with ``weights`` a second raster holds the per-bin
+    sum of the weights. Returns ``(counts, weight_sums, extent)`` where
+    ``extent`` is ready for ``imshow``; without any finite point the rasters
+    are all zeros over a unit extent.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    keep = np.isfinite(x) & np.isfinite(y)
+    if codes is not None:
+        keep &= codes >= 0
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64)
+        keep &= np.isfinite(weights)
+
+    x0, x1 = _finite_range(x[keep], xlim)
+    y0, y1 = _finite_range(y[keep], ylim)
+    inside = keep & (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)
+
+    nx, ny = bins
+    flat = _bin_index(y[inside], y0, y1, ny) * nx + _bin_index(x[inside], x0, x1, nx)
+    size = nx * ny
+    if codes is not None:
+        flat = codes[inside].astype(np.int64) * size + flat
+        size *= n_codes
+    counts = np.bincount(flat, minlength=size).astype(np.float64)
+    weight_sums = None
+    if weights is not None:
+        weight_sums = np.bincount(flat, weights=weights[inside], minlength=size)
+
+    shape = (n_codes, ny, nx) if codes is not None else (ny, nx)
+    counts = counts.reshape(shape)
+    if weight_sums is not None:
+        weight_sums = weight_sums.reshape(shape)
+    return counts, weight_sums, (x0, x1, y0, y1)
+
+
+def _axis_bins(values: pd.Series, bins: int):
+    """Bin count and limits for one axis, one bin per value for narrow integers."""
+    if not pd.api.types.is_integer_dtype(values) or values.empty:
+        return bins, None
+    low, high = int(values.min()), int(values.max())
+    if high - low + 1 > bins:
+        return bins, None
+    return high - low + 1, (low - 0.5, high + 0.5)
+
+
+def _palette(n: int, palette=None):
+    cmap = plt.get_cmap(palette or ("tab10" if n <= 10 else "tab20"))
+    return [mcolors.to_rgb(cmap(i % cmap.N)) for i in range(n)]
+
+
+def _codes(values: pd.Series):
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy()
+        labels = list(values.cat.categories)
+    else:
+        codes, uniques = pd.factorize(values, sort=True)
+        labels = list(uniques)
+    return codes, labels
+
+
+def scatter(
+    data: pd.DataFrame,
+    x: str,
+    y: str,
+    hue: Optional[str] = None,
+    size: Optional[str] = None,
+    ax=None,
+    threshold: int = DENSITY_THRESHOLD,
+    bins: Tuple[int, int] = DEFAULT_BINS,
+    palette=None,
+    cmap: str = "viridis",
+    **scatter_kws,
+):
+    """Scatter ``x`` against ``y``, switching to a density raster for large data.
+
+    Arguments follow ``sns.scatterplot``. In raster mode a categorical
+    ``hue`` blends the category colours of each bin by their counts, a
+    numeric ``hue`` shows its per-bin mean, and ``size`` is ignored. Without
+    any finite point (an empty selection) the axes are left empty.
+    """
+    ax = ax or plt.gca()
+    xs = data[x].to_numpy(dtype=np.float64, na_value=np.nan)
+    ys = data[y].to_numpy(dtype=np.float64, na_value=np.nan)
+    if not _any_point(xs, ys):
+        return _axis_labels(ax, x, y)
+    hue_values = data[hue] if hue is not None else None
+    categorical_hue = hue_values is not None and not pd.api.types.is_numeric_dtype(
+        hue_values
+    )
+    if palette is not None and not categorical_hue:
+        # seaborn-style: a palette name on a numeric hue is a colormap
+        cmap = palette
+
+    nx, xlim = _axis_bins(data[x], bins[0])
+    ny, ylim = _axis_bins(data[y], bins[1])
+    raster = dict(bins=(nx, ny), xlim=xlim, ylim=ylim)
+
+    if len(data) <= threshold:
+        _plain_scatter(
+            ax,
+            xs,
+            ys,
+            hue_values,
+            categorical_hue,
+            data,
+            size,
+            palette,
+            cmap,
+            scatter_kws,
+        )
+    elif hue_values is None:
+        counts, _, extent = density_raster(xs, ys, **raster)
+        image = ax.imshow(
+            np.ma.masked_equal(counts, 0),
+            origin="lower",
+            extent=extent,
+            aspect="auto",
+            norm=mcolors.LogNorm(),
+            cmap=cmap,
+            interpolation="nearest",
+        )
+        ax.figure.colorbar(image, ax=ax, label="Number of points")
+    elif categorical_hue:
+        codes, labels = _codes(hue_values)
+        counts, _, extent = density_raster(
+            xs, ys, codes=codes, n_codes=len(labels), **raster
+        )
+        rgb = np.asarray(_palette(len(labels), palette))
+        total = counts.sum(axis=0)
+        blended = np.einsum("kyx,kc->yxc", counts, rgb)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            blended /= total[..., None]
+            alpha = np.log1p(total) / np.log1p(total.max())
+        image = np.dstack([np.nan_to_num(blended), 0.25 + 0.75 * alpha])
+        image[total == 0] = 0
+        ax.imshow(
+            image, origin="lower", extent=extent, aspect="auto", interpolation="nearest"
+        )
+        ax.legend(
+            handles=[Patch(color=c, label=l) for c, l in zip(rgb, labels)],
+            title=hue,
+            bbox_to_anchor=(1.05, 1),
+            loc="upper left",
+        )
+    else:
+        weights = hue_values.to_numpy(dtype=np.float64, na_value=np.nan)
+        counts, sums, extent = density_raster(xs, ys, weights=weights, **raster)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = sums / counts
+        image = ax.imshow(
+            np.ma.masked_invalid(mean),
+            origin="lower",
+            extent=extent,
+            aspect="auto",
+            cmap=cmap,
+            interpolation="nearest",
+        )
+        ax.figure.colorbar(image, ax=ax, label=f"Mean {hue}")
+
+    ax.set_xlabel(x)
+    ax.set_ylabel(y)
+    return ax
+
+
+def _any_point(xs: np.ndarray, ys: np.ndarray) -> bool:
+    return bool((np.isfinite(xs) & np.isfinite(ys)).any())
+
+
+def _axis_labels(ax, x: str, y: str):
+    ax.set_xlabel(x)
+    ax.set_ylabel(y)
+    return ax
+
+
+def _plain_scatter(
+    ax, xs, ys, hue_values, categorical_hue, data, size, palette, cmap, scatter_kws
+):
+    sizes = None
+    if size is not None:
+        raw = data[size]
+        if not pd.api.types.is_numeric_dtype(raw):
+            raw = pd.Series(_codes(raw)[0], index=raw.index)
+        raw = raw.to_numpy(dtype=np.float64, na_value=np.nan)
+        low, high = np.nanmin(raw), np.nanmax(raw)
+        sizes = 10 + 90 * (raw - low) / (high - low if high > low else 1.0)
+
+    if hue_values is None:
+        ax.scatter(xs, ys, s=sizes, **scatter_kws)
+    elif categorical_hue:
+        codes, labels = _codes(hue_values)
+        for code, (label, color) in enumerate(
+            zip(labels, _palette(len(labels), palette))
+        ):
+            mask = codes == code
+            ax.scatter(
+                xs[mask],
+                ys[mask],
+                s=sizes[mask] if sizes is not None else None,
+                color=color,
+                label=label,
+                **scatter_kws,
+            )
+        ax.legend(title=hue_values.name, bbox_to_anchor=(1.05, 1), loc="upper left")
+    else:
+        points = ax.scatter(
+            xs,
+            ys,
+            s=sizes,
+            c=hue_values.to_numpy(dtype=np.float64, na_value=np.nan),
+            cmap=cmap,
+            **scatter_kws,
+        )
+        ax.figure.colorbar(points, ax=ax, label=hue_values.name)
+
+
+def category_density(
+    data: pd.DataFrame,
+    x: str,
+    y: str,
+    bins: int = 400,
+    xlim=None,
+    ax=None,
+    cmap: str = "viridis_r",
+    threshold: int = DENSITY_THRESHOLD,
+    **strip_kws,
+):
+    """Strip plot of ``x`` per category of ``y``, as density bands for large data.
+
+    Up to ``threshold`` rows the points are drawn with a vertical jitter, as
+    ``sns.stripplot`` does. Above it each band is the histogram of ``x``
+    within that category, drawn on a log colour scale so isolated extreme
+    values stay visible. Without any finite point the axes are left empty.
+    """
+    ax = ax or plt.gca()
+    codes, labels = _codes(data[y])
+    xs = data[x].to_numpy(dtype=np.float64, na_value=np.nan)
+    ys = codes.astype(np.float64)
+    ys[codes < 0] = np.nan
+    ax.set_yticks(range(len(labels)))
+    ax.set_yticklabels(labels)
+    if not _any_point(xs, ys):
+        return _axis_labels(ax, x, y)
+
+    if len(data) <= threshold:
+        jitter = np.random.default_rng(0).uniform(-0.2, 0.2, len(ys))
+        strip_kws = {"s": 9, "alpha": 0.8, **strip_kws}
+        ax.scatter(xs, ys + jitter, **strip_kws)
+        ax.set_ylim(-0.5, len(labels) - 0.5)
+        return _axis_labels(ax, x, y)
+
+    if xlim is None:
+        bins, xlim = _axis_bins(data[x], bins)
+    counts, _, extent = density_raster(
+        xs, ys, (bins, len(labels)), xlim=xlim, ylim=(-0.5, len(labels) - 0.5)
+    )
+    image = ax.imshow(
+        np.ma.masked_equal(counts, 0),
+        origin="lower",
+        extent=extent,
+        aspect="auto",
+        norm=mcolors.LogNorm(),
+        cmap=cmap,
+        interpolation="nearest",
+    )
+    ax.set_xlabel(x)
+    ax.set_ylabel(y)
+    ax.figure.colorbar(image, ax=ax, label="Number of flights")
+    return ax
@@ -0,0 +1,190 @@
+"""Render the figures of an analysis in parallel, headless.
+
+Each figure is declared as a :class:`FigureJob`: the frame it reads, the
+columns it needs, an optional ``prepare`` step (filtering, aggregation) and a
+``plot`` function drawing on a matplotlib ``Axes``. The runner copies the
+needed columns into shared memory once, renders the jobs in a process pool
+with the Agg backend and writes one file per job and format, plus a timing
+table.
+
+>>> jobs = [
+...     FigureJob("dep_delay", plot_dep_delay, source="flights", columns=["Dep_Delay"]),
+...     FigureJob("tavg", plot_tavg, source="weather", columns=["tavg"]),
+... ]
+>>> timings = run_report(jobs, {"flights": flights_df, "weather": weather_df}, "figures")
+
+The ``prepare`` and ``plot`` functions are sent to the workers by reference,
+so they must be importable: define them in a module (see
+:mod:`flight_tools.figures`) rather than in a script or notebook, and call
+:func:`run_report` under ``if __name__ == "__main__":``. :func:`draw` renders
+the same job interactively, so each figure is only defined once.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from ._shared import SharedColumn, SharedFrame, attached_frame
+
+DEFAULT_FORMATS = ("png",)
+
+
+@dataclass(frozen=True)
+class FigureJob:
+    """One figure: ``plot(prepare(frame), ax)`` saved as ``<name>.<format>``.
+
+    ``style`` is anything ``plt.style.context`` accepts (a style name, a file
+    or a dict of rc parameters such as ``sns.axes_style("darkgrid")``); it is
+    only applied while the figure is drawn and saved.
+    """
+
+    name: str
+    plot: Callable
+    source: str = "flights"
+    columns: Optional[Tuple[str, ...]] = None
+    prepare: Optional[Callable] = None
+    figsize: Tuple[float, float] = (10, 6)
+    dpi: int = 100
+    style: Optional[object] = None
+
+
+def _init_worker():
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def _render(
+    job: FigureJob,
+    columns: Dict[str, SharedColumn],
+    output_dir: str,
+    formats: Sequence[str],
+) -> dict:
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    data = attached_frame(columns)
+    if job.columns is not None:
+        data = data[list(job.columns)]
+    if job.prepare is not None:
+        data = job.prepare(data)
+    prepared = time.perf_counter()
+
+    with plt.style.context(job.style or {}):
+        fig, ax = plt.subplots(figsize=job.figsize)
+        job.plot(data, ax)
+        fig.tight_layout()
+        plotted = time.perf_counter()
+
+        files = []
+        for fmt in formats:
+            path = Path(output_dir) / f"{job.name}.{fmt}"
+            fig.savefig(path, dpi=job.dpi)
+            files.append(str(path))
+    plt.close(fig)
+    saved = time.perf_counter()
+
+    return {
+        "job": job.name,
+        "prepare_s": prepared - start,
+        "plot_s": plotted - prepared,
+        "save_s": saved - plotted,
+        "total_s": saved - start,
+        "worker": os.getpid(),
+        "files": files,
+    }
+
+
+def draw(job: FigureJob, data, ax=None, prepared: bool = False):
+    """Draw ``job`` in this process, for the interactive version of a report.
+
+    ``data`` is the job's source frame, or the output of ``job.prepare`` when
+    ``prepared`` is true. ``job.columns`` is not applied: it only limits what
+    :func:`run_report` copies into shared memory. Returns the ``Axes``.
+    """
+    import matplotlib.pyplot as plt
+
+    if job.prepare is not None and not prepared:
+        data = job.prepare(data)
+    with plt.style.context(job.style or {}):
+        if ax is None:
+            _, ax = plt.subplots(figsize=job.figsize)
+        job.plot(data, ax)
+    return ax
+
+
+def _needed_columns(
+    jobs: Sequence[FigureJob], sources: Dict[str, pd.DataFrame]
+) -> Dict[str, List[str]]:
+    needed: Dict[str, List[str]] = {}
+    for job in jobs:
+        if job.source not in sources:
+            raise KeyError(f"Job {job.name!r} reads unknown source {job.source!r}")
+        columns = sources[job.source].columns if job.columns is None else job.columns
+        listed = needed.setdefault(job.source, [])
+        listed.extend(column for column in columns if column not in listed)
+    return needed
+
+
+def run_report(
+    jobs: Sequence[FigureJob],
+    sources: Dict[str, pd.DataFrame],
+    output_dir,
+    formats: Sequence[str] = DEFAULT_FORMATS,
+    processes: Optional[int] = None,
+) -> pd.DataFrame:
+    """Render ``jobs`` over the ``sources`` frames into ``output_dir``.
+
+    Returns the timing table (one row per job, in declaration order), which
+    is also written to ``output_dir/timings.csv``. A failing job does not
+    stop the others; its error is reported in the ``error`` column.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    needed = _needed_columns(jobs, sources)
+
+    shared: Dict[str, SharedFrame] = {}
+    rows = {}
+    start = time.perf_counter()
+    try:
+        for name, columns in needed.items():
+            shared[name] = SharedFrame(sources[name], columns)
+        shared_s = time.perf_counter() - start
+
+        with ProcessPoolExecutor(
+            max_workers=processes, initializer=_init_worker
+        ) as pool:
+            futures = {
+                pool.submit(
+                    _render,
+                    job,
+                    shared[job.source].columns,
+                    str(output_dir),
+                    tuple(formats),
+                ): job
+                for job in jobs
+            }
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    rows[job.name] = future.result()
+                except Exception as error:
+                    rows[job.name] = {"job": job.name, "error": repr(error)}
+    finally:
+        for frame in shared.values():
+            frame.close()
+
+    timings = pd.DataFrame([rows[job.name] for job in jobs]).set_index("job")
+    if "error" not in timings:
+        timings["error"] = None
+    timings.attrs["shared_s"] = shared_s
+    timings.attrs["wall_s"] = time.perf_counter() - start
+    timings.to_csv(output_dir / "timings.csv")
+    return timings
@@ -0,0 +1,433 @@
+"""Uniform and stratified reservoir samples, with confidence intervals.
+
+The CSV is streamed chunk by chunk. Every row draws a random key and the
+reservoir keeps the ``n`` rows with the smallest keys (per stratum when
+``strata`` is given), which is a uniform sample without replacement of the
+rows seen so far. Only the sample and the row count of each stratum stay in
+memory.
+
+Summaries of a :class:`Sample` weight each row by the number of population
+rows it stands for and come with normal-approximation confidence intervals
+(finite population correction included). With ``n=None`` every row is kept,
+so the same calls give the exact full-data answers with zero-width intervals.
+
+>>> sample = sample_dataset("flights", n=2_000, strata=("Airline", "Month"))
+>>> sample.describe(["Dep_Delay", "Arr_Delay"])
+>>> sample.isnull()
+>>> sample.proportion(sample.frame["Arr_Delay"] > 15)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Dict, Hashable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .aggregate import group_codes, key_codes
+from .columns import source_columns, with_derived
+from .loader import (
+    DATASETS,
+    DEFAULT_CHUNKSIZE,
+    DatasetSchema,
+    concat_chunks,
+    dataset_path,
+    iter_typed_chunks,
+)
+
+DEFAULT_LEVEL = 0.95
+
+Strata = Union[None, str, Sequence[str]]
+DEFAULT_PERCENTILES = (0.25, 0.5, 0.75)
+
+# Label of the single stratum of an unstratified sample
+ALL_ROWS = "all"
+
+
+def _z(level: float) -> float:
+    return NormalDist().inv_cdf(0.5 + level / 2)
+
+
+def _as_float(values: pd.Series) -> np.ndarray:
+    return values.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _weighted_quantile(values: np.ndarray, weights: np.ndarray, q):
+    """Quantile of weighted ``values``, linear between order statistics.
+
+    With equal weights this is ``Series.quantile``'s linear interpolation.
+    """
+    if len(values) == 0:
+        return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+    order = np.argsort(values, kind="stable")
+    values = values[order]
+    weights = weights[order]
+    if len(values) == 1:
+        return np.full(np.shape(q), values[0]) if np.ndim(q) else float(values[0])
+    # Weight before each value, scaled so the first is at 0 and the last at 1
+    before = np.cumsum(weights) - weights
+    result = np.interp(q, before / before[-1], values)
+    return result if np.ndim(q) else float(result)
+
+
+def _observed(value: float, exact: bool) -> pd.Series:
+    # An extreme seen in a sample says nothing about the population's
+    if exact:
+        return pd.Series({"estimate": value, "se": 0.0, "low": value, "high": value})
+    return pd.Series({"estimate": value})
+
+
+@dataclass(frozen=True)
+class Sample:
+    """Rows drawn by a :class:`Reservoir` and the population they represent.
+
+    ``stratum`` is the stratum position of each row of ``frame`` and
+    ``sizes`` the number of population rows of each stratum.
+    """
+
+    frame: pd.DataFrame
+    stratum: np.ndarray
+    sizes: pd.Series
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Sampled rows per stratum."""
+        return np.bincount(self.stratum, minlength=len(self.sizes))
+
+    @property
+    def population(self) -> int:
+        return int(self.sizes.sum())
+
+    @property
+    def exact(self) -> bool:
+        """Whether every population row is in the sample."""
+        return bool((self.counts == self.sizes.to_numpy()).all())
+
+    @property
+    def weights(self) -> np.ndarray:
+        """Population rows represented by each sampled row."""
+        return (self.sizes.to_numpy() / self.counts)[self.stratum]
+
+    def __repr__(self):
+        return (
+            f"Sample(rows={len(self.frame)}, population={self.population}, "
+            f"strata={len(self.sizes)}, exact={self.exact})"
+        )
+
+    def _ratio(self, y: np.ndarray, x: np.ndarray):
+        """Estimate of ``sum(y) / sum(x)`` over the population, and its standard error.
+
+        Stratified ratio estimator with the linearised variance; a mean is
+        ``x = 1`` for present values, a proportion ``x = 1`` everywhere.
+        """
+        weights = self.weights
+        denominator = float((weights * x).sum())
+        if denominator == 0:
+            return np.nan, np.nan
+        ratio = float((weights * y).sum()) / denominator
+
+        residuals = y - ratio * x
+        n_strata = len(self.sizes)
+        counts = self.counts.astype(np.float64)
+        sizes = self.sizes.to_numpy(dtype=np.float64)
+        sums = np.bincount(self.stratum, residuals, n_strata)
+        squares = np.bincount(self.stratum, residuals * residuals, n_strata)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            within = np.where(
+                counts > 1, (squares - sums * sums / counts) / (counts - 1), 0.0
+            )
+            terms = sizes * sizes * (1 - counts / sizes) * within / counts
+        variance = float(np.sum(terms[counts > 0]))
+        return ratio, np.sqrt(max(variance, 0.0)) / denominator
+
+    @staticmethod
+    def _interval(estimate: float, se: float, level: float, scale: float = 1.0):
+        margin = _z(level) * se
+        return pd.Series(
+            {
+                "estimate": estimate * scale,
+                "se": se * scale,
+                "low": (estimate - margin) * scale,
+                "high": (estimate + margin) * scale,
+            }
+        )
+
+    def mean(self, column: str, level: float = DEFAULT_LEVEL) -> pd.Series:
+        """Population mean of ``column`` (missing values skipped), with interval."""
+        values = _as_float(self.frame[column])
+        present = ~np.isnan(values)
+        estimate, se = self._ratio(np.where(present, values, 0.0), present)
+        return self._interval(estimate, se, level)
+
+    def proportion(self, mask, level: float = DEFAULT_LEVEL) -> pd.Series:
+        """Share of population rows where ``mask`` (one flag per sampled row) holds."""
+        flags = np.asarray(mask, dtype=np.float64)
+        estimate, se = self._ratio(flags, np.ones(len(flags)))
+        return self._interval(estimate, se, level)
+
+    def count(self, mask, level: float = DEFAULT_LEVEL) -> pd.Series:
+        """Number of population rows for which ``mask`` holds."""
+        flags = np.asarray(mask, dtype=np.float64)
+        estimate, se = self._ratio(flags, np.ones(len(flags)))
+        return self._interval(estimate, se, level, scale=self.population)
+
+    def quantile(self, column: str, q: float, level: float = DEFAULT_LEVEL):
+        """Population quantile of ``column``, with a Woodruff interval.
+
+        The interval of the share of rows below the estimate is mapped back
+        through the sample's quantile function.
+        """
+        values = _as_float(self.frame[column])
+        present = ~np.isnan(values)
+        weights = self.weights[present]
+        estimate = _weighted_quantile(values[present], weights, q)
+        below = np.where(present, values <= estimate, False)
+        _, se = self._ratio(below.astype(np.float64), present)
+        margin = _z(level) * se
+        low, high = _weighted_quantile(
+            values[present], weights, np.clip([q - margin, q + margin], 0, 1)
+        )
+        return pd.Series({"estimate": estimate, "se": np.nan, "low": low, "high": high})
+
+    def describe(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+        level: float = DEFAULT_LEVEL,
+    ) -> pd.DataFrame:
+        """``describe()`` of the numeric ``columns`` estimated from the sample.
+
+        One row per (column, statistic) with the estimate and its interval.
+        ``std`` has no interval; ``min`` and ``max`` only have one when the
+        sample is exact.
+        """
+        if columns is None:
+            columns = self.frame.select_dtypes("number").columns
+        exact = self.exact
+        rows = {}
+        for column in columns:
+            values = _as_float(self.frame[column])
+            present = ~np.isnan(values)
+            weights = self.weights[present]
+            kept = values[present]
+
+            rows[column, "count"] = self.count(present, level)
+            rows[column, "mean"] = mean = self.mean(column, level)
+            total = weights.sum()
+            spread = np.nan
+            if total > 1:
+                deviations = (kept - mean["estimate"]) ** 2
+                spread = np.sqrt((weights * deviations).sum() / (total - 1))
+            rows[column, "std"] = pd.Series({"estimate": spread})
+            observed = {
+                "min": kept.min() if len(kept) else np.nan,
+                "max": kept.max() if len(kept) else np.nan,
+            }
+            rows[column, "min"] = _observed(observed["min"], exact)
+            for q in percentiles:
+                rows[column, f"{q:.0%}"] = self.quantile(column, q, level)
+            rows[column, "max"] = _observed(observed["max"], exact)
+
+        result = pd.DataFrame(rows).T
+        result.index.names = ["column", "statistic"]
+        return result.reindex(columns=["estimate", "se", "low", "high"])
+
+    def isnull(self, level: float = DEFAULT_LEVEL) -> pd.DataFrame:
+        """Estimated missing values per column, like ``isnull().sum()``."""
+        rows = {
+            column: self.count(self.frame[column].isna().to_numpy(), level)
+            for column in self.frame.columns
+        }
+        return pd.DataFrame(rows).T
+
+    def value_counts(
+        self, column: str, normalize: bool = False, level: float = DEFAULT_LEVEL
+    ) -> pd.DataFrame:
+        """Estimated rows per value of ``column``, most frequent first."""
+        codes, uniques = key_codes(self.frame[column])
+        present = (codes >= 0).astype(np.float64)
+        rows = {}
+        for position, value in enumerate(uniques):
+            flags = (codes == position).astype(np.float64)
+            if normalize:
+                estimate, se = self._ratio(flags, present)
+                rows[value] = self._interval(estimate, se, level)
+            else:
+                rows[value] = self.count(flags, level)
+        result = pd.DataFrame(rows).T
+        result.index.name = column
+        return result.sort_values("estimate", ascending=False)
+
+
+def _strata_keys(strata: Strata) -> tuple:
+    if strata is None:
+        return ()
+    return (strata,) if isinstance(strata, str) else tuple(strata)
+
+
+class Reservoir:
+    """Bottom-k random sample of the rows passed to :meth:`update`.
+
+    ``n`` rows are kept per stratum (overall when ``strata`` is empty);
+    ``None`` keeps every row for exact summaries. ``strata`` is a column
+    name or a sequence of them and may name derived columns such as
+    ``Month``, which are then added to the sample.
+
+    >>> reservoir = Reservoir(1_000, strata=("Airline",))
+    >>> for chunk in chunks:
+    ...     reservoir.update(chunk)
+    >>> reservoir.sample().mean("Dep_Delay")
+    """
+
+    def __init__(self, n: Optional[int], strata: Strata = (), seed: int = 0):
+        if n is not None and n <= 0:
+            raise ValueError("n must be positive")
+        self.n = n
+        self.strata = _strata_keys(strata)
+        self._rng = np.random.default_rng(seed)
+        self._labels: Dict[Hashable, int] = {}
+        self._sizes = np.zeros(0, dtype=np.int64)
+        # Largest key kept in each full stratum; rows need a smaller key to enter
+        self._threshold = np.zeros(0)
+        self._frame: Optional[pd.DataFrame] = None
+        self._keys = np.zeros(0)
+        self._stratum = np.zeros(0, dtype=np.int64)
+        self._parts: List[pd.DataFrame] = []
+
+    def __repr__(self):
+        rows = len(self._stratum)
+        return f"Reservoir(n={self.n}, strata={self.strata}, rows={rows})"
+
+    def _stratum_ids(self, chunk: pd.DataFrame) -> np.ndarray:
+        if not self.strata:
+            codes, labels = np.zeros(len(chunk), dtype=np.int64), [ALL_ROWS]
+        else:
+            n_keys = len(self.strata)
+            codes, index, n_groups = group_codes(chunk, self.strata)
+            labels = index.tolist()
+            if (codes < 0).any():
+                # Rows with a missing key form a stratum of their own
+                labels.append(None if n_keys == 1 else (None,) * n_keys)
+                codes = np.where(codes >= 0, codes, n_groups)
+
+        ids = np.array(
+            [self._labels.setdefault(label, len(self._labels)) for label in labels],
+            dtype=np.int64,
+        )
+        grow = len(self._labels) - len(self._sizes)
+        if grow:
+            self._sizes = np.r_[self._sizes, np.zeros(grow, dtype=np.int64)]
+            self._threshold = np.r_[self._threshold, np.full(grow, np.inf)]
+        return ids[codes]
+
+    def update(self, chunk: pd.DataFrame) -> "Reservoir":
+        """Offer the rows of ``chunk`` to the sample."""
+        chunk = with_derived(chunk, self.strata)
+        ids = self._stratum_ids(chunk)
+        self._sizes += np.bincount(ids, minlength=len(self._sizes))
+
+        if self.n is None:
+            self._parts.append(chunk)
+            self._stratum = np.r_[self._stratum, ids]
+            return self
+
+        keys = self._rng.random(len(chunk))
+        # Rows whose key cannot beat the sample of their stratum are skipped
+        entering = np.flatnonzero(keys < self._threshold[ids])
+        candidates = chunk.iloc[entering].reset_index(drop=True)
+        frame = concat_chunks(
+            [self._frame, candidates] if self._frame is not None else [candidates]
+        )
+        keys = np.r_[self._keys, keys[entering]]
+        stratum = np.r_[self._stratum, ids[entering]]
+
+        order = np.lexsort((keys, stratum))
+        ordered = stratum[order]
+        rank = np.arange(len(order)) - np.searchsorted(ordered, ordered)
+        selected = np.sort(order[rank < self.n])
+
+        n_strata = len(self._sizes)
+        kept = np.bincount(stratum[selected], minlength=n_strata)
+        largest = np.full(n_strata, -np.inf)
+        np.maximum.at(largest, stratum[selected], keys[selected])
+        self._threshold = np.where(kept >= self.n, largest, np.inf)
+
+        self._frame = frame.take(selected).reset_index(drop=True)
+        self._keys = keys[selected]
+        self._stratum = stratum[selected]
+        return self
+
+    def sample(self) -> Sample:
+        """The rows kept so far, with the population size of each stratum."""
+        if self.n is None:
+            frame = concat_chunks(self._parts)
+            self._parts = [frame]
+        else:
+            frame = self._frame if self._frame is not None else pd.DataFrame()
+
+        labels = list(self._labels)
+        if len(self.strata) > 1:
+            index = pd.MultiIndex.from_tuples(labels, names=list(self.strata))
+        else:
+            index = pd.Index(labels, name=self.strata[0] if self.strata else None)
+        return Sample(
+            frame=frame,
+            stratum=self._stratum.copy(),
+            sizes=pd.Series(self._sizes.copy(), index=index, name="rows"),
+        )
+
+
+def sample_frame(
+    df: pd.DataFrame,
+    n: Optional[int],
+    strata: Strata = (),
+    seed: int = 0,
+) -> Sample:
+    """Sample of an in-memory frame (``n=None`` keeps every row)."""
+    return Reservoir(n, strata, seed).update(df).sample()
+
+
+def sample_csv(
+    path,
+    schema: DatasetSchema,
+    n: Optional[int],
+    strata: Strata = (),
+    columns: Optional[Sequence[str]] = None,
+    seed: int = 0,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Sample:
+    """Stream ``path`` with its schema and keep ``n`` rows (per stratum).
+
+    The source columns of derived strata are read even when ``columns``
+    leaves them out.
+    """
+    if columns is not None:
+        columns = source_columns([*columns, *_strata_keys(strata)])
+
+    reservoir = Reservoir(n, strata, seed)
+    for chunk in iter_typed_chunks(path, schema, columns, chunksize):
+        reservoir.update(chunk)
+    return reservoir.sample()
+
+
+def sample_dataset(
+    name: str,
+    n: Optional[int],
+    strata: Strata = (),
+    columns: Optional[Sequence[str]] = None,
+    data_dir=None,
+    seed: int = 0,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Sample:
+    """:func:`sample_csv` of one of the ``DATASETS`` by name."""
+    return sample_csv(
+        dataset_path(name, data_dir),
+        DATASETS[name],
+        n,
+        strata,
+        columns,
+        seed,
+        chunksize,
+    )
@@ -0,0 +1,270 @@
+"""Mergeable summary sketches.
+
+``TDigest`` is a merging t-digest: values are folded into weighted centroids
+whose size is bounded by the arcsine scale function, so quantiles near the
+tails stay accurate. Two digests built on different chunks, months or worker
+processes merge into one digest of the union.
+
+``HyperLogLog`` estimates the number of distinct values from 2**precision
+small registers, and merges the same way.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_COMPRESSION = 200
+DEFAULT_PRECISION = 14
+
+
+def _compress(
+    means: np.ndarray, weights: np.ndarray, compression: float, presorted=False
+):
+    """Merge sorted centroids so that each one spans at most one unit of k-scale."""
+    if len(means) == 0:
+        return means, weights
+    if not presorted:
+        order = np.argsort(means, kind="stable")
+        means = means[order]
+        weights = weights[order]
+
+    total = weights.sum()
+    cumulative = np.cumsum(weights)
+    q = (cumulative - weights / 2) / total
+    # k1 scale function: k(q) = delta / (2 pi) * asin(2q - 1)
+    k = compression / (2 * np.pi) * np.arcsin(np.clip(2 * q - 1, -1.0, 1.0))
+    cluster = np.floor(k - k[0]).astype(np.int64)
+
+    starts = np.flatnonzero(np.r_[True, cluster[1:] != cluster[:-1]])
+    merged_weights = np.add.reduceat(weights, starts)
+    merged_means = np.add.reduceat(means * weights, starts) / merged_weights
+    return merged_means, merged_weights
+
+
+class TDigest:
+    """Mergeable quantile sketch with bounded relative rank error.
+
+    >>> digest = TDigest()
+    >>> digest.update(chunk["Arr_Delay"].to_numpy())
+    >>> digest.merge(other_digest).quantile(0.5)
+    """
+
+    def __init__(self, compression: float = DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0, dtype=np.float64)
+        self.weights = np.empty(0, dtype=np.float64)
+        self.min = np.inf
+        self.max = -np.inf
+
+    def __repr__(self):
+        return (
+            f"TDigest(count={self.count:g}, centroids={len(self.means)}, "
+            f"compression={self.compression:g})"
+        )
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def update(self, values, weights=None, presorted=False) -> "TDigest":
+        """Add an array of values (NaNs are ignored)."""
+        values = np.asarray(values, dtype=np.float64)
+        if weights is None:
+            weights = np.ones(len(values), dtype=np.float64)
+        else:
+            weights = np.asarray(weights, dtype=np.float64)
+        keep = ~np.isnan(values)
+        if not keep.all():
+            values = values[keep]
+            weights = weights[keep]
+        if len(values) == 0:
+            return self
+
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        # Existing centroids interleave with the new values, so re-sort
+        presorted = presorted and not len(self.means)
+        means = np.concatenate([self.means, values]) if len(self.means) else values
+        weights = (
+            np.concatenate([self.weights, weights]) if len(self.weights) else weights
+        )
+        self.means, self.weights = _compress(
+            means, weights, self.compression, presorted
+        )
+        return self
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        """Fold ``other`` into this digest."""
+        if len(other.means) == 0:
+            return self
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.means, self.weights = _compress(
+            np.concatenate([self.means, other.means]),
+            np.concatenate([self.weights, other.weights]),
+            self.compression,
+        )
+        return self
+
+    def _knots(self):
+        centers = np.cumsum(self.weights) - self.weights / 2
+        ranks = np.r_[0.0, centers, self.count]
+        values = np.r_[self.min, self.means, self.max]
+        return ranks, values
+
+    def quantile(self, q):
+        """Approximate quantile(s) for ``q`` in ``[0, 1]``."""
+        if len(self.means) == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        ranks, values = self._knots()
+        result = np.interp(np.asarray(q, dtype=np.float64) * self.count, ranks, values)
+        return result if np.ndim(q) else float(result)
+
+    def cdf(self, x):
+        """Approximate fraction of values less than or equal to ``x``."""
+        if len(self.means) == 0:
+            return np.full(np.shape(x), np.nan) if np.ndim(x) else np.nan
+        ranks, values = self._knots()
+        result = np.interp(np.asarray(x, dtype=np.float64), values, ranks) / self.count
+        return result if np.ndim(x) else float(result)
+
+    def to_dict(self) -> dict:
+        return {
+            "compression": self.compression,
+            "min": float(self.min),
+            "max": float(self.max),
+            "means": self.means.tolist(),
+            "weights": self.weights.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "TDigest":
+        digest = cls(state["compression"])
+        digest.min = state["min"]
+        digest.max = state["max"]
+        digest.means = np.asarray(state["means"], dtype=np.float64)
+        digest.weights = np.asarray(state["weights"], dtype=np.float64)
+        return digest
+
+    @classmethod
+    def from_centroids(
+        cls, means, weights, minimum, maximum, compression=DEFAULT_COMPRESSION
+    ) -> "TDigest":
+        digest = cls(compression)
+        digest.min = float(minimum)
+        digest.max = float(maximum)
+        digest.means, digest.weights = _compress(
+            np.asarray(means, dtype=np.float64),
+            np.asarray(weights, dtype=np.float64),
+            compression,
+        )
+        return digest
+
+
+def digests_by_group(
+    codes: np.ndarray,
+    values: np.ndarray,
+    n_groups: int,
+    compression: float = DEFAULT_COMPRESSION,
+) -> List[Optional[TDigest]]:
+    """Build one digest per group code with a single sort of the values.
+
+    Rows with a negative code or a NaN value are skipped; groups without any
+    value get ``None``.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    keep = (codes >= 0) & ~np.isnan(values)
+    codes = codes[keep]
+    values = values[keep]
+
+    order = np.lexsort((values, codes))
+    codes = codes[order]
+    values = values[order]
+    bounds = np.searchsorted(codes, np.arange(n_groups + 1))
+
+    digests: List[Optional[TDigest]] = []
+    for group in range(n_groups):
+        start, stop = bounds[group], bounds[group + 1]
+        if start == stop:
+            digests.append(None)
+            continue
+        digests.append(TDigest(compression).update(values[start:stop], presorted=True))
+    return digests
+
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch (relative error about 1.04 / sqrt(2**precision)).
+
+    Values are hashed with ``pd.util.hash_array``; each hash picks a register
+    from its top ``precision`` bits and records the position of the first set
+    bit of the rest. Categorical columns only hash their categories.
+
+    >>> sketch = HyperLogLog()
+    >>> sketch.update(chunk["Tail_Number"])
+    >>> sketch.merge(other_sketch).count()
+    """
+
+    def __init__(self, precision: int = DEFAULT_PRECISION):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def __repr__(self):
+        return f"HyperLogLog(precision={self.precision}, count~{self.count():.0f})"
+
+    def update(self, values) -> "HyperLogLog":
+        """Add the non-missing values of a Series or array."""
+        values = pd.Series(values) if not isinstance(values, pd.Series) else values
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Distinct values are the categories actually used
+            codes = values.cat.codes.to_numpy()
+            values = values.cat.categories[np.unique(codes[codes >= 0])]
+            array = values.to_numpy()
+        else:
+            array = values.dropna().to_numpy()
+        if len(array) == 0:
+            return self
+        if array.dtype.kind == "M" or array.dtype.kind == "m":
+            array = array.view(np.int64)
+
+        hashes = pd.util.hash_array(array)
+        rest_bits = 64 - self.precision
+        register = (hashes >> np.uint64(rest_bits)).astype(np.int64)
+        rest = hashes & np.uint64((1 << rest_bits) - 1)
+        # Bit length of the remaining bits, exactly (a float log2 would round)
+        powers = np.left_shift(np.uint64(1), np.arange(rest_bits, dtype=np.uint64))
+        bit_length = np.searchsorted(powers, rest, side="right")
+        rank = (rest_bits - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, register, rank)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Fold ``other`` (same precision) into this sketch."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> float:
+        """Estimated number of distinct values."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(int)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            return float(m * np.log(m / zeros))
+        return float(estimate)
+
+    def to_dict(self) -> dict:
+        return {"precision": self.precision, "registers": self.registers.tolist()}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "HyperLogLog":
+        sketch = cls(state["precision"])
+        sketch.registers = np.asarray(state["registers"], dtype=np.uint8)
+        return sketch
@@ -0,0 +1,280 @@
+"""Streaming, mergeable moment accumulators."""
+
+from __future__ import annotations
+
+from typing import Iterable, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .aggregate import key_codes
+
+
+class BivariateMoments:
+    """Running count, means and co-moments of two variables.
+
+    Each chunk is summarised with vectorised NumPy and combined with the
+    pairwise (Chan et al.) update, which stays numerically stable like
+    Welford's algorithm. Accumulators built on separate chunks or workers
+    combine with :meth:`merge`, and memory use does not depend on the number
+    of rows.
+
+    >>> moments = BivariateMoments.from_frame(df_flight, "Dep_Delay", "Arr_Delay")
+    >>> moments.slope, moments.intercept, moments.r
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.m2_x = 0.0
+        self.m2_y = 0.0
+        self.c_xy = 0.0
+        self.min_x = np.inf
+        self.max_x = -np.inf
+
+    def __repr__(self):
+        return f"BivariateMoments(n={self.n}, slope={self.slope:.4g}, r={self.r:.4g})"
+
+    def update(self, x, y) -> "BivariateMoments":
+        """Add paired observations; pairs with a NaN on either side are skipped."""
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        keep = ~(np.isnan(x) | np.isnan(y))
+        if not keep.all():
+            x = x[keep]
+            y = y[keep]
+        if len(x) == 0:
+            return self
+
+        chunk = BivariateMoments()
+        chunk.n = len(x)
+        chunk.mean_x = x.mean()
+        chunk.mean_y = y.mean()
+        dx = x - chunk.mean_x
+        dy = y - chunk.mean_y
+        chunk.m2_x = float(dx @ dx)
+        chunk.m2_y = float(dy @ dy)
+        chunk.c_xy = float(dx @ dy)
+        chunk.min_x = x.min()
+        chunk.max_x = x.max()
+        return self.merge(chunk)
+
+    def merge(self, other: "BivariateMoments") -> "BivariateMoments":
+        """Combine with the moments of another, disjoint set of pairs."""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+
+        n = self.n + other.n
+        delta_x = other.mean_x - self.mean_x
+        delta_y = other.mean_y - self.mean_y
+        weight = self.n * other.n / n
+
+        self.m2_x += other.m2_x + delta_x * delta_x * weight
+        self.m2_y += other.m2_y + delta_y * delta_y * weight
+        self.c_xy += other.c_xy + delta_x * delta_y * weight
+        self.mean_x += delta_x * other.n / n
+        self.mean_y += delta_y * other.n / n
+        self.min_x = min(self.min_x, other.min_x)
+        self.max_x = max(self.max_x, other.max_x)
+        self.n = n
+        return self
+
+    @property
+    def slope(self) -> float:
+        """Least-squares slope of ``y`` on ``x`` (``np.polyfit(x, y, 1)[0]``)."""
+        return self.c_xy / self.m2_x if self.m2_x else np.nan
+
+    @property
+    def intercept(self) -> float:
+        return self.mean_y - self.slope * self.mean_x
+
+    @property
+    def r(self) -> float:
+        """Pearson correlation coefficient (``np.corrcoef(x, y)[0, 1]``)."""
+        denominator = np.sqrt(self.m2_x * self.m2_y)
+        return self.c_xy / denominator if denominator else np.nan
+
+    @property
+    def covariance(self) -> float:
+        return self.c_xy / (self.n - 1) if self.n > 1 else np.nan
+
+    def line_endpoints(self) -> Tuple[np.ndarray, np.ndarray]:
+        """``(xs, ys)`` of the regression line across the observed ``x`` range."""
+        xs = np.array([self.min_x, self.max_x])
+        return xs, self.slope * xs + self.intercept
+
+    @classmethod
+    def from_chunks(
+        cls, chunks: Iterable[pd.DataFrame], x: str, y: str
+    ) -> "BivariateMoments":
+        """Accumulate over an iterable of frames, e.g. ``iter_typed_chunks``."""
+        moments = cls()
+        for chunk in chunks:
+            moments.update(chunk[x].to_numpy(), chunk[y].to_numpy())
+        return moments
+
+    @classmethod
+    def from_frame(
+        cls, df: pd.DataFrame, x: str, y: str, chunksize: int = 1_000_000
+    ) -> "BivariateMoments":
+        """Accumulate over ``df`` in row slices of ``chunksize``."""
+        return cls.from_chunks(
+            (
+                df.iloc[start : start + chunksize]
+                for start in range(0, len(df), chunksize)
+            ),
+            x,
+            y,
+        )
+
+
+class PairwiseMoments:
+    """Running means and co-moments of every pair of ``columns``.
+
+    The matrix counterpart of :class:`BivariateMoments`. Each pair uses the
+    rows where both values are present, as ``DataFrame.corr`` does: entry
+    ``[i, j]`` of ``n``, ``mean`` and ``m2`` describes column ``i`` over the
+    rows shared with column ``j``. Chunks are summarised with a few matrix
+    products and combined with the pairwise update.
+
+    >>> moments = PairwiseMoments(["Dep_Delay", "Arr_Delay", "Flight_Duration"])
+    >>> for chunk in chunks:
+    ...     moments.update(chunk)
+    >>> moments.corr()
+    """
+
+    def __init__(self, columns: Sequence[str]):
+        self.columns = list(columns)
+        size = (len(self.columns), len(self.columns))
+        self.n = np.zeros(size)
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+        self.c = np.zeros(size)
+
+    def __repr__(self):
+        return (
+            f"PairwiseMoments(columns={self.columns}, n={int(self.n.max(initial=0))})"
+        )
+
+    def update(self, df: pd.DataFrame) -> "PairwiseMoments":
+        """Add the rows of ``df`` (which must hold every column)."""
+        x = np.column_stack(
+            [
+                df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+                for column in self.columns
+            ]
+        )
+        present = ~np.isnan(x)
+        if not present.any():
+            return self
+        # Centre on the chunk means so the sums of products stay small
+        counts = present.sum(axis=0)
+        shift = np.nansum(x, axis=0) / np.maximum(counts, 1)
+        x = np.where(present, x - shift, 0.0)
+        weights = present.astype(np.float64)
+
+        chunk = PairwiseMoments(self.columns)
+        chunk.n = weights.T @ weights
+        sums = x.T @ weights
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(chunk.n > 0, sums / chunk.n, 0.0)
+        chunk.mean = mean + shift[:, None]
+        chunk.m2 = (x * x).T @ weights - mean * sums
+        chunk.c = x.T @ x - mean * sums.T
+        return self.merge(chunk)
+
+    def merge(self, other: "PairwiseMoments") -> "PairwiseMoments":
+        """Combine with the moments of another, disjoint set of rows."""
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(n > 0, self.n * other.n / n, 0.0)
+            share = np.where(n > 0, other.n / n, 0.0)
+        self.m2 = self.m2 + other.m2 + delta * delta * weight
+        self.c = self.c + other.c + delta * delta.T * weight
+        self.mean = self.mean + delta * share
+        self.n = n
+        return self
+
+    def corr(self) -> pd.DataFrame:
+        """Pearson correlation matrix, like ``DataFrame.corr()``."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            r = self.c / np.sqrt(self.m2 * self.m2.T)
+        r[self.n < 2] = np.nan
+        np.fill_diagonal(r, np.where(np.diag(self.n) > 1, 1.0, np.nan))
+        return pd.DataFrame(np.clip(r, -1, 1), index=self.columns, columns=self.columns)
+
+    def counts(self) -> pd.Series:
+        """Present values per column."""
+        return pd.Series(np.diag(self.n).astype(np.int64), index=self.columns)
+
+    def means(self) -> pd.Series:
+        return pd.Series(
+            np.where(np.diag(self.n) > 0, np.diag(self.mean), np.nan),
+            index=self.columns,
+        )
+
+    def stds(self) -> pd.Series:
+        """Sample standard deviations (``ddof=1``)."""
+        n = np.diag(self.n)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            variance = np.where(n > 1, np.diag(self.m2) / (n - 1), np.nan)
+        return pd.Series(np.sqrt(variance), index=self.columns)
+
+
+def target_correlations(
+    df: pd.DataFrame,
+    target: str,
+    numeric: Optional[Sequence[str]] = None,
+    categorical: Union[Mapping[str, str], Sequence[str], None] = None,
+) -> pd.Series:
+    """Pearson correlation of ``target`` with numeric columns and category indicators.
+
+    Gives the ``target`` column of ``df.select_dtypes("number").corr()`` after
+    ``pd.get_dummies`` of the ``categorical`` columns, without building either
+    frame. ``numeric`` defaults to all numeric columns; ``categorical`` maps
+    each column to its dummy prefix (a plain sequence uses the column name).
+    Indicators are correlated through per-category sums of the centred target,
+    so only one float column is held in memory at a time.
+
+    >>> target_correlations(
+    ...     df_flight, "Dep_Delay", categorical={"Manufacturer": "Manufac"}
+    ... )
+    """
+    if numeric is None:
+        numeric = df.select_dtypes("number").columns
+    if categorical is None:
+        categorical = {}
+    elif not isinstance(categorical, Mapping):
+        categorical = {column: column for column in categorical}
+
+    y = df[target].to_numpy(dtype=np.float64, na_value=np.nan)
+    result = {}
+    for column in numeric:
+        x = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        result[column] = BivariateMoments().update(x, y).r
+
+    valid = ~np.isnan(y)
+    y = y[valid]
+    n = len(y)
+    deviation = y - y.mean()
+    m2_y = deviation @ deviation
+    for column, prefix in categorical.items():
+        codes, categories = key_codes(df[column])
+        codes = codes[valid]
+        present = codes >= 0
+        # A missing category is an all-zero row in every indicator
+        n_k = np.bincount(codes[present], minlength=len(categories))
+        s_k = np.bincount(
+            codes[present], weights=deviation[present], minlength=len(categories)
+        )
+        with np.errstate(invalid="ignore", divide="ignore"):
+            r = s_k / np.sqrt(n_k * (1 - n_k / n) * m2_y)
+        r[(n_k == 0) | (n_k == n)] = np.nan
+        for category, value in zip(categories, r):
+            result[f"{prefix}_{category}"] = value
+    return pd.Series(result, name=target, dtype=np.float64)
@@ -0,0 +1,123 @@
+"""Sorted views of numeric columns for repeated threshold queries.
+
+Each indexed column is sorted once; afterwards the number of rows above,
+below or between thresholds is a binary search instead of a full boolean
+mask and filtered copy. With a ``group`` column the per-group maximum is
+kept sorted too, so "how many airports have a delay above t" is a binary
+search as well.
+
+>>> index = ThresholdIndex(df_flight, ["Dep_Delay", "Arr_Delay"], group="Dep_Airport")
+>>> index.count_above("Dep_Delay", 984)
+>>> index.groups_above("Dep_Delay", 984)
+>>> df_flight.iloc[index.rows_above("Dep_Delay", 1992)]
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .aggregate import group_codes
+
+
+class ThresholdIndex:
+    """Binary-search counts over the sorted values of ``columns``.
+
+    Missing values are left out of the index, as a comparison with NaN is
+    false in pandas.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        columns: Sequence[str] = ("Dep_Delay", "Arr_Delay"),
+        group: Optional[str] = None,
+    ):
+        self.columns = list(columns)
+        self.group = group
+        self.n_rows = len(df)
+        self._order: Dict[str, np.ndarray] = {}
+        self._sorted: Dict[str, np.ndarray] = {}
+        self._group_max: Dict[str, np.ndarray] = {}
+        self._group_max_sorted: Dict[str, np.ndarray] = {}
+
+        if group is not None:
+            codes, self.group_index, n_groups = group_codes(df, [group])
+        for column in self.columns:
+            values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            order = np.argsort(values, kind="stable")
+            # NaNs sort last
+            order = order[: len(values) - int(np.isnan(values).sum())]
+            self._order[column] = order
+            self._sorted[column] = values[order]
+
+            if group is not None:
+                valid = (codes >= 0) & ~np.isnan(values)
+                group_max = np.full(n_groups, -np.inf)
+                np.maximum.at(group_max, codes[valid], values[valid])
+                self._group_max[column] = group_max
+                self._group_max_sorted[column] = np.sort(group_max)
+
+    def __repr__(self):
+        return (
+            f"ThresholdIndex(columns={self.columns}, group={self.group!r}, "
+            f"rows={self.n_rows})"
+        )
+
+    def _search(self, column: str, value: float, strict: bool) -> int:
+        # Position of the first indexed value above ``value`` (or at it)
+        side = "right" if strict else "left"
+        return int(np.searchsorted(self._sorted[column], value, side=side))
+
+    def count_above(self, column: str, threshold: float, strict: bool = True) -> int:
+        """Rows with ``column > threshold`` (``>=`` when ``strict`` is false)."""
+        return len(self._sorted[column]) - self._search(column, threshold, strict)
+
+    def count_below(self, column: str, threshold: float, strict: bool = True) -> int:
+        """Rows with ``column < threshold`` (``<=`` when ``strict`` is false)."""
+        return self._search(column, threshold, not strict)
+
+    def count_between(
+        self, column: str, low: float, high: float, inclusive: str = "both"
+    ) -> int:
+        """Rows with ``low <= column <= high``, like ``Series.between``."""
+        start = self._search(column, low, inclusive in ("right", "neither"))
+        stop = self._search(column, high, inclusive in ("right", "both"))
+        return max(stop - start, 0)
+
+    def rows_above(self, column: str, threshold: float, strict: bool = True):
+        """Row positions with ``column`` above ``threshold``, by increasing value."""
+        return self._order[column][self._search(column, threshold, strict) :]
+
+    def quantile_value(self, column: str, q: float) -> float:
+        """Exact quantile, like ``Series.quantile(q, interpolation="lower")``."""
+        values = self._sorted[column]
+        return float(values[int(np.floor(q * (len(values) - 1)))])
+
+    def _check_group(self):
+        if self.group is None:
+            raise ValueError("The index was built without a group column")
+
+    def groups_above(self, column: str, threshold: float, strict: bool = True) -> int:
+        """Number of distinct groups with at least one row above ``threshold``."""
+        self._check_group()
+        group_max = self._group_max_sorted[column]
+        side = "right" if strict else "left"
+        return len(group_max) - int(np.searchsorted(group_max, threshold, side=side))
+
+    def group_labels_above(
+        self, column: str, threshold: float, strict: bool = True
+    ) -> pd.Index:
+        """Labels of the groups counted by :meth:`groups_above`."""
+        self._check_group()
+        group_max = self._group_max[column]
+        above = group_max > threshold if strict else group_max >= threshold
+        return self.group_index[above]
+
+    @property
+    def n_groups(self) -> int:
+        """Number of distinct groups, like ``nunique`` of the group column."""
+        self._check_group()
+        return len(self.group_index)
@@ -0,0 +1,141 @@
+"""Element-wise transforms evaluated once per distinct value.
+
+``map_unique`` runs a Python function on the categories of a categorical
+column (344 city names rather than 6.7M rows), or on the uniques found by
+``pd.factorize``, and broadcasts the answers back through the integer codes.
+An optional :class:`LRUCache` keeps the answers between calls, so the same
+transform over another column or frame only computes values it has not seen.
+
+>>> cache = LRUCache(maxsize=10_000)
+>>> flights_df["Dep_CityName"] = map_unique(flights_df["Dep_CityName"], str.upper, cache)
+>>> cache.stats()
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Bounded mapping evicting the least recently used entry.
+
+    With ``ttl`` (seconds) an entry also expires that long after it was
+    stored. ``stats()`` reports hits, misses, evictions and expirations.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: Optional[float] = None):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def __repr__(self):
+        return f"LRUCache(maxsize={self.maxsize}, ttl={self.ttl}, size={len(self)})"
+
+    def get(self, key, default=None, count: bool = True):
+        entry = self._entries.get(key, _MISSING)
+        if entry is not _MISSING and self.ttl is not None:
+            if time.monotonic() - entry[1] > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                entry = _MISSING
+        if entry is _MISSING:
+            self.misses += count
+            return default
+        self._entries.move_to_end(key)
+        self.hits += count
+        return entry[0]
+
+    def put(self, key, value):
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else np.nan,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+def broadcast(results: list, codes: np.ndarray, values: pd.Series) -> pd.Series:
+    """Series aligned with ``values`` holding ``results[code]`` (NaN for ``-1``)."""
+    # One extra slot so that missing values (code -1) map to NaN
+    lookup = np.empty(len(results) + 1, dtype=object)
+    for position, result in enumerate(results):
+        lookup[position] = result
+    lookup[-1] = np.nan
+    return pd.Series(
+        lookup[codes], index=values.index, name=values.name
+    ).infer_objects()
+
+
+def _evaluate(func: Callable, uniques, cache: Optional[LRUCache]) -> list:
+    if cache is None:
+        return [func(value) for value in uniques]
+    results = []
+    for value in uniques:
+        key = (func, value)
+        result = cache.get(key, _MISSING)
+        if result is _MISSING:
+            result = func(value)
+            cache.put(key, result)
+        results.append(result)
+    return results
+
+
+def map_unique(
+    values: pd.Series, func: Callable, cache: Optional[LRUCache] = None
+) -> pd.Series:
+    """``values.map(func)`` with ``func`` called once per distinct value.
+
+    Missing values are not passed to ``func`` and stay missing. A categorical
+    input gives a categorical result (its categories are the distinct
+    outputs); other inputs give a regular column. ``cache`` entries are keyed
+    by ``(func, value)``, so one cache can serve several transforms.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy()
+        uniques = values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values)
+    results = _evaluate(func, uniques, cache)
+
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Several categories may map to the same output
+        result_codes, categories = pd.factorize(pd.Index(results, tupleize_cols=False))
+        mapped = pd.Categorical.from_codes(
+            np.where(codes >= 0, result_codes[codes], -1), categories=categories
+        )
+        return pd.Series(mapped, index=values.index, name=values.name)
+
+    return broadcast(results, codes, values)
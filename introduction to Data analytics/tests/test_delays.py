@@ -0,0 +1,53 @@
+import pandas as pd
+
+from flight_tools.delays import DELAY_CAUSE_COLUMNS, delay_decomposition
+
+
+def _flights(dep, arr, causes):
+    frame = pd.DataFrame({"Dep_Delay": dep, "Arr_Delay": arr})
+    for column in DELAY_CAUSE_COLUMNS:
+        frame[column] = 0
+    for row, (column, minutes) in enumerate(causes):
+        if column is not None:
+            frame.loc[row, column] = minutes
+    return frame
+
+
+def test_undocumented_arrival_delay_is_missing():
+    # Sum_Delay == 0 and Arr_Delay > 0
+    flights = _flights([5, 0], [30, 0], [(None, 0), (None, 0)])
+    result = delay_decomposition(flights)
+    assert result["Delay_Missing"].tolist() == [30, 0]
+    assert result["Sum_Delay"].tolist() == [30, 0]
+    assert result["Absorption_Delay"].tolist() == [0, 0]
+
+
+def test_documented_causes_above_arrival_delay_are_absorbed():
+    # Sum_Delay > Arr_Delay and Dep_Delay > 0, then the same with Dep_Delay <= 0
+    flights = _flights(
+        [50, 0, 20],
+        [20, 10, 40],
+        [("Delay_Carrier", 35), ("Delay_NAS", 25), ("Delay_Weather", 40)],
+    )
+    result = delay_decomposition(flights)
+    assert result["Absorption_Delay"].tolist() == [30, 0, 0]
+    assert result["Delay_Missing"].tolist() == [0, 0, 0]
+    assert result["Sum_Delay"].tolist() == [35, 25, 40]
+
+
+def test_negative_delays():
+    # Early departures and arrivals are neither missing nor absorbed
+    flights = _flights(
+        [-10, 5, -3], [-15, -5, 0], [(None, 0), ("Delay_NAS", 10), (None, 0)]
+    )
+    result = delay_decomposition(flights)
+    assert result["Delay_Missing"].tolist() == [0, 0, 0]
+    assert result["Absorption_Delay"].tolist() == [0, 10, 0]
+    assert result["Sum_Delay"].tolist() == [0, 10, 0]
+
+
+def test_keeps_the_index():
+    flights = _flights([1, 2], [3, 4], [(None, 0), (None, 0)]).set_index(
+        pd.Index([10, 20])
+    )
+    assert delay_decomposition(flights).index.tolist() == [10, 20]
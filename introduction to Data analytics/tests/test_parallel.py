@@ -0,0 +1,69 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from flight_tools.parallel import async_apply, async_apply_async
+
+
+class FakeService:
+    """Async lookup recording its calls and the peak number in flight."""
+
+    def __init__(self, latency=0.01):
+        self.latency = latency
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, value):
+        self.calls.append(value)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.latency)
+        self.in_flight -= 1
+        return value.upper()
+
+
+def _airports():
+    codes = [f"a{i:02d}" for i in range(20)]
+    return pd.Series(codes * 5 + [None, np.nan], name="Dep_Airport")
+
+
+def test_concurrency_limit():
+    service = FakeService()
+    async_apply(_airports(), service, concurrency=3)
+    assert service.peak == 3
+
+
+def test_one_call_per_distinct_value():
+    values = _airports()
+    service = FakeService()
+    result = async_apply(values, service, concurrency=8)
+    assert sorted(service.calls) == sorted(values.dropna().unique())
+    assert result.iloc[:100].tolist() == values.iloc[:100].str.upper().tolist()
+
+
+def test_missing_values_stay_missing():
+    service = FakeService()
+    result = async_apply(_airports(), service, concurrency=8)
+    assert result.iloc[-2:].isna().all()
+    assert all(isinstance(value, str) for value in service.calls)
+
+
+def test_inside_a_running_loop():
+    # The synchronous entry point runs the coroutine on a helper thread
+    service = FakeService()
+
+    async def main():
+        return async_apply(_airports(), service, concurrency=4)
+
+    result = asyncio.run(main())
+    assert result.iloc[0] == "A00"
+    assert service.peak <= 4
+
+
+def test_async_version_awaited_directly():
+    service = FakeService()
+    result = asyncio.run(async_apply_async(_airports(), service, concurrency=2))
+    assert service.peak <= 2
+    assert pd.isna(result.iloc[-1])